@@ -0,0 +1,1124 @@
+# Librerías a importar
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from multiprocessing import get_context
+from os import chdir, path
+from random import Random
+from re import search, sub
+from sqlite3 import connect
+from sys import stdout
+from tempfile import TemporaryDirectory
+from threading import Lock, Thread
+from time import perf_counter, sleep
+from tracemalloc import get_traced_memory, start as start_tracemalloc
+from urllib.parse import parse_qs, urlsplit
+
+from pandas import DataFrame
+
+import Falabella_Category_Extraction
+from Falabella_Category_Extraction import (
+    API_ASYNC_LIMIT,
+    API_CACHE_FILENAME,
+    ApiScheduler,
+    CategoryTree,
+    DATA_DICT_FILENAME,
+    decode_facets,
+    extract_subcategories,
+    fast_loads,
+    IdRegistry,
+    MAX_WORKERS,
+    open_sink,
+    ScraperFalabellaCategory,
+)
+from Falabella_Products_Extraction import (
+    normalize_products,
+    PRODUCT_COLUMNS,
+    PRODUCT_CURRENCIES,
+    PRODUCT_DEFAULT_CURRENCY,
+    PRODUCT_DISCOUNT_COLUMNS,
+    PRODUCT_PRICE_COLUMNS,
+    PRODUCT_SHIPPING_PATTERNS,
+    ScraperFalabellaProduct,
+)
+
+try:
+    from resource import getrusage, RUSAGE_SELF
+except ImportError:
+    getrusage = None
+
+# Constantes usadas en el script
+ID_REGISTRY_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+ID_LIST_MAX_SIZE = 10_000  # La búsqueda en listas es cuadrática, no se mide más allá
+DUPLICATE_RATIO = 0.2
+TREE_ROOTS = 30
+TREE_BRANCHING = 8
+TREE_DEPTH = 5
+FIXTURE_COUNT = 200
+FIXTURE_PRODUCTS = 48
+FIXTURE_REPEAT = 5
+STUB_ROOTS = 10
+STUB_BRANCHING = 4
+STUB_DEPTH = 5
+STUB_LATENCY = 0.02
+STUB_ERROR_RATE = 0.0
+STUB_SEED = 0
+STUB_API_RATE = 1000
+STUB_ENGINE = "thread"
+STUB_PRODUCT_CATEGORIES = 20
+STUB_PRODUCTS = 480
+STUB_MAX_PAGES = 50
+STUB_ERROR_STATUS = 503
+LIVE_ORIGIN = "https://www.falabella.com.pe"
+NORMALIZE_ROWS = 1_000_000
+NORMALIZE_PRICES = ["S/ 1,599", "S/ 1,299", "S/ 99.90", "S/ 79.90", "1,299", "US$ 10", None]
+NORMALIZE_SHIPPING = [
+    ["Despacho a Domicilio", "Retiro en tienda"],
+    ["Despacho a Domicilio"],
+    ["Retiro en tienda"],
+    [],
+]
+
+
+def generate_ids(size, duplicate_ratio=DUPLICATE_RATIO):
+    """Genera una lista de ids sintéticos de categorías con cierta proporción de duplicados
+
+    Args:
+        size (int): Cantidad de ids a generar
+        duplicate_ratio (float, optional): Proporción de ids repetidos. Defaults to DUPLICATE_RATIO.
+
+    Returns:
+        list: Lista de ids
+    """
+    unique = max(int(size * (1 - duplicate_ratio)), 1)
+    return ["cat" + str(i % unique) for i in range(size)]
+
+
+def dedup_list(ids):
+    """Elimina los ids duplicados usando una lista, tal como lo hacía el scraper originalmente
+
+    Args:
+        ids (list): Lista de ids
+
+    Returns:
+        list: Lista de ids sin duplicados
+    """
+    whole_id = []
+    for id_cat in ids:
+        if id_cat not in whole_id:
+            whole_id.append(id_cat)
+    return whole_id
+
+
+def dedup_registry(ids):
+    """Elimina los ids duplicados usando la clase IdRegistry
+
+    Args:
+        ids (list): Lista de ids
+
+    Returns:
+        IdRegistry: Registro de ids sin duplicados
+    """
+    whole_id = IdRegistry()
+    whole_id.add_many(ids)
+    return whole_id
+
+
+def benchmark_id_registry(sizes=ID_REGISTRY_SIZES):
+    """Mide el tiempo de eliminación de duplicados usando una lista y la clase IdRegistry
+
+    Args:
+        sizes (list, optional): Cantidades de ids a medir. Defaults to ID_REGISTRY_SIZES.
+
+    Returns:
+        list: Lista de resultados por cada cantidad y método
+    """
+    results = []
+    for size in sizes:
+        ids = generate_ids(size)
+        methods = [("registry", dedup_registry)]
+        if size <= ID_LIST_MAX_SIZE:
+            methods.append(("list", dedup_list))
+        for name, method in methods:
+            start = perf_counter()
+            unique = method(ids)
+            results.append(
+                {
+                    "benchmark": "id_registry",
+                    "method": name,
+                    "size": size,
+                    "unique": len(unique),
+                    "seconds": round(perf_counter() - start, 6),
+                }
+            )
+    return results
+
+
+def generate_tree_levels(roots=TREE_ROOTS, branching=TREE_BRANCHING, depth=TREE_DEPTH):
+    """Genera un árbol sintético de categorías como lista de subcategorías por nivel, en el orden en que las registra el scraper
+
+    Args:
+        roots (int, optional): Cantidad de categorías principales. Defaults to TREE_ROOTS.
+        branching (int, optional): Cantidad de subcategorías por categoría. Defaults to TREE_BRANCHING.
+        depth (int, optional): Profundidad del árbol. Defaults to TREE_DEPTH.
+
+    Returns:
+        list: Lista de subcategorías [id padre, id, nombre, path] por cada nivel de profundidad
+    """
+    levels = [[[None, "cat" + str(i), "Categoría " + str(i), ""] for i in range(roots)]]
+    for _ in range(1, depth):
+        levels.append(
+            [
+                [
+                    id_parent,
+                    id_parent + "-" + str(i),
+                    "Subcategoría " + str(i),
+                    "/category/" + id_parent + "-" + str(i),
+                ]
+                for _, id_parent, _, _ in levels[-1]
+                for i in range(branching)
+            ]
+        )
+    return levels
+
+
+def build_tree_merge(levels):
+    """Genera el árbol en formato ancho uniendo un DataFrame por cada nivel, tal como lo hacía el scraper originalmente
+
+    Args:
+        levels (list): Lista de subcategorías [id padre, id, nombre, path] por cada nivel de profundidad
+
+    Returns:
+        pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+    """
+    df_category = DataFrame(
+        [row[1:] for row in levels[0]], columns=["Id_0", "Name_0", "Category_path_0"]
+    )
+    for depth, subcategory_info in enumerate(levels[1:], 1):
+        df_subcategory = DataFrame(
+            subcategory_info,
+            columns=[
+                "Id_" + str(depth - 1),
+                "Id_" + str(depth),
+                "Name_" + str(depth),
+                "Category_path_" + str(depth),
+            ],
+        )
+        df_category = df_category.merge(df_subcategory, how="left")
+    return df_category
+
+
+def build_tree_adjacency(levels):
+    """Genera el árbol en formato ancho registrando cada subcategoría en la clase CategoryTree
+
+    Args:
+        levels (list): Lista de subcategorías [id padre, id, nombre, path] por cada nivel de profundidad
+
+    Returns:
+        pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+    """
+    tree = CategoryTree()
+    for depth, subcategory_info in enumerate(levels):
+        for id_parent, id_cat, name_cat, path_cat in subcategory_info:
+            tree.add(id_parent, id_cat, name_cat, path_cat, depth)
+    return tree.to_frame()
+
+
+def measure_tree_build(method, roots, branching, depth):
+    """Mide el tiempo y la memoria máxima de un método de construcción del árbol. Se ejecuta en un proceso nuevo para que la memoria máxima no se mezcle entre métodos
+
+    Args:
+        method (str): Método de construcción ("merge" o "adjacency")
+        roots (int): Cantidad de categorías principales
+        branching (int): Cantidad de subcategorías por categoría
+        depth (int): Profundidad del árbol
+
+    Returns:
+        dict: Resultado de la medición
+    """
+    levels = generate_tree_levels(roots, branching, depth)
+    build = build_tree_merge if method == "merge" else build_tree_adjacency
+    if getrusage is None:
+        start_tracemalloc()
+    start = perf_counter()
+    df_category = build(levels)
+    seconds = perf_counter() - start
+    return {
+        "benchmark": "category_tree",
+        "method": method,
+        "depth": depth,
+        "rows": df_category.shape[0],
+        "columns": df_category.shape[1],
+        "seconds": round(seconds, 6),
+        **measure_peak_memory(),
+    }
+
+
+def measure_peak_memory():
+    """Retorna la memoria máxima usada por el proceso actual, o el pico de tracemalloc si el módulo resource no está disponible
+
+    Returns:
+        dict: Nombre de la medida y memoria máxima en KB
+    """
+    if getrusage is None:
+        return {"tracemalloc_peak_kb": get_traced_memory()[1] // 1024}
+    return {"max_rss_kb": getrusage(RUSAGE_SELF).ru_maxrss}
+
+
+def benchmark_category_tree(roots=TREE_ROOTS, branching=TREE_BRANCHING, depth=TREE_DEPTH):
+    """Compara la construcción del árbol uniendo DataFrames por nivel contra la lista de adyacencia de la clase CategoryTree
+
+    Args:
+        roots (int, optional): Cantidad de categorías principales. Defaults to TREE_ROOTS.
+        branching (int, optional): Cantidad de subcategorías por categoría. Defaults to TREE_BRANCHING.
+        depth (int, optional): Profundidad del árbol. Defaults to TREE_DEPTH.
+
+    Returns:
+        list: Lista de resultados por cada método
+    """
+    results = []
+    for method in ["merge", "adjacency"]:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results.append(
+                executor.submit(
+                    measure_tree_build, method, roots, branching, depth
+                ).result()
+            )
+    return results
+
+
+def generate_product(product_id, i):
+    """Genera un producto sintético con la misma estructura que los productos de la api de saga falabella
+
+    Args:
+        product_id (str): Id del producto
+        i (int): Posición del producto, usada para variar su nombre y sus imágenes
+
+    Returns:
+        dict: Producto del JSON
+    """
+    return {
+        "productId": product_id,
+        "displayName": "Producto " + str(i),
+        "brand": "MARCA",
+        "sellerName": "FALABELLA",
+        "url": "https://www.falabella.com.pe/falabella-pe/product/" + product_id,
+        "prices": [
+            {"type": "internetPrice", "price": ["1,299"], "symbol": "S/ "},
+            {"type": "normalPrice", "price": ["1,599"], "symbol": "S/ "},
+        ],
+        "availability": {
+            "homeDeliveryShipping": "Envío a domicilio",
+            "pickUpFromStoreShipping": "Retira en tienda",
+        },
+        "mediaUrls": [
+            "https://media.falabella.com/" + product_id + "_" + str(j)
+            for j in range(6)
+        ],
+    }
+
+
+def generate_facets(subcategories):
+    """Genera los filtros sintéticos de una respuesta de la api
+
+    Args:
+        subcategories (list): Lista de pares (id, nombre) de las subcategorías del filtro Categoría
+
+    Returns:
+        list: Filtros de la respuesta
+    """
+    return [
+        {
+            "name": "Marca",
+            "values": [
+                {"id": "m" + str(i), "title": "Marca " + str(i), "url": ""}
+                for i in range(30)
+            ],
+        },
+        {
+            "name": "Categoría",
+            "values": [
+                {
+                    "id": id_cat,
+                    "title": name_cat,
+                    "url": "/category/" + id_cat,
+                }
+                for id_cat, name_cat in subcategories
+            ],
+        },
+    ]
+
+
+def generate_api_response(products=FIXTURE_PRODUCTS, subcategories=10):
+    """Genera una respuesta sintética de la api con la misma estructura que la de saga falabella (productos antes de los filtros)
+
+    Args:
+        products (int, optional): Cantidad de productos de la página. Defaults to FIXTURE_PRODUCTS.
+        subcategories (int, optional): Cantidad de subcategorías del filtro Categoría. Defaults to 10.
+
+    Returns:
+        bytes: Cuerpo de la respuesta
+    """
+    results = [generate_product(str(100000 + i), i) for i in range(products)]
+    facets = generate_facets(
+        [("cat" + str(i), "Subcategoría " + str(i)) for i in range(subcategories)]
+    )
+    data = {
+        "data": {"results": results, "facets": facets, "pagination": {"count": 1000}}
+    }
+    return dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def load_api_fixtures(filename=API_CACHE_FILENAME, count=FIXTURE_COUNT):
+    """Carga respuestas guardadas en la caché de la api o, si no existe, genera respuestas sintéticas
+
+    Args:
+        filename (str, optional): Nombre del archivo de la caché de la api. Defaults to API_CACHE_FILENAME.
+        count (int, optional): Cantidad de respuestas a cargar. Defaults to FIXTURE_COUNT.
+
+    Returns:
+        tuple: Origen de las respuestas ("cache" o "synthetic") y lista de cuerpos
+    """
+    if path.isfile(filename):
+        connection = connect(filename)
+        bodies = [
+            body
+            for (body,) in connection.execute(
+                "SELECT body FROM responses LIMIT ?", (count,)
+            )
+        ]
+        connection.close()
+        if bodies:
+            return "cache", bodies
+    return "synthetic", [generate_api_response() for _ in range(count)]
+
+
+def benchmark_api_decode(repeat=FIXTURE_REPEAT):
+    """Compara la decodificación completa de las respuestas de la api contra la decodificación de solo los filtros
+
+    Args:
+        repeat (int, optional): Cantidad de veces que se decodifican las respuestas. Defaults to FIXTURE_REPEAT.
+
+    Returns:
+        list: Lista de resultados por cada método
+    """
+    source, bodies = load_api_fixtures()
+    methods = [
+        ("json_full", lambda body: loads(body)["data"]["facets"]),
+        ("fast_full", lambda body: fast_loads(body)["data"]["facets"]),
+        ("facets_only", decode_facets),
+    ]
+    results = []
+    for name, method in methods:
+        start = perf_counter()
+        for _ in range(repeat):
+            for body in bodies:
+                method(body)
+        seconds = perf_counter() - start
+        results.append(
+            {
+                "benchmark": "api_decode",
+                "method": name,
+                "source": source,
+                "responses": len(bodies),
+                "bytes": sum(len(body) for body in bodies),
+                "fast_json": fast_loads is not loads,
+                "seconds": round(seconds, 6),
+                "microseconds_per_response": round(
+                    seconds / (repeat * len(bodies)) * 1e6, 2
+                ),
+            }
+        )
+    return results
+
+
+def generate_product_rows(size, seed=STUB_SEED):
+    """Genera productos sintéticos con las columnas de PRODUCT_COLUMNS y precios con el formato de la página web
+
+    Args:
+        size (int): Cantidad de productos
+        seed (int, optional): Semilla de los precios y los tipos de despacho. Defaults to STUB_SEED.
+
+    Returns:
+        pandas.core.frame.DataFrame: Productos sintéticos
+    """
+    random = Random(seed)
+    prices = [random.choices(NORMALIZE_PRICES, k=size) for _ in range(3)]
+    return DataFrame(
+        {
+            PRODUCT_COLUMNS[0]: "https://www.falabella.com.pe/falabella-pe/category/cat1/Ropa",
+            PRODUCT_COLUMNS[1]: "Producto",
+            PRODUCT_COLUMNS[2]: "FALABELLA",
+            PRODUCT_COLUMNS[3]: prices[0],
+            PRODUCT_COLUMNS[4]: prices[1],
+            PRODUCT_COLUMNS[5]: prices[2],
+            PRODUCT_COLUMNS[6]: "MARCA",
+            PRODUCT_COLUMNS[7]: random.choices(NORMALIZE_SHIPPING, k=size),
+            PRODUCT_COLUMNS[8]: [str(i) for i in range(size)],
+        }
+    )
+
+
+def normalize_product_rows(df_product):
+    """Normaliza los productos fila por fila con condicionales de Python, como se hacía en el notebook de productos
+
+    Args:
+        df_product (pandas.core.frame.DataFrame): Productos con las columnas de PRODUCT_COLUMNS
+
+    Returns:
+        pandas.core.frame.DataFrame: Copia de los productos con las mismas columnas normalizadas que normalize_products
+    """
+    rows = []
+    for regular, discount, card, shipping in zip(
+        df_product["Precio Regular"],
+        df_product["Precio Descuento"],
+        df_product["Precio Descuento Tarjeta"],
+        df_product["Shipping Details"],
+    ):
+        cents = []
+        currency = None
+        for price in [regular, discount, card]:
+            if not isinstance(price, str):
+                price = None
+            amount = sub(r"[^\d.]", "", price) if price else ""
+            cents.append(round(float(amount) * 100) if amount else None)
+            if price and currency is None:
+                symbol = search(r"^\s*([^\d\s.,]+)", price)
+                if symbol:
+                    currency = PRODUCT_CURRENCIES.get(symbol.group(1), symbol.group(1))
+                else:
+                    currency = PRODUCT_DEFAULT_CURRENCY
+        discounts = [
+            round((1 - price / cents[0]) * 100, 1)
+            if cents[0] and price is not None
+            else None
+            for price in cents[1:]
+        ]
+        shipping = str(shipping)
+        rows.append(
+            cents
+            + [currency or PRODUCT_DEFAULT_CURRENCY]
+            + discounts
+            + [
+                search(pattern, shipping) is not None
+                for pattern in PRODUCT_SHIPPING_PATTERNS.values()
+            ]
+        )
+    columns = (
+        list(PRODUCT_PRICE_COLUMNS.values())
+        + ["Moneda"]
+        + list(PRODUCT_DISCOUNT_COLUMNS.values())
+        + list(PRODUCT_SHIPPING_PATTERNS)
+    )
+    df_normalized = DataFrame(rows, columns=columns, index=df_product.index)
+    return df_product.join(df_normalized)
+
+
+def benchmark_normalize(size=NORMALIZE_ROWS):
+    """Compara la normalización de los precios, la moneda, los descuentos y los despachos fila por fila contra la normalización por columnas de normalize_products
+
+    Args:
+        size (int, optional): Cantidad de productos sintéticos. Defaults to NORMALIZE_ROWS.
+
+    Returns:
+        list: Lista de resultados por cada método
+    """
+    df_product = generate_product_rows(size)
+    outputs = {}
+    results = []
+    for name, method in [("rows", normalize_product_rows), ("vectorized", normalize_products)]:
+        start = perf_counter()
+        outputs[name] = method(df_product)
+        seconds = perf_counter() - start
+        results.append(
+            {
+                "benchmark": "normalize",
+                "method": name,
+                "rows": size,
+                "seconds": round(seconds, 6),
+                "rows_per_second": round(size / seconds, 2) if seconds > 0 else None,
+            }
+        )
+    # Ambos métodos deben producir los mismos valores
+    columns = outputs["rows"].columns[len(PRODUCT_COLUMNS) :]
+    matches = all(
+        outputs["rows"][column]
+        .astype(object)
+        .where(outputs["rows"][column].notna(), None)
+        .equals(
+            outputs["vectorized"][column]
+            .astype(object)
+            .where(outputs["vectorized"][column].notna(), None)
+        )
+        for column in columns
+    )
+    for result in results:
+        result["matches"] = matches
+    return results
+
+
+class StubFalabellaServer(ThreadingHTTPServer):
+    """Representa un servidor HTTP local que reemplaza a saga falabella: responde la página principal, las páginas de las categorías y la api de listados a partir de un árbol sintético o de respuestas grabadas, con latencia y errores configurables
+
+    Attributes:
+        base_url (str): Origen del servidor (http://127.0.0.1:puerto)
+        latency (float): Latencia media en segundos agregada a cada respuesta
+        error_rate (float): Proporción de peticiones a la api que responden con un error STUB_ERROR_STATUS
+        products (int): Cantidad de productos de cada categoría
+        num_requests (int): Cantidad de peticiones recibidas
+        num_errors (int): Cantidad de errores inyectados
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        levels,
+        responses=None,
+        products=STUB_PRODUCTS,
+        latency=STUB_LATENCY,
+        error_rate=STUB_ERROR_RATE,
+        seed=STUB_SEED,
+    ):
+        """Genera todos los atributos para una instancia de la clase StubFalabellaServer
+
+        Args:
+            levels (list): Lista de subcategorías [id padre, id, nombre, path] por cada nivel de profundidad, generada por generate_tree_levels
+            responses (dict, optional): Respuestas grabadas de la api por id de categoría, tienen prioridad sobre el árbol sintético. Defaults to None.
+            products (int, optional): Cantidad de productos de cada categoría. Defaults to STUB_PRODUCTS.
+            latency (float, optional): Latencia media en segundos de cada respuesta. Defaults to STUB_LATENCY.
+            error_rate (float, optional): Proporción de peticiones a la api que fallan. Defaults to STUB_ERROR_RATE.
+            seed (int, optional): Semilla usada para la latencia y los errores, hace repetibles los escenarios. Defaults to STUB_SEED.
+        """
+        super().__init__(("127.0.0.1", 0), StubFalabellaHandler)
+        self._responses = responses or {}
+        self._products = products
+        self._latency = latency
+        self._error_rate = error_rate
+        self._random = Random(seed)
+        self._lock = Lock()
+        self._num_requests = 0
+        self._num_errors = 0
+        self._thread = None
+        self._names = {}
+        self._children = {}
+        self._roots = {}
+        for depth, subcategory_info in enumerate(levels):
+            for id_parent, id_cat, name_cat, _ in subcategory_info:
+                self._names[id_cat] = name_cat
+                self._children.setdefault(id_parent, []).append((id_cat, name_cat))
+                self._roots[id_cat] = id_cat if depth == 0 else self._roots[id_parent]
+        self._menu = [id_cat for _, id_cat, _, _ in levels[1]] if len(levels) > 1 else []
+
+    def __enter__(self):
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, error_type, error, error_traceback):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    @property
+    def base_url(self):
+        """Retorna el valor actual del atributo base_url"""
+        return "http://127.0.0.1:" + str(self.server_address[1])
+
+    def stats(self):
+        """Retorna los contadores del servidor
+
+        Returns:
+            dict: Contadores del servidor
+        """
+        return {"requests": self._num_requests, "errors": self._num_errors}
+
+    def next_delay(self):
+        """Registra una petición y decide su latencia y si debe fallar
+
+        Returns:
+            tuple: Latencia en segundos y booleano que indica si se inyecta un error
+        """
+        with self._lock:
+            self._num_requests += 1
+            delay = self._latency * self._random.uniform(0.5, 1.5)
+            failed = self._random.random() < self._error_rate
+        return delay, failed
+
+    def add_error(self):
+        """Incrementa en uno la cantidad de errores inyectados"""
+        with self._lock:
+            self._num_errors += 1
+
+    def category_link(self, id_cat):
+        """Genera el path de la página de una categoría
+
+        Args:
+            id_cat (str): Id de la categoría
+
+        Returns:
+            str: Path de la página
+        """
+        return "/falabella-pe/category/" + id_cat + "/" + "-".join(self._names[id_cat].split())
+
+    def listing_response(self, query):
+        """Genera la respuesta de la api de listados para una categoría y una página
+
+        Args:
+            query (dict): Parámetros de la petición, con categoryId, page y pageSize
+
+        Returns:
+            bytes: Cuerpo de la respuesta
+        """
+        id_cat = query.get("categoryId", [""])[0]
+        page = int(query.get("page", ["1"])[0])
+        page_size = int(query.get("pageSize", ["1"])[0])
+        if id_cat in self._responses and page == 1:
+            return self._responses[id_cat]
+        first = (page - 1) * page_size
+        results = [
+            generate_product(id_cat + "-" + str(i), i)
+            for i in range(first, min(first + page_size, self._products))
+        ]
+        data = {
+            "data": {
+                "results": results,
+                "facets": generate_facets(self._children.get(id_cat, [])),
+                "pagination": {"count": self._products, "perPage": page_size},
+            }
+        }
+        return dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def page_response(self, data):
+        """Genera una página HTML con el JSON __NEXT_DATA__ indicado
+
+        Args:
+            data (dict): Contenido del JSON
+
+        Returns:
+            bytes: Cuerpo de la respuesta
+        """
+        return (
+            '<html><body><script id="__NEXT_DATA__" type="application/json">'
+            + dumps({"props": {"pageProps": data}}, ensure_ascii=False)
+            + "</script></body></html>"
+        ).encode("utf-8")
+
+    def home_response(self):
+        """Genera la página principal con los links del menú (subcategorías del primer nivel)
+
+        Returns:
+            bytes: Cuerpo de la respuesta
+        """
+        return self.page_response(
+            {"menu": [{"url": self.category_link(id_cat)} for id_cat in self._menu]}
+        )
+
+    def category_response(self, id_cat):
+        """Genera la página de una categoría con su breadcrumb apuntando a la categoría principal
+
+        Args:
+            id_cat (str): Id de la categoría
+
+        Returns:
+            bytes or None: Cuerpo de la respuesta o None si la categoría no existe
+        """
+        if id_cat not in self._roots:
+            return None
+        id_root = self._roots[id_cat]
+        return self.page_response(
+            {
+                "breadcrumb": [
+                    {"label": self._names[id_root], "link": self.category_link(id_root)}
+                ]
+            }
+        )
+
+
+class StubFalabellaHandler(BaseHTTPRequestHandler):
+    """Atiende las peticiones hechas al servidor StubFalabellaServer"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        delay, failed = self.server.next_delay()
+        sleep(delay)
+        url = urlsplit(self.path)
+        content_type = "text/html; charset=utf-8"
+        if url.path.startswith("/s/browse/v1/listing/"):
+            # Solo la api falla, las páginas no se reintentan y terminarían usando el navegador web
+            if failed:
+                self.server.add_error()
+                self.send_body(STUB_ERROR_STATUS, b"", "text/plain")
+                return
+            body = self.server.listing_response(parse_qs(url.query, keep_blank_values=True))
+            content_type = "application/json"
+        elif url.path.rstrip("/") == "/falabella-pe":
+            body = self.server.home_response()
+        elif url.path.startswith("/falabella-pe/category/"):
+            body = self.server.category_response(url.path.split("/")[3])
+        else:
+            body = None
+        if body is None:
+            self.send_body(404, b"", "text/plain")
+        else:
+            self.send_body(200, body, content_type)
+
+    def send_body(self, status_code, body, content_type):
+        """Envía una respuesta completa manteniendo la conexión abierta
+
+        Args:
+            status_code (int): Código de estado de la respuesta
+            body (bytes): Cuerpo de la respuesta
+            content_type (str): Tipo de contenido de la respuesta
+        """
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Sin registrar cada petición en la consola
+        pass
+
+
+def load_recorded_responses(filename=API_CACHE_FILENAME):
+    """Carga las respuestas de la api grabadas en la caché para que el servidor local las repita, junto con las categorías desde las que se puede recorrer el árbol grabado
+
+    Args:
+        filename (str, optional): Nombre del archivo de la caché de la api. Defaults to API_CACHE_FILENAME.
+
+    Returns:
+        tuple: Respuestas por id de categoría y lista de id, nombre y path de las categorías que no son subcategoría de otra respuesta grabada
+    """
+    if not path.isfile(filename):
+        return {}, []
+    connection = connect(filename)
+    rows = connection.execute("SELECT key, body FROM responses").fetchall()
+    connection.close()
+    responses = {}
+    categories = []
+    children = set()
+    for key, body in rows:
+        category = key.split("\x1f")
+        responses[category[0]] = body
+        categories.append(category)
+        try:
+            children.update(
+                id_cat
+                for _, id_cat, _, _ in extract_subcategories(decode_facets(body), category[0])
+            )
+        except (KeyError, IndexError, TypeError, ValueError):
+            pass
+    return responses, [category for category in categories if category[0] not in children]
+
+
+def point_to_stub(base_url):
+    """Redirige la página principal y la api de saga falabella al servidor local
+
+    Args:
+        base_url (str): Origen del servidor local
+    """
+    Falabella_Category_Extraction.URL_FALABELLA = (
+        Falabella_Category_Extraction.URL_FALABELLA.replace(LIVE_ORIGIN, base_url)
+    )
+    Falabella_Category_Extraction.API_URL = (
+        Falabella_Category_Extraction.API_URL.replace(LIVE_ORIGIN, base_url)
+    )
+
+
+def run_category_crawl(roots, level, engine, rate):
+    """Recorre el árbol de categorías con la api hasta cierto nivel de profundidad, con la caché de la api vacía
+
+    Args:
+        roots (list): Lista de id, nombre y path de las categorías principales
+        level (int): Profundidad del árbol de categorías
+        engine (str): Motor usado para realizar las peticiones a la api ("thread" o "async")
+        rate (float): Peticiones por segundo permitidas por el planificador
+
+    Returns:
+        tuple: Cantidad de categorías extraídas, métricas del scraper y datos adicionales del escenario
+    """
+    scraper = ScraperFalabellaCategory(
+        DATA_DICT_FILENAME,
+        browserless=True,
+        scheduler=ApiScheduler(
+            rate=rate,
+            burst=rate,
+            max_concurrency=API_ASYNC_LIMIT if engine == "async" else MAX_WORKERS,
+        ),
+    )
+    engine = scraper.check_engine(engine)
+    whole_id = IdRegistry(id_cat for id_cat, _, _ in roots)
+    tree = CategoryTree()
+    for id_cat, name_cat, path_cat in roots:
+        tree.add(None, id_cat, name_cat, path_cat, 0)
+    if level > 1:
+        scraper.crawl(engine, roots, level, whole_id, tree)
+    scraper.build_category_tree(tree, level)
+    scraper.close()
+    return len(tree), scraper.metadata, {"engine": engine, "level": level}
+
+
+def run_dictionary(temperature):
+    """Obtiene las categorías principales a partir del menú, recorriendo los links con HTTP si el diccionario de categorías está vacío
+
+    Args:
+        temperature (str): "cold" si el diccionario aún no existe o "warm" si fue generado por una ejecución anterior
+
+    Returns:
+        tuple: Cantidad de categorías principales, métricas del scraper y datos adicionales del escenario
+    """
+    scraper = ScraperFalabellaCategory(DATA_DICT_FILENAME, browserless=True)
+    roots = scraper.get_root_categories()
+    scraper.close()
+    return len(roots), scraper.metadata, {"dictionary": temperature}
+
+
+def run_product_pagination(categories, max_pages, rate):
+    """Extrae todas las páginas de productos de varias categorías con la api y las escribe en un archivo CSV
+
+    Args:
+        categories (int): Cantidad de categorías
+        max_pages (int): Cantidad máxima de páginas por categoría
+        rate (float): Peticiones por segundo permitidas por el planificador
+
+    Returns:
+        tuple: Cantidad de productos extraídos, métricas del scraper y datos adicionales del escenario
+    """
+    scraper = ScraperFalabellaProduct(scheduler=ApiScheduler(rate=rate, burst=rate))
+    leaves = [
+        ("prod" + str(i), "Categoría de productos " + str(i), "")
+        for i in range(categories)
+    ]
+    with open_sink("csv", "Data", "falabella_product", PRODUCT_COLUMNS) as sink:
+        scraper.crawl_leaves(leaves, sink, max_pages)
+    return sink.quantity, scraper.metadata, {"categories": categories}
+
+
+OFFLINE_SCENARIOS = {
+    "category_crawl": run_category_crawl,
+    "dictionary": run_dictionary,
+    "product_pagination": run_product_pagination,
+}
+
+
+def measure_scenario(scenario, base_url, workdir, kwargs):
+    """Ejecuta un escenario contra el servidor local y mide su tiempo, su rendimiento y su memoria máxima. Se ejecuta en un proceso nuevo para que la memoria máxima no se mezcle entre escenarios
+
+    Args:
+        scenario (str): Nombre del escenario de OFFLINE_SCENARIOS
+        base_url (str): Origen del servidor local
+        workdir (str): Carpeta de trabajo donde se guardan el diccionario, la caché y los datos
+        kwargs (dict): Parámetros del escenario
+
+    Returns:
+        dict: Resultado de la medición
+    """
+    point_to_stub(base_url)
+    chdir(workdir)
+    if getrusage is None:
+        start_tracemalloc()
+    start = perf_counter()
+    items, metadata, details = OFFLINE_SCENARIOS[scenario](**kwargs)
+    seconds = perf_counter() - start
+    stages = metadata.to_dict()["stages"]
+    return {
+        "benchmark": "offline",
+        "scenario": scenario,
+        **details,
+        "items": items,
+        "requests": sum(stage.get("requests", 0) for stage in stages),
+        "errors": metadata.num_errors,
+        "seconds": round(seconds, 6),
+        "items_per_second": round(items / seconds, 2) if seconds > 0 else None,
+        **measure_peak_memory(),
+        "stages": stages,
+    }
+
+
+def benchmark_offline(
+    level=STUB_DEPTH,
+    engine=STUB_ENGINE,
+    latency=STUB_LATENCY,
+    error_rate=STUB_ERROR_RATE,
+    seed=STUB_SEED,
+    rate=STUB_API_RATE,
+    products=STUB_PRODUCTS,
+    product_categories=STUB_PRODUCT_CATEGORIES,
+    recorded=False,
+):
+    """Ejecuta los escenarios del scraper contra un servidor local que reemplaza a saga falabella: recorrido de categorías del nivel 1 al indicado, diccionario de categorías vacío y lleno, y paginación de productos
+
+    Args:
+        level (int, optional): Profundidad máxima del recorrido de categorías. Defaults to STUB_DEPTH.
+        engine (str, optional): Motor usado para realizar las peticiones a la api ("thread" o "async"). Defaults to STUB_ENGINE.
+        latency (float, optional): Latencia media en segundos de cada respuesta. Defaults to STUB_LATENCY.
+        error_rate (float, optional): Proporción de peticiones que fallan. Defaults to STUB_ERROR_RATE.
+        seed (int, optional): Semilla de la latencia y los errores. Defaults to STUB_SEED.
+        rate (float, optional): Peticiones por segundo permitidas por el planificador. Defaults to STUB_API_RATE.
+        products (int, optional): Cantidad de productos de cada categoría. Defaults to STUB_PRODUCTS.
+        product_categories (int, optional): Cantidad de categorías del escenario de productos. Defaults to STUB_PRODUCT_CATEGORIES.
+        recorded (bool, optional): Repetir las respuestas grabadas en la caché de la api y recorrer el árbol grabado. Defaults to False.
+
+    Returns:
+        list: Lista de resultados por cada escenario
+    """
+    levels = generate_tree_levels(STUB_ROOTS, STUB_BRANCHING, max(level, 2))
+    responses, roots = load_recorded_responses() if recorded else ({}, [])
+    if not roots:
+        roots = [row[1:] for row in levels[0]]
+    scenarios = [
+        ("category_crawl", {"roots": roots, "level": depth, "engine": engine, "rate": rate})
+        for depth in range(1, level + 1)
+    ]
+    scenarios += [
+        ("dictionary", {"temperature": "cold"}),
+        ("dictionary", {"temperature": "warm"}),
+        (
+            "product_pagination",
+            {"categories": product_categories, "max_pages": STUB_MAX_PAGES, "rate": rate},
+        ),
+    ]
+    results = []
+    with StubFalabellaServer(
+        levels, responses, products, latency, error_rate, seed
+    ) as server, TemporaryDirectory() as dictionary_dir:
+        for scenario, kwargs in scenarios:
+            with TemporaryDirectory() as scenario_dir:
+                # Los escenarios del diccionario comparten la carpeta para que el segundo lo encuentre lleno
+                workdir = dictionary_dir if scenario == "dictionary" else scenario_dir
+                before = server.stats()
+                # Un proceso nuevo (spawn) por escenario, sin heredar el hilo del servidor
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=get_context("spawn")
+                ) as executor:
+                    result = executor.submit(
+                        measure_scenario, scenario, server.base_url, workdir, kwargs
+                    ).result()
+                after = server.stats()
+                result.update(
+                    {
+                        "latency": latency,
+                        "error_rate": error_rate,
+                        "server_requests": after["requests"] - before["requests"],
+                        "server_errors": after["errors"] - before["errors"],
+                        "recorded": bool(responses),
+                    }
+                )
+                results.append(result)
+    return results
+
+
+def parse_arguments():
+    parser = ArgumentParser(
+        description="Mide el rendimiento del scraper sin conectarse a saga falabella"
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=["id_registry", "category_tree", "api_decode", "normalize", "offline"],
+        default=["id_registry", "category_tree", "api_decode", "normalize", "offline"],
+        help="Mediciones a ejecutar",
+    )
+    parser.add_argument(
+        "--level",
+        type=int,
+        default=STUB_DEPTH,
+        help="Profundidad máxima del recorrido de categorías en el servidor local",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["thread", "async"],
+        default=STUB_ENGINE,
+        help="Motor usado para realizar las peticiones a la api",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=STUB_LATENCY,
+        help="Latencia media en segundos de cada respuesta del servidor local",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=STUB_ERROR_RATE,
+        help="Proporción de peticiones que fallan con un error " + str(STUB_ERROR_STATUS),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=STUB_SEED,
+        help="Semilla de la latencia y los errores del servidor local",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=STUB_API_RATE,
+        help="Peticiones por segundo permitidas por el planificador de la api",
+    )
+    parser.add_argument(
+        "--products",
+        type=int,
+        default=STUB_PRODUCTS,
+        help="Cantidad de productos de cada categoría del servidor local",
+    )
+    parser.add_argument(
+        "--product-categories",
+        type=int,
+        default=STUB_PRODUCT_CATEGORIES,
+        help="Cantidad de categorías del escenario de paginación de productos",
+    )
+    parser.add_argument(
+        "--recorded",
+        action="store_true",
+        help="Repetir las respuestas de la api grabadas en " + API_CACHE_FILENAME,
+    )
+    parser.add_argument(
+        "--normalize-rows",
+        type=int,
+        default=NORMALIZE_ROWS,
+        help="Cantidad de productos sintéticos de la medición de la normalización",
+    )
+    parser.add_argument(
+        "--output",
+        help="Archivo donde se guardan los resultados (una línea JSON por resultado)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    benchmarks = {
+        "id_registry": benchmark_id_registry,
+        "category_tree": benchmark_category_tree,
+        "api_decode": benchmark_api_decode,
+        "normalize": lambda: benchmark_normalize(arguments.normalize_rows),
+        "offline": lambda: benchmark_offline(
+            arguments.level,
+            arguments.engine,
+            arguments.latency,
+            arguments.error_rate,
+            arguments.seed,
+            arguments.rate,
+            arguments.products,
+            arguments.product_categories,
+            arguments.recorded,
+        ),
+    }
+    output = open(arguments.output, "w", encoding="utf-8") if arguments.output else stdout
+    try:
+        for name in arguments.benchmarks:
+            for result in benchmarks[name]():
+                output.write(dumps(result) + "\n")
+                output.flush()
+    finally:
+        if output is not stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
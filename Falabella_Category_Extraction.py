@@ -1,7 +1,27 @@
 # Librerías a importar
-from concurrent.futures import as_completed, ThreadPoolExecutor
+from abc import ABC, abstractmethod
+from argparse import ArgumentParser
+from asyncio import (
+    create_task,
+    get_running_loop,
+    run,
+    Semaphore,
+    sleep as sleep_async,
+    TimeoutError as AsyncTimeoutError,
+    wait as wait_async,
+    wrap_future,
+)
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import datetime, timedelta
-from json import JSONDecodeError
+from glob import glob
+from gzip import open as gzip_open
+from json import dump, dumps, JSONDecodeError, load as load_json, loads
 from logging import (
     Formatter,
     getLogger,
@@ -10,24 +30,65 @@ from logging import (
     shutdown,
     StreamHandler,
 )
-from os import getcwd, makedirs, path
-from re import search, sub
+from html import unescape
+from multiprocessing import get_context
+from os import cpu_count, getcwd, makedirs, path, remove, replace
+from queue import Empty, Queue
+from re import compile as compile_regex, finditer, search, sub
+from sqlite3 import connect, OperationalError
 from sys import stdout
-from time import localtime, strftime, time
+from threading import BoundedSemaphore, Condition, Lock
+from random import uniform
+from time import localtime, monotonic, sleep, strftime, time
 from traceback import TracebackException
+from uuid import uuid4
 
 from openpyxl import load_workbook, Workbook
 from pandas import concat, DataFrame, read_csv
-from requests import get
-from selenium.common.exceptions import TimeoutException, ElementNotInteractableException
+from requests import RequestException, Session
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    TimeoutException,
+    WebDriverException,
+)
 from seleniumwire.webdriver import Chrome, ChromeOptions
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urljoin
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    # Librería opcional para realizar peticiones usando HTTP/2
+    from httpx import Client, HTTPError as HttpxError, Limits
+except ImportError:
+    Client = None
+    HttpxError = RequestException
+
+try:
+    # Librería opcional para guardar los datos en formato Parquet
+    from pyarrow import schema, string, Table, unify_schemas
+    from pyarrow.dataset import dataset, field, HivePartitioning
+    from pyarrow.fs import LocalFileSystem
+    from pyarrow.parquet import ParquetWriter, write_table
+except ImportError:
+    write_table = None
+
+try:
+    # Librería opcional para realizar peticiones de forma asíncrona
+    from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+    from yarl import URL
+except ImportError:
+    ClientSession = None
+
+try:
+    # Librería opcional para decodificar las respuestas de la api más rápido
+    from orjson import loads as fast_loads
+except ImportError:
+    fast_loads = loads
+
 # Constantes usadas en el script
 CURRENT_DATE = datetime.now().date()
 ROOT_PATH = getcwd()
@@ -36,6 +97,8 @@ DATA_FILENAME = "falabella_category"
 DATA_FOLDER = "Data"
 METADATA_FILENAME = "Metadata.xlsx"
 METADATA_SHEET_NAME = "Categorias"
+METRICS_FOLDER = "Log"
+METRICS_FILENAME = "fb_ropa_metrics"
 DATA_DICT_FILENAME = "category_dictionary.csv"
 DATA_DICT_HEADERS = ["Link_subcat", "Name", "Link_cat"]
 API_HEADERS = {
@@ -53,12 +116,253 @@ API_HEADERS = {
     "Referrer-Policy": "strict-origin-when-cross-origin",
 }
 API_URL = "https://www.falabella.com.pe/s/browse/v1/listing/pe?=&\
-{0}&page=1&categoryId={1}&categoryName={2}&pgid=2&pid=799c102f-9b4c-44be-a421-23e366a63b82\
+{0}&page={3}&pageSize={4}&categoryId={1}&categoryName={2}&pgid=2&pid=799c102f-9b4c-44be-a421-23e366a63b82\
 &zones=912_LIMA_2%2COLVAA_81%2CLIMA_URB1_DIRECTO%2CURBANO_83%2CIBIS_19%2C912_LIMA_1%2C150101%2CPERF_TEST%2C150000"
-THREAD = ThreadPoolExecutor()
+MAX_WORKERS = min(32, (cpu_count() or 1) + 4)
+API_HTTP2 = False
+API_ASYNC_LIMIT = 1000
+API_FACETS_PAGE_SIZE = 1
+API_JSON_TOKEN = compile_regex(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+API_ENGINE = "thread"
+API_TIMEOUT = 15
+API_RATE = 20
+API_MIN_RATE = 1
+API_MAX_RATE = 200
+API_BURST = 40
+API_RETRIES = 4
+API_RETRY_STATUS = [429, 500, 502, 503, 504]
+API_THROTTLE_STATUS = [429, 503]
+API_LATENCY_THRESHOLD = 5
+API_BACKOFF_BASE = 0.5
+API_BACKOFF_MAX = 30
+API_CACHE_FILENAME = "api_cache.sqlite"
+API_CACHE_TTL = 24 * 60 * 60
+API_CACHE_MAX_ENTRIES = 200_000
+API_CACHE_EVICT_EVERY = 1000
+API_CACHE_OFFLINE = False
+API_CACHE_TIMEOUT = 60
+API_CACHE_RETRIES = 5
+INCREMENTAL = False
+LEVEL = 5
+CHECKPOINT_FILENAME = "falabella_category_checkpoint.json.gz"
+CHECKPOINT_INTERVAL = 30
+DATA_PARQUET = False
+PARQUET_FOLDER = "parquet"
+PARQUET_PARTITION = "execution_date"
+SINK_BUFFER_SIZE = 5000
+SHARD_FOLDER = "shards"
+QUEUE_FILENAME = "falabella_queue.sqlite"
+QUEUE_TASK_TIMEOUT = 60 * 60
+QUEUE_MAX_ATTEMPTS = 3
+QUEUE_POLL_INTERVAL = 5
+BROWSERLESS = False
+MAX_CATEGORY_DEPTH = 10
+BROWSER_POOL_SIZE = 4
+BROWSER_RECYCLE_PAGES = 50
+BROWSER_LEAN = False
+BROWSER_BLOCKED_URLS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.ico",
+    "*.css",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*dynamicyield.com*",
+    "*urbanairship.com*",
+]
+DRIVER_PATH_FILENAME = "chromedriver_path.txt"
+DRIVER_PATH_MAX_AGE = 7 * 24 * 60 * 60
+DRIVER_PATH_LOCK = Lock()
+METRICS_PREFIX = "falabella_scraper"
+METRICS_LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+NETWORK_WORKERS = MAX_WORKERS
+NETWORK_QUEUE_SIZE = MAX_WORKERS * 4
+BROWSER_WORKERS = BROWSER_POOL_SIZE
+BROWSER_QUEUE_SIZE = BROWSER_POOL_SIZE * 4
+CPU_WORKERS = cpu_count() or 1
+CPU_QUEUE_SIZE = (cpu_count() or 1) * 4
+CPU_PROCESSES = False
+EXECUTOR_LOG_INTERVAL = 30
+EXECUTOR_POLL_INTERVAL = 0.01
 LOGGER = getLogger(__name__)
 
 
+class StageMetrics:
+    """Representa las métricas de una etapa del scraper: tiempo, peticiones, latencias y contadores
+
+    Attributes:
+        name (str): Nombre de la etapa
+        elapsed (float): Tiempo en segundos medido con el bloque with de la etapa
+        first_time (float): Momento de la primera actividad registrada
+        last_time (float): Momento de la última actividad registrada
+        latencies (list): Latencias en segundos de las peticiones realizadas
+        counters (dict): Contadores de la etapa (peticiones, bytes, aciertos de caché, reintentos, errores)
+    """
+
+    def __init__(self, name):
+        """Genera todos los atributos para una instancia de la clase StageMetrics
+
+        Args:
+            name (str): Nombre de la etapa
+        """
+        self._name = name
+        self._elapsed = 0.0
+        self._first_time = None
+        self._last_time = None
+        self._latencies = []
+        self._counters = {}
+        self._lock = Lock()
+        self._starts = []
+
+    def __enter__(self):
+        now = monotonic()
+        with self._lock:
+            self._starts.append(now)
+            self._touch(now)
+        return self
+
+    def __exit__(self, error_type, error, error_traceback):
+        now = monotonic()
+        with self._lock:
+            self._elapsed += now - self._starts.pop()
+            self._touch(now)
+
+    @property
+    def name(self):
+        """Retorna el valor actual del atributo name"""
+        return self._name
+
+    def _touch(self, now):
+        if self._first_time is None:
+            self._first_time = now
+        self._last_time = now
+
+    def add(self, counter, value=1):
+        """Incrementa un contador de la etapa, puede ser llamado desde varios hilos
+
+        Args:
+            counter (str): Nombre del contador
+            value (int, optional): Valor a sumar. Defaults to 1.
+        """
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + value
+            self._touch(monotonic())
+
+    def record_request(self, latency, num_bytes=0):
+        """Registra una petición realizada durante la etapa
+
+        Args:
+            latency (float): Latencia en segundos de la petición
+            num_bytes (int, optional): Bytes recibidos. Defaults to 0.
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._counters["requests"] = self._counters.get("requests", 0) + 1
+            self._counters["bytes"] = self._counters.get("bytes", 0) + num_bytes
+            self._touch(monotonic())
+
+    def wall_time(self):
+        """Retorna el tiempo de la etapa: el medido con el bloque with o, si no se usó, el transcurrido entre la primera y la última actividad
+
+        Returns:
+            float: Tiempo en segundos
+        """
+        if self._elapsed > 0 or self._first_time is None:
+            return self._elapsed
+        return self._last_time - self._first_time
+
+    def percentiles(self, quantiles=(0.5, 0.95, 0.99)):
+        """Calcula los percentiles de latencia de las peticiones
+
+        Args:
+            quantiles (tuple, optional): Cuantiles a calcular. Defaults to (0.5, 0.95, 0.99).
+
+        Returns:
+            dict: Latencia en segundos por cada cuantil, vacío si no hay peticiones
+        """
+        latencies = sorted(self._latencies)
+        if not latencies:
+            return {}
+        return {
+            quantile: latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+            for quantile in quantiles
+        }
+
+    def to_dict(self):
+        """Convierte las métricas de la etapa en un diccionario serializable en JSON
+
+        Returns:
+            dict: Métricas de la etapa
+        """
+        wall_time = self.wall_time()
+        metrics = {
+            "stage": self._name,
+            "wall_time": round(wall_time, 4),
+            **self._counters,
+        }
+        if self._latencies:
+            if wall_time > 0:
+                metrics["requests_per_second"] = round(
+                    len(self._latencies) / wall_time, 2
+                )
+            metrics.update(
+                {
+                    "latency_p" + str(round(quantile * 100)): round(latency, 4)
+                    for quantile, latency in self.percentiles().items()
+                }
+            )
+        return metrics
+
+    def samples(self, prefix=METRICS_PREFIX):
+        """Convierte las métricas de la etapa en muestras del formato de texto de Prometheus, con las latencias como histograma
+
+        Args:
+            prefix (str, optional): Prefijo de los nombres de las métricas. Defaults to METRICS_PREFIX.
+
+        Returns:
+            list: Lista de tuplas (familia, tipo, nombre de la muestra, etiquetas, valor)
+        """
+        label = 'stage="' + self._name + '"'
+        family = prefix + "_stage_seconds"
+        samples = [(family, "gauge", family, label, self.wall_time())]
+        for counter, value in sorted(self._counters.items()):
+            family = prefix + "_" + counter + "_total"
+            samples.append((family, "counter", family, label, value))
+        if self._latencies:
+            family = prefix + "_request_seconds"
+            latencies = sorted(self._latencies)
+            position = 0
+            for bucket in METRICS_LATENCY_BUCKETS + ["+Inf"]:
+                while position < len(latencies) and (
+                    bucket == "+Inf" or latencies[position] <= bucket
+                ):
+                    position += 1
+                samples.append(
+                    (
+                        family,
+                        "histogram",
+                        family + "_bucket",
+                        label + ',le="' + str(bucket) + '"',
+                        position,
+                    )
+                )
+            samples += [
+                (family, "histogram", family + "_sum", label, sum(latencies)),
+                (family, "histogram", family + "_count", label, len(latencies)),
+            ]
+        return samples
+
+
 class Metadata:
     """Representa a la información generada durante la ejecución del scraper
 
@@ -71,6 +375,7 @@ class Metadata:
         time_execution (str): Tiempo de ejecución del scraper en formato %d days, %H:%M:%S
         category_per_min (float): Cantidad de categorías que puede extraer el scraper en un minuto
         num_errors (int): Cantidad de errores ocurridos durante la ejecución del scraper
+        stages (dict): Métricas de cada etapa del scraper
     """
 
     def __init__(self):
@@ -83,6 +388,8 @@ class Metadata:
         self._time_execution = 0
         self._category_per_min = 0
         self._num_errors = 0
+        self._stages = {}
+        self._lock = Lock()
         LOGGER.info(f"Hora de inicio: {self._start_hour}")
 
     @property
@@ -100,7 +407,7 @@ class Metadata:
         """Retorna el valor actual o actualiza el valor del atributo quantity"""
         return self._quantity
 
-    @quantity.setter
+    @num_errors.setter
     def num_errors(self, num_errors):
         self._num_errors = num_errors
 
@@ -108,6 +415,81 @@ class Metadata:
     def quantity(self, quantity):
         self._quantity = quantity
 
+    def add_error(self):
+        """Incrementa en uno la cantidad de errores, puede ser llamado desde varios hilos"""
+        with self._lock:
+            self._num_errors += 1
+
+    def stage(self, name):
+        """Retorna las métricas de una etapa, creándolas si no existen. Puede usarse en un bloque with para medir su tiempo
+
+        Args:
+            name (str): Nombre de la etapa
+
+        Returns:
+            StageMetrics: Métricas de la etapa
+        """
+        with self._lock:
+            if name not in self._stages:
+                self._stages[name] = StageMetrics(name)
+            return self._stages[name]
+
+    def to_row(self):
+        """Retorna los valores guardados como una fila en el archivo de la metadata
+
+        Returns:
+            list: Fecha, hora de inicio, hora de fin, cantidad, tiempo de ejecución, categorías por minuto y errores
+        """
+        return [
+            self._execution_date,
+            self._start_hour,
+            self._end_hour,
+            self._quantity,
+            self._time_execution,
+            self._category_per_min,
+            self._num_errors,
+        ]
+
+    def to_dict(self):
+        """Convierte la metadata y las métricas de cada etapa en un diccionario serializable en JSON
+
+        Returns:
+            dict: Metadata y métricas de cada etapa
+        """
+        return {
+            "execution_date": self._execution_date,
+            "start_hour": self._start_hour,
+            "quantity": self._quantity,
+            "errors": self._num_errors,
+            "stages": [self._stages[name].to_dict() for name in self._stages],
+        }
+
+    def save_metrics(self, folder, filename):
+        """Guarda las métricas de cada etapa en formato JSON y en formato de texto de Prometheus
+
+        Args:
+            folder (str): Carpeta donde se guardan las métricas
+            filename (str): Nombre base de los archivos
+        """
+        makedirs(folder, exist_ok=True)
+        stages = [self._stages[name] for name in self._stages]
+        data = self.to_dict()
+        with open(path.join(folder, filename + ".json"), "w", encoding="utf-8") as file:
+            dump(data, file, ensure_ascii=False, indent=2)
+        # Agrupando las muestras por familia como lo exige el formato de Prometheus
+        families = {}
+        for stage in stages:
+            for family, metric_type, name, labels, value in stage.samples():
+                families.setdefault((family, metric_type), []).append(
+                    name + "{" + labels + "} " + str(value)
+                )
+        with open(path.join(folder, filename + ".prom"), "w", encoding="utf-8") as file:
+            for (family, metric_type), lines in families.items():
+                file.write("# TYPE " + family + " " + metric_type + "\n")
+                file.write("\n".join(lines) + "\n")
+        for stage in data["stages"]:
+            LOGGER.info(f"Métricas de la etapa {stage['stage']}: {stage}")
+
     def set_param_final(self):
         """Registra los atributos restantes de la clase MetaData"""
         end = time()
@@ -145,29 +527,47 @@ class WebDriver(Chrome):
         wait (selenium.webdriver.support.wait.WebDriverWait): Atributo que maneja el tiempo máximo de espera usado por el navegador para buscar los elementos
     """
 
-    def __init__(self, timeout=7):
+    def __init__(self, timeout=7, headless=False, driver_path=None, lean=False):
         """Inicializa una instancia de Chrome WebDriver
 
         Args:
             timeout (int, optional): Tiempo máximo de espera en segundos. Defaults to 7.
+            headless (bool, optional): Iniciar el navegador sin interfaz gráfica. Defaults to False.
+            driver_path (str, optional): Ruta del binario de ChromeDriver, si no se indica se usa get_driver_path. Defaults to None.
+            lean (bool, optional): Perfil ligero: sin interfaz gráfica, carga "eager" y sin imágenes, estilos, fuentes ni dominios de terceros. Defaults to False.
         """
         chrome_options = ChromeOptions()
         prefs = {
             "profile.default_content_setting_values.notifications": 2,
             "profile.managed_default_content_settings.popups": 2,
         }
+        if lean:
+            headless = True
+            prefs["profile.managed_default_content_settings.images"] = 2
+            # No esperar a que carguen las imágenes ni los scripts diferidos
+            chrome_options.page_load_strategy = "eager"
         chrome_options.add_experimental_option("prefs", prefs)
         chrome_options.add_experimental_option(
             "excludeSwitches", ["enable-logging"]
         )  # Suprimir los mensajes de consola
+        if headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
         seleniumwire_options = {"disable_capture": True}  # No guardar ningún request
         super().__init__(
             options=chrome_options,
             seleniumwire_options=seleniumwire_options,
-            service=Service(ChromeDriverManager().install()),
+            service=Service(driver_path or get_driver_path()),
         )
         self._wait = WebDriverWait(self, timeout)
-        self.maximize_window()
+        if lean:
+            # Bloqueando los recursos que no se necesitan para leer la página
+            self.execute_cdp_cmd("Network.enable", {})
+            self.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": BROWSER_BLOCKED_URLS}
+            )
+        if not headless:
+            self.maximize_window()
 
     def get_element(self, method, message=""):
         """Función que busca uno o varios elementos ubicados en la página web y los retorna si los encuentra dentro de un tiempo establecido
@@ -182,519 +582,3127 @@ class WebDriver(Chrome):
         return self._wait.until(method, message)
 
 
-class ScraperFalabellaCategory:
-    """Representa a un bot para hacer web scraping en saga falabella
+class SessionApi:
+    """Representa una sesión HTTP compartida que reutiliza las conexiones (keep-alive) hechas a la api de saga falabella
 
     Attributes:
-        metadata (Metadata): Objeto de la clase Metadata que maneja información generada durante la ejecución del scraper
-        df_category (pandas.core.frame.DataFrame): Objeto de la clase DataFrame que maneja información de las categorías extraídas por el scraper
-        df_dict_category (Dataset): Objeto de la clase Data que funciona como diccionario para mapear las categorías de saga falabella
-        df_dict_category_filename (str): Nombre del archivo que contiene el diccionario de datos para mapear las categorías de saga falabella
-        driver (WebDriver): Objeto de la clase WebDriver que maneja un navegador para hacer web scraping
+        session (requests.Session or httpx.Client): Sesión que mantiene el pool de conexiones abiertas
+        http2 (bool): Indica si la sesión realiza las peticiones usando HTTP/2
+        num_requests (int): Cantidad de peticiones realizadas por la sesión
+        num_connections (int): Cantidad de conexiones abiertas por la sesión (solo usado con HTTP/2)
     """
 
-    def __init__(self, dict_filename):
-        """Genera todos los atributos para una instancia de la clase ScraperFalabellaCategory
+    def __init__(
+        self,
+        pool_size=None,
+        max_per_host=None,
+        http2=API_HTTP2,
+        headers=API_HEADERS,
+    ):
+        """Genera todos los atributos para una instancia de la clase SessionApi
 
         Args:
-            dict_filename (str): Nombre del archivo que va a ser usado como diccionario de datos
+            pool_size (int, optional): Cantidad máxima de conexiones abiertas en el pool. Defaults to None (tantas como hilos del pool network).
+            max_per_host (int, optional): Cantidad máxima de conexiones abiertas por host. Defaults to None (igual a pool_size).
+            http2 (bool, optional): Usar HTTP/2 si la librería httpx está instalada. Defaults to API_HTTP2.
+            headers (dict, optional): Cabeceras enviadas en todas las peticiones. Defaults to API_HEADERS.
         """
-        self._metadata = Metadata()
-        self._df_category = DataFrame()
-        # Comprobando si el diccionario para las categorías ya ha sido creado
-        if path.isfile(dict_filename):
-            self._df_dict_category = DataFrame(
-                read_csv(dict_filename, names=DATA_DICT_HEADERS, encoding="utf-8-sig")
-            )
-            LOGGER.info(
-                "El diccionario de categorías se ha definido satisfactoriamente",
-            )
-        else:
-            self._df_dict_category = None
-            LOGGER.info(
-                "El diccionario de categorías no se va a utilizar por ser la primera ejecución",
+        # Cada hilo del pool network debe tener una conexión disponible para no quedar bloqueado
+        if pool_size is None:
+            pool_size = EXECUTORS["network"].max_workers
+        if max_per_host is None:
+            max_per_host = pool_size
+        self._lock = Lock()
+        self._num_requests = 0
+        self._num_connections = 0
+        self._http2 = False
+        if http2:
+            try:
+                self._session = Client(
+                    http2=True,
+                    headers=headers,
+                    limits=Limits(
+                        max_connections=pool_size,
+                        max_keepalive_connections=max_per_host,
+                    ),
+                )
+                self._http2 = True
+            except (ImportError, TypeError):
+                LOGGER.warning(
+                    "No se puede usar HTTP/2. Razón: Las librerías httpx y h2 no están instaladas"
+                )
+
+        if not self._http2:
+            self._session = Session()
+            self._session.headers.update(headers)
+            # requests solo limita las conexiones de cada host (pool_maxsize), pool_connections es la
+            # cantidad de hosts con un pool guardado. Como la api es un solo host, ese límite es el total
+            self._adapter = HTTPAdapter(
+                pool_maxsize=min(pool_size, max_per_host),
+                pool_block=True,
             )
-        self._df_dict_category_filename = dict_filename
-        self._driver = WebDriver()
+            self._session.mount("https://", self._adapter)
+            self._session.mount("http://", self._adapter)
 
-    def close_popups(self):
-        """Cierra todas las ventanas emergentes que nos muestra la página principal de Saga Falabella"""
-        marks = [
-            (By.CLASS_NAME, "dy-lb-close"),
-            (By.ID, "testId-accept-cookies-btn"),
-            (By.CLASS_NAME, "airship-btn airship-btn-deny"),
-            (By.CLASS_NAME, "dy-lb-close"),
-        ]
-        for selector, xpath in marks:
-            try:
-                self._driver.get_element(
-                    EC.element_to_be_clickable((selector, xpath))
-                ).click()
-            except:
-                pass
+    @property
+    def http2(self):
+        """Retorna el valor actual del atributo http2"""
+        return self._http2
 
-    def is_permanent_category(self, text):
-        """Comprueba si la categoría mostrada por el menú es creada solo por temporadas o es permanente
+    def _trace(self, event_name, info):
+        """Registra las conexiones abiertas por httpx
 
         Args:
-            text (str): Nombre de la categoría
-
-        Returns:
-            bool: Booleano
+            event_name (str): Nombre del evento emitido por httpcore
+            info (dict): Información del evento
         """
-        return text.split("\n")[-1] not in ["NUEVO", "Emprendedores", "SALE"]
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._num_connections += 1
 
-    def is_url_category(self, url):
-        """Comprueba si el link no pertenece a una categoría de falabella
+    def get(self, url, **kwargs):
+        """Realiza una petición GET reutilizando las conexiones del pool
 
         Args:
             url (str): Enlace web
 
         Returns:
-            bool: Booleano que indica si el link pertenece o no a una categoría de falabella
+            requests.Response or httpx.Response: Respuesta de la petición
         """
-        return url.find("category") != -1
+        with self._lock:
+            self._num_requests += 1
+        if self._http2:
+            return self._session.get(url, extensions={"trace": self._trace}, **kwargs)
+        return self._session.get(url, **kwargs)
 
-    def get_menu_links(self):
-        """Función que navega por el menú de Saga Falabella y extrae todos los links mostrados por dicha interfaz
+    def connection_stats(self):
+        """Retorna la cantidad de peticiones realizadas y de conexiones abiertas y reutilizadas por la sesión
 
         Returns:
-            list: Lista de enlaces
+            dict: Contadores de la sesión
         """
+        if self._http2:
+            opened = self._num_connections
+        else:
+            pools = self._adapter.poolmanager.pools
+            opened = sum(pools[key].num_connections for key in pools.keys())
+        return {
+            "requests": self._num_requests,
+            "opened": opened,
+            "reused": max(self._num_requests - opened, 0),
+        }
 
-        menu_links = []
-        LOGGER.info("Accediendo al menú principal de saga falabella")
-        self._driver.get_element(
-            EC.element_to_be_clickable(
-                (By.CLASS_NAME, "MarketplaceHamburgerBtn-module_hamburgerBtn__61t-r")
-            )
-        ).click()
+    def close(self):
+        """Cierra todas las conexiones abiertas por la sesión"""
+        self._session.close()
 
-        LOGGER.info(
-            "Registrando la lista de categorías que nos muestra el menú principal"
-        )
-        category_list = self._driver.get_element(
-            EC.visibility_of_all_elements_located(
-                (
-                    By.XPATH,
-                    "//div[@class='FirstLevelCategories-module_categories__x82VK']",
-                )
-            )
-        )
 
-        LOGGER.info("Filtrando categorías que son creadas temporalmente")
-        category_list = list(
-            filter(
-                lambda x: x,
-                list(
-                    THREAD.map(
-                        lambda x: x if self.is_permanent_category(x.text) else None,
-                        category_list,
-                    )
-                ),
-            )
-        )
+class ApiScheduler:
+    """Representa un planificador de las peticiones a la api que limita la tasa de peticiones (token bucket) y ajusta la concurrencia y la tasa (AIMD) según las respuestas del servidor
 
-        LOGGER.info("Navegando por el menú principal")
-        for category in category_list:
-            try:
-                category.click()
-                subcategory_list = self._driver.get_element(
-                    EC.presence_of_all_elements_located(
-                        (
-                            By.XPATH,
-                            "//li[@class='SecondLevelCategories-module_thirdLevelCategory__2ZQFF']/a",
-                        )
-                    )
-                )
-                menu_links += list(
-                    THREAD.map(
-                        lambda x: sub(r"\?.+", "", x.get_attribute("href")),
-                        subcategory_list,
-                    )
-                )
+    Attributes:
+        rate (float): Cantidad actual de peticiones por segundo permitidas
+        max_rate (float): Cantidad máxima de peticiones por segundo a la que puede crecer la tasa
+        burst (int): Cantidad máxima de peticiones que se pueden realizar de golpe
+        max_concurrency (int): Cantidad máxima de peticiones en vuelo
+        concurrency (float): Cantidad actual de peticiones en vuelo permitidas
+        retries (int): Cantidad de reintentos por petición
+        latency_threshold (float): Latencia en segundos a partir de la cual se reduce la concurrencia
+        num_retries (int): Cantidad de reintentos realizados
+        num_throttled (int): Cantidad de veces que se redujo la concurrencia
+    """
 
-            except TimeoutException:
-                LOGGER.error(
-                    "Tiempo agotado para recuperar las subcategorías mostradas por el menú principal de saga falabella",
-                )
+    def __init__(
+        self,
+        rate=API_RATE,
+        burst=API_BURST,
+        max_concurrency=MAX_WORKERS,
+        retries=API_RETRIES,
+        latency_threshold=API_LATENCY_THRESHOLD,
+        max_rate=API_MAX_RATE,
+    ):
+        """Genera todos los atributos para una instancia de la clase ApiScheduler
 
-        LOGGER.info("Filtrando links duplicados")
-        menu_links = list(set(menu_links))
+        Args:
+            rate (float, optional): Peticiones por segundo permitidas al iniciar. Defaults to API_RATE.
+            burst (int, optional): Peticiones que se pueden realizar de golpe. Defaults to API_BURST.
+            max_concurrency (int, optional): Peticiones en vuelo máximas. Defaults to MAX_WORKERS.
+            retries (int, optional): Reintentos por petición. Defaults to API_RETRIES.
+            latency_threshold (float, optional): Latencia máxima tolerada en segundos. Defaults to API_LATENCY_THRESHOLD.
+            max_rate (float, optional): Peticiones por segundo máximas, nunca menor que rate. Defaults to API_MAX_RATE.
+        """
+        self._rate = float(rate)
+        self._max_rate = max(float(rate), float(max_rate))
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._max_concurrency = max_concurrency
+        self._concurrency = max(1.0, max_concurrency / 2)
+        self._in_flight = 0
+        self._retries = retries
+        self._latency_threshold = latency_threshold
+        self._last_decrease = 0.0
+        self._num_retries = 0
+        self._num_throttled = 0
+        self._lock = Lock()
+        # Los hilos y las corrutinas que esperan un espacio se despiertan desde release
+        self._condition = Condition(self._lock)
+        self._async_waiters = deque()
 
-        LOGGER.info("Filtrando los links que no pertenecen a una categoría")
-        menu_links = list(
-            filter(
-                lambda x: x,
-                list(
-                    THREAD.map(
-                        lambda x: x if self.is_url_category(x) else None,
-                        menu_links,
-                    )
-                ),
-            )
-        )
-        LOGGER.info(f"Se han extraído satisfactoriamente {len(menu_links)} links")
-        return menu_links
+    @property
+    def retries(self):
+        """Retorna el valor actual del atributo retries"""
+        return self._retries
 
-    def get_category_info(self, subcategory_links):
-        """Retorna un conjunto de datos que contiene toda la información de las categorías principales de saga falabella
+    @property
+    def rate(self):
+        """Retorna el valor actual del atributo rate"""
+        return self._rate
 
-        Args:
-            subcategory_links (list): Lista de links correspondientes a las subcategorías encontradas en el menú de Saga Falabella
+    @property
+    def max_rate(self):
+        """Retorna el valor actual del atributo max_rate"""
+        return self._max_rate
+
+    @property
+    def max_concurrency(self):
+        """Retorna el valor actual del atributo max_concurrency"""
+        return self._max_concurrency
+
+    def stats(self):
+        """Retorna los contadores del planificador
 
         Returns:
-            pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+            dict: Contadores del planificador
         """
-        # Diccionario de datos que almacena la información de las categorías de saga falabella
-        category_info_link = {}
-        # Diccionario de datos que almacena las categorías de los links recorridos
-        category_dict_info = {
-            "Link_subcat": [],
-            "Name": [],
-            "Link_cat": [],
+        return {
+            "concurrency": round(self._concurrency, 2),
+            "rate": round(self._rate, 2),
+            "retries": self._num_retries,
+            "throttled": self._num_throttled,
         }
 
-        LOGGER.info(
-            "Recopilando los links de las categorías principales a partir de los links presentados por el menú de Saga Falabella",
+    def _reserve(self):
+        """Reserva un espacio de concurrencia y el siguiente token disponible, debe llamarse con el lock tomado
+
+        Returns:
+            float or None: Tiempo en segundos hasta que el token reservado esté disponible, o None si no hay espacio de concurrencia
+        """
+        if self._in_flight >= int(self._concurrency):
+            return None
+        now = monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
         )
-        # Comprobando si el diccionario de links recorridos ha sido definido
-        if self._df_dict_category is not None:
-            LOGGER.info(
-                "Usando el diccionario de datos para encontrar las categorías principales",
-            )
-            temp_subcat_links = []
-            # Recorriendo los links de cada subcategoría
-            for link in subcategory_links:
-                results = self._df_dict_category[
-                    self._df_dict_category[DATA_DICT_HEADERS[0]] == link
-                ].values.tolist()
-                # Comprobando que existan resultados
-                if len(results) > 0:
-                    # Guardando la información de la primera coincidencia
-                    _, name, url_cat = results[0]
-                    category_info_link[name] = url_cat
-                else:
-                    # Guardar los links que aún faltan recorrer
-                    temp_subcat_links.append(link)
+        self._updated = now
+        # Los tokens pueden quedar en negativo: cada petición espera exactamente hasta su turno sin volver a consultar
+        self._tokens -= 1
+        self._in_flight += 1
+        return max(0.0, -self._tokens / self._rate)
 
-            LOGGER.info(
-                f"El diccionario de datos ha mapeado {len(subcategory_links) - len(temp_subcat_links)} links de las subcategorías"
-            )
-            subcategory_links = temp_subcat_links
-            del temp_subcat_links
+    def acquire(self):
+        """Espera hasta poder realizar una petición"""
+        with self._condition:
+            delay = self._reserve()
+            while delay is None:
+                self._condition.wait()
+                delay = self._reserve()
+        if delay > 0:
+            sleep(delay)
 
-        LOGGER.info(f"Hay {len(subcategory_links)} links que faltan recorrer")
-        try:
-            self._driver.get(subcategory_links[0])
-            self._driver.get_element(
-                EC.element_to_be_clickable((By.ID, "testId-modal-close"))
-            ).click()
-        except:
-            pass
+    async def acquire_async(self):
+        """Versión asíncrona de acquire, la corrutina espera sin bloquear el bucle de eventos ni consultar periódicamente"""
+        while True:
+            with self._lock:
+                delay = self._reserve()
+                if delay is None:
+                    waiter = get_running_loop().create_future()
+                    self._async_waiters.append(waiter)
+            if delay is not None:
+                break
+            await waiter
+        if delay > 0:
+            await sleep_async(delay)
 
-        # Recorriendo los links faltantes
-        for link in subcategory_links:
-            self._driver.get(link)
-            # Comprobando que el link no te rediriga a otra página
-            current_link = self._driver.execute_script("return document.URL")
-            if not self.is_url_category(current_link):
-                LOGGER.info(
-                    f"No se va a extraer categorías del link {link}, pues te redirige a otro link: {current_link}",
-                )
+    def _wake_waiters(self):
+        """Despierta a tantos hilos y corrutinas en espera como espacios de concurrencia libres haya, debe llamarse con el lock tomado"""
+        free = max(1, int(self._concurrency) - self._in_flight)
+        self._condition.notify(free)
+        while free > 0 and self._async_waiters:
+            waiter = self._async_waiters.popleft()
+            if waiter.done():
                 continue
+            waiter.get_loop().call_soon_threadsafe(wake_waiter, waiter)
+            free -= 1
 
-            # Navegar hasta la categoría padre de la subcategoría
-            is_not_root_path = True
-            while is_not_root_path:
-                try:
-                    self._driver.get_element(
-                        EC.presence_of_element_located(
-                            (By.XPATH, "//a[@class='jsx-2883309125 l1category']")
-                        )
-                    ).click()
+    def release(self, status_code, latency):
+        """Libera el espacio de concurrencia de una petición y ajusta la concurrencia y la tasa: aumento aditivo si la respuesta fue rápida y correcta, reducción a la mitad si hubo bloqueo, error o latencia alta
 
-                except ElementNotInteractableException:
-                    LOGGER.info("Se ha conseguido llegar hasta la categoría principal")
-                    is_not_root_path = False
+        Args:
+            status_code (int or None): Código de estado de la respuesta, None si la petición falló
+            latency (float): Latencia de la petición en segundos
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if (
+                status_code is None
+                or status_code in API_THROTTLE_STATUS
+                or latency > self._latency_threshold
+            ):
+                now = monotonic()
+                # Reduciendo la concurrencia y la tasa como máximo una vez por intervalo
+                if now - self._last_decrease > self._latency_threshold:
+                    self._concurrency = max(1.0, self._concurrency / 2)
+                    self._rate = max(API_MIN_RATE, self._rate / 2)
+                    self._last_decrease = now
+                    self._num_throttled += 1
+                    LOGGER.warning(
+                        f"Reduciendo la concurrencia de la api a {int(self._concurrency)} y la tasa a {self._rate:.1f} peticiones por segundo (estado: {status_code}, latencia: {latency:.2f} segundos)"
+                    )
+            else:
+                self._concurrency = min(
+                    self._max_concurrency, self._concurrency + 1 / self._concurrency
+                )
+                # Con tantas respuestas por segundo como la tasa, crece una petición por segundo cada segundo
+                self._rate = min(self._max_rate, self._rate + 1 / self._rate)
+            self._wake_waiters()
 
-            url_cat = self._driver.execute_script("return document.URL")
-            name_cat = self._driver.get_element(
-                EC.presence_of_element_located(
-                    (By.XPATH, "//h1[@class='jsx-2883309125 l2category']")
-                ),
-            ).text
+    def is_retryable(self, status_code):
+        """Comprueba si una petición debe reintentarse
 
-            # Guardando las nuevas incidencias al diccionario de categorías
-            category_dict_info["Link_subcat"].append(link)
-            category_dict_info["Name"].append(name_cat)
-            category_dict_info["Link_cat"].append(url_cat)
-            category_info_link[name_cat] = url_cat
-            LOGGER.info(f"Categoría Obtenida: {name_cat}")
+        Args:
+            status_code (int or None): Código de estado de la respuesta, None si la petición falló
 
-        LOGGER.info("Comprobado si existen nuevas incidencias")
-        df_dict_info = DataFrame(category_dict_info)
-        df_dict_info_length = df_dict_info.shape[0]
-        if df_dict_info_length == 0:
-            LOGGER.info(
-                "No se va a guardar el diccionario de links recorridos. Razón: No han aparecido nuevas incidencias",
-            )
-        else:
-            if self._df_dict_category is None:
-                LOGGER.info(
-                    "Creando un diccionario de datos con las nuevas incidencias encontradas"
-                )
-                self._df_dict_category = df_dict_info
-            else:
+        Returns:
+            bool: Booleano
+        """
+        # Una respuesta 200 que llega hasta aquí no es JSON (página de bloqueo)
+        return status_code is None or status_code in API_RETRY_STATUS or status_code == 200
+
+    def backoff(self, attempt, retry_after=None):
+        """Calcula el tiempo de espera antes de un reintento (espera exponencial con jitter)
+
+        Args:
+            attempt (int): Número de reintento empezando en 0
+            retry_after (str, optional): Valor de la cabecera Retry-After. Defaults to None.
+
+        Returns:
+            float: Tiempo de espera en segundos
+        """
+        with self._lock:
+            self._num_retries += 1
+        delay = uniform(0, min(API_BACKOFF_MAX, API_BACKOFF_BASE * 2**attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+
+
+class CategoryDictionary:
+    """Representa al diccionario de datos que mapea los links de las subcategorías con su categoría principal, indexado por Link_subcat
+
+    Attributes:
+        filename (str): Nombre del archivo que contiene el diccionario de datos
+        index (pandas.core.frame.DataFrame): Diccionario de datos indexado por el link de la subcategoría
+        loaded (bool): Indica si el diccionario de datos fue cargado desde un archivo
+    """
+
+    def __init__(self, filename):
+        """Genera todos los atributos para una instancia de la clase CategoryDictionary
+
+        Args:
+            filename (str): Nombre del archivo que va a ser usado como diccionario de datos
+        """
+        self._filename = filename
+        # Comprobando si el diccionario para las categorías ya ha sido creado
+        if path.isfile(filename):
+            df_dict = read_csv(filename, names=DATA_DICT_HEADERS, encoding="utf-8-sig")
+            self._loaded = True
+            LOGGER.info(
+                "El diccionario de categorías se ha definido satisfactoriamente",
+            )
+        else:
+            df_dict = DataFrame(columns=DATA_DICT_HEADERS)
+            self._loaded = False
+            LOGGER.info(
+                "El diccionario de categorías no se va a utilizar por ser la primera ejecución",
+            )
+        self._index = self.build_index(df_dict)
+
+    @property
+    def filename(self):
+        """Retorna el valor actual del atributo filename"""
+        return self._filename
+
+    @property
+    def loaded(self):
+        """Retorna el valor actual del atributo loaded"""
+        return self._loaded
+
+    def build_index(self, df_dict):
+        """Genera el índice hash del diccionario conservando la primera coincidencia de cada link
+
+        Args:
+            df_dict (pandas.core.frame.DataFrame): Diccionario de datos con las columnas DATA_DICT_HEADERS
+
+        Returns:
+            pandas.core.frame.DataFrame: Diccionario de datos indexado por Link_subcat
+        """
+        return df_dict.drop_duplicates(DATA_DICT_HEADERS[0], keep="first").set_index(
+            DATA_DICT_HEADERS[0]
+        )
+
+    def lookup(self, links):
+        """Busca todos los links en el diccionario de datos en una sola operación
+
+        Args:
+            links (list): Lista de links de las subcategorías
+
+        Returns:
+            tuple: Lista de pares (nombre, link) de las categorías encontradas y lista de links no encontrados
+        """
+        df_found = self._index.reindex(links)
+        is_missing = df_found[DATA_DICT_HEADERS[1]].isna()
+        df_hits = df_found[~is_missing]
+        results = list(zip(df_hits[DATA_DICT_HEADERS[1]], df_hits[DATA_DICT_HEADERS[2]]))
+        return results, df_found.index[is_missing].tolist()
+
+    def append(self, df_dict_info):
+        """Agrega las nuevas incidencias al índice y al final del archivo sin reescribirlo
+
+        Args:
+            df_dict_info (pandas.core.frame.DataFrame): Nuevas incidencias con las columnas DATA_DICT_HEADERS
+        """
+        is_new_file = not path.isfile(self._filename)
+        df_dict_info[DATA_DICT_HEADERS].to_csv(
+            self._filename,
+            mode="a",
+            header=False,
+            index=False,
+            # El BOM solo debe escribirse al inicio del archivo
+            encoding="utf-8-sig" if is_new_file else "utf-8",
+        )
+        new_index = self.build_index(df_dict_info[DATA_DICT_HEADERS])
+        self._index = concat(
+            [self._index, new_index[~new_index.index.isin(self._index.index)]]
+        )
+        self._loaded = True
+
+
+class ResponseCache:
+    """Representa una caché en disco (SQLite) de las respuestas de la api indexada por el id, nombre y path de la categoría
+
+    Attributes:
+        filename (str): Nombre del archivo de la caché
+        ttl (int): Tiempo en segundos durante el cual una respuesta se considera vigente
+        max_entries (int): Cantidad máxima de respuestas guardadas, se eliminan las menos usadas recientemente
+        offline (bool): Indica si solo se usan las respuestas guardadas sin realizar peticiones a la api
+        hits (int): Cantidad de respuestas obtenidas de la caché
+        misses (int): Cantidad de respuestas no encontradas en la caché
+        revalidated (int): Cantidad de respuestas que la api confirmó que no cambiaron (304)
+    """
+
+    def __init__(
+        self,
+        filename=API_CACHE_FILENAME,
+        ttl=API_CACHE_TTL,
+        max_entries=API_CACHE_MAX_ENTRIES,
+        offline=False,
+    ):
+        """Genera todos los atributos para una instancia de la clase ResponseCache
+
+        Args:
+            filename (str, optional): Nombre del archivo de la caché. Defaults to API_CACHE_FILENAME.
+            ttl (int, optional): Tiempo de vigencia en segundos. Defaults to API_CACHE_TTL.
+            max_entries (int, optional): Cantidad máxima de respuestas. Defaults to API_CACHE_MAX_ENTRIES.
+            offline (bool, optional): Usar solo las respuestas guardadas. Defaults to False.
+        """
+        self._filename = filename
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._offline = offline
+        self._hits = 0
+        self._misses = 0
+        self._revalidated = 0
+        self._inserts = 0
+        self._lock = Lock()
+        # Los procesos de trabajo comparten el archivo, por lo que se espera más tiempo por el bloqueo
+        self._connection = connect(
+            filename,
+            timeout=API_CACHE_TIMEOUT,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute("PRAGMA synchronous=NORMAL")
+        self._execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+
+    @property
+    def offline(self):
+        """Retorna el valor actual del atributo offline"""
+        return self._offline
+
+    def _execute(self, query, parameters=()):
+        """Ejecuta una consulta en la caché, reintentando si otro proceso mantiene bloqueada la base de datos
+
+        Args:
+            query (str): Consulta SQL
+            parameters (tuple, optional): Parámetros de la consulta. Defaults to ().
+
+        Returns:
+            sqlite3.Cursor: Cursor con el resultado de la consulta
+        """
+        for attempt in range(API_CACHE_RETRIES):
+            try:
+                return self._connection.execute(query, parameters)
+            except OperationalError as error:
+                message = str(error)
+                if attempt + 1 == API_CACHE_RETRIES or (
+                    "locked" not in message and "busy" not in message
+                ):
+                    raise
+                LOGGER.warning(
+                    f"La caché de la api está bloqueada ({message}), reintentando (intento {attempt + 1})"
+                )
+                sleep(min(API_BACKOFF_BASE * 2**attempt, API_BACKOFF_MAX))
+
+    def stats(self):
+        """Retorna los contadores de uso de la caché
+
+        Returns:
+            dict: Contadores de la caché
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "revalidated": self._revalidated,
+        }
+
+    def make_key(self, id_cat, name_subcat, path_subcat):
+        """Genera la llave de la caché a partir del id, nombre y path de una categoría
+
+        Args:
+            id_cat (str): Id de la categoría
+            name_subcat (str): Nombre de la categoría
+            path_subcat (str): Path de la categoría
+
+        Returns:
+            str: Llave de la caché
+        """
+        return "\x1f".join([id_cat, name_subcat, path_subcat])
+
+    def lookup(self, key):
+        """Busca una respuesta en la caché
+
+        Args:
+            key (str): Llave de la caché
+
+        Returns:
+            tuple: Cuerpo de la respuesta si está vigente (o si se trabaja sin conexión) y cabeceras para revalidar la respuesta con la api
+        """
+        with self._lock:
+            row = self._execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None, {}
+
+            body, etag, last_modified, stored_at = row
+            self._execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time(), key)
+            )
+            if self._offline or time() - stored_at < self._ttl:
+                self._hits += 1
+                return body, {}
+
+            self._misses += 1
+            headers = {}
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+            return None, headers
+
+    def store(self, key, status_code, headers, body):
+        """Guarda la respuesta de la api en la caché
+
+        Args:
+            key (str): Llave de la caché
+            status_code (int): Código de estado de la respuesta
+            headers (dict): Cabeceras de la respuesta
+            body (bytes): Cuerpo de la respuesta
+
+        Returns:
+            bytes: Cuerpo a usar, el guardado en la caché si la api respondió que no hubo cambios
+        """
+        with self._lock:
+            if status_code == 304:
+                row = self._execute(
+                    "SELECT body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._revalidated += 1
+                    self._execute(
+                        "UPDATE responses SET stored_at = ? WHERE key = ?", (time(), key)
+                    )
+                    return row[0]
+                return body
+
+            if status_code != 200:
+                return body
+
+            now = time()
+            self._execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, body, headers.get("ETag"), headers.get("Last-Modified"), now, now),
+            )
+            self._inserts += 1
+            if self._inserts % API_CACHE_EVICT_EVERY == 0:
+                self._evict()
+        return body
+
+    def _evict(self):
+        """Elimina las respuestas menos usadas recientemente que superan la cantidad máxima"""
+        self._execute(
+            """DELETE FROM responses WHERE key IN (
+                SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )""",
+            (self._max_entries,),
+        )
+
+    def close(self):
+        """Aplica el límite de tamaño y cierra la conexión a la caché, si aún no ha sido cerrada"""
+        with self._lock:
+            if self._connection is None:
+                return
+            self._evict()
+            self._connection.close()
+            self._connection = None
+
+
+class CategoryTree:
+    """Representa el árbol de categorías como una lista de adyacencia compacta, donde cada categoría es un nodo entero
+
+    Attributes:
+        ids (list): Id de la categoría de cada nodo
+        parents (list): Nodo padre de cada nodo (-1 para las categorías principales)
+        depths (list): Nivel de profundidad de cada nodo
+        names (list): Posición del nombre de cada nodo en la tabla de nombres
+        paths (list): Path de la categoría de cada nodo
+        children (list): Nodos hijos de cada nodo
+        roots (list): Nodos de las categorías principales
+        name_table (list): Tabla de nombres únicos
+        name_index (dict): Posición de cada nombre en la tabla de nombres
+        index (dict): Nodo de cada id de categoría
+        max_depth (int): Mayor nivel de profundidad registrado
+    """
+
+    def __init__(self):
+        """Genera todos los atributos para una instancia de la clase CategoryTree"""
+        self._ids = []
+        self._parents = []
+        self._depths = []
+        self._names = []
+        self._paths = []
+        self._children = []
+        self._roots = []
+        self._name_table = []
+        self._name_index = {}
+        self._index = {}
+        self._max_depth = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, id_cat):
+        return id_cat in self._index
+
+    @property
+    def max_depth(self):
+        return self._max_depth
+
+    def intern_name(self, name):
+        """Obtiene la posición de un nombre en la tabla de nombres, agregándolo si no existe
+
+        Args:
+            name (str): Nombre de la categoría
+
+        Returns:
+            int: Posición del nombre en la tabla de nombres
+        """
+        position = self._name_index.get(name)
+        if position is None:
+            position = len(self._name_table)
+            self._name_table.append(name)
+            self._name_index[name] = position
+        return position
+
+    def add(self, parent_id, id_cat, name, path_cat, depth):
+        """Agrega una categoría al árbol en tiempo constante
+
+        Args:
+            parent_id (str): Id de la categoría padre (None para las categorías principales)
+            id_cat (str): Id de la categoría
+            name (str): Nombre de la categoría
+            path_cat (str): Path de la categoría
+            depth (int): Nivel de profundidad de la categoría
+
+        Returns:
+            int: Nodo de la categoría
+        """
+        node = len(self._ids)
+        parent = self._index.get(parent_id, -1) if parent_id is not None else -1
+        self._ids.append(id_cat)
+        self._parents.append(parent)
+        self._depths.append(depth)
+        self._names.append(self.intern_name(name))
+        self._paths.append(path_cat)
+        self._children.append([])
+        self._index[id_cat] = node
+        if parent == -1:
+            self._roots.append(node)
+        else:
+            self._children[parent].append(node)
+        self._max_depth = max(self._max_depth, depth)
+        return node
+
+    def ids(self):
+        """Retorna los ids de todas las categorías del árbol
+
+        Returns:
+            list: Lista de ids
+        """
+        return list(self._ids)
+
+    def node_info(self, node):
+        """Retorna la información de un nodo
+
+        Args:
+            node (int): Nodo de la categoría
+
+        Returns:
+            tuple: Nivel de profundidad, id padre, id, nombre y path de la categoría
+        """
+        parent = self._parents[node]
+        return (
+            self._depths[node],
+            self._ids[parent] if parent != -1 else None,
+            self._ids[node],
+            self._name_table[self._names[node]],
+            self._paths[node],
+        )
+
+    def nodes(self):
+        """Recorre todas las categorías del árbol en orden de inserción
+
+        Yields:
+            tuple: Nivel de profundidad, id padre, id, nombre y path de la categoría
+        """
+        for node in range(len(self._ids)):
+            yield self.node_info(node)
+
+    def children(self, id_cat):
+        """Retorna las subcategorías directas de una categoría
+
+        Args:
+            id_cat (str): Id de la categoría
+
+        Returns:
+            list: Lista de tuplas (nivel de profundidad, id padre, id, nombre y path) de las subcategorías
+        """
+        node = self._index.get(id_cat)
+        if node is None:
+            return []
+        return [self.node_info(child) for child in self._children[node]]
+
+    def leaves(self):
+        """Retorna las categorías que no tienen subcategorías
+
+        Returns:
+            list: Lista de tuplas (nivel de profundidad, id padre, id, nombre y path) de las categorías
+        """
+        return [
+            self.node_info(node)
+            for node in range(len(self._ids))
+            if not self._children[node]
+        ]
+
+    def to_records(self):
+        """Convierte el árbol en una lista serializable en JSON
+
+        Returns:
+            list: Lista de categorías [id padre, id, nombre, path, nivel de profundidad] en orden de inserción
+        """
+        return [
+            [id_parent, id_cat, name, path_cat, depth]
+            for depth, id_parent, id_cat, name, path_cat in self.nodes()
+        ]
+
+    @classmethod
+    def from_records(cls, records):
+        """Genera un árbol a partir de una lista generada por el método to_records
+
+        Args:
+            records (list): Lista de categorías [id padre, id, nombre, path, nivel de profundidad]
+
+        Returns:
+            CategoryTree: Instancia de la clase CategoryTree
+        """
+        tree = cls()
+        for id_parent, id_cat, name, path_cat, depth in records:
+            tree.add(id_parent, id_cat, name, path_cat, depth)
+        return tree
+
+    @classmethod
+    def from_frame(cls, df_category):
+        """Genera un árbol a partir del árbol de categorías en formato ancho (Id_i, Name_i, Category_path_i)
+
+        Args:
+            df_category (pandas.core.frame.DataFrame): Árbol de categorías guardado por el scraper
+
+        Returns:
+            CategoryTree: Instancia de la clase CategoryTree
+        """
+        tree = cls()
+        df_root = df_category[["Id_0", "Name_0"]].dropna().drop_duplicates("Id_0")
+        for id_cat, name_cat in df_root.values:
+            tree.add(None, id_cat, name_cat, "", 0)
+        depth = 1
+        while "Id_" + str(depth) in df_category.columns:
+            columns = [
+                "Id_" + str(depth - 1),
+                "Id_" + str(depth),
+                "Name_" + str(depth),
+                "Category_path_" + str(depth),
+            ]
+            df_level = (
+                df_category[columns]
+                .dropna(subset=[columns[1]])
+                .drop_duplicates(columns[1])
+                .fillna("")
+            )
+            for id_parent, id_cat, name_cat, path_cat in df_level.values:
+                if id_cat not in tree:
+                    tree.add(id_parent, id_cat, name_cat, path_cat, depth)
+            depth += 1
+        return tree
+
+    def columns(self, root_path=True):
+        """Retorna las columnas del árbol de categorías en formato ancho (Id_i, Name_i, Category_path_i)
+
+        Args:
+            root_path (bool, optional): Incluir la columna Category_path_0. Defaults to True.
+
+        Returns:
+            list: Lista de columnas
+        """
+        columns = [
+            name + str(depth)
+            for depth in range(self._max_depth + 1)
+            for name in ["Id_", "Name_", "Category_path_"]
+        ]
+        if not root_path:
+            columns.remove("Category_path_0")
+        return columns
+
+    def iter_rows(self, root_path=True):
+        """Recorre el árbol en profundidad generando una fila en formato ancho por cada categoría sin subcategorías
+
+        Args:
+            root_path (bool, optional): Incluir la columna Category_path_0. Defaults to True.
+
+        Yields:
+            tuple: Fila con las columnas del método columns
+        """
+        width = 3 * (self._max_depth + 1)
+        stack = [(node, ()) for node in reversed(self._roots)]
+        while stack:
+            node, prefix = stack.pop()
+            prefix += (
+                self._ids[node],
+                self._name_table[self._names[node]],
+                self._paths[node],
+            )
+            if self._children[node]:
+                stack.extend((child, prefix) for child in reversed(self._children[node]))
+            else:
+                row = prefix + (None,) * (width - len(prefix))
+                yield row if root_path else row[:2] + row[3:]
+
+    def iter_chunks(self, size, root_path=True):
+        """Agrupa las filas del método iter_rows en bloques
+
+        Args:
+            size (int): Cantidad de filas por bloque
+            root_path (bool, optional): Incluir la columna Category_path_0. Defaults to True.
+
+        Yields:
+            list: Bloque de filas
+        """
+        rows = []
+        for row in self.iter_rows(root_path):
+            rows.append(row)
+            if len(rows) >= size:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+
+    def to_frame(self, root_path=True):
+        """Genera el árbol de categorías en formato ancho (Id_i, Name_i, Category_path_i), con una fila por cada categoría sin subcategorías
+
+        Args:
+            root_path (bool, optional): Incluir la columna Category_path_0. Defaults to True.
+
+        Returns:
+            pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+        """
+        return DataFrame(self.iter_rows(root_path), columns=self.columns(root_path))
+
+
+class DataSink(ABC):
+    """Representa un destino de datos que recibe filas por bloques y las escribe en el disco a medida que llegan, con un buffer acotado. El archivo se escribe con extensión .part y solo se renombra al cerrarlo
+
+    Attributes:
+        filepath (str): Carpeta donde se guarda el archivo
+        filename (str): Nombre del archivo sin extensión
+        columns (list): Columnas de las filas
+        buffer_size (int): Cantidad máxima de filas en memoria antes de escribirlas
+        encoding (str): Codificación usada para guardar el archivo
+        with_quantity (bool): Indica si se agrega la cantidad de filas al nombre final del archivo
+        buffer (list): Filas pendientes de escribir
+        quantity (int): Cantidad de filas escritas
+        temp_filename (str): Nombre del archivo mientras se escribe
+        final_filename (str): Nombre del archivo una vez cerrado
+    """
+
+    extension = ""
+
+    def __init__(
+        self,
+        filepath,
+        filename,
+        columns,
+        buffer_size=SINK_BUFFER_SIZE,
+        encoding="utf-8-sig",
+        with_quantity=True,
+    ):
+        """Genera todos los atributos para una instancia de la clase DataSink
+
+        Args:
+            filepath (str): Carpeta donde se guarda el archivo
+            filename (str): Nombre del archivo sin extensión
+            columns (list): Columnas de las filas
+            buffer_size (int, optional): Filas en memoria antes de escribirlas. Defaults to SINK_BUFFER_SIZE.
+            encoding (str, optional): Codificación usada para guardar el archivo. Defaults to "utf-8-sig".
+            with_quantity (bool, optional): Agregar la cantidad de filas al nombre final del archivo. Defaults to True.
+        """
+        makedirs(filepath, exist_ok=True)
+        self._filepath = filepath
+        self._filename = filename
+        self._columns = list(columns)
+        self._buffer_size = buffer_size
+        self._encoding = encoding
+        self._with_quantity = with_quantity
+        self._buffer = []
+        self._quantity = 0
+        self._temp_filename = path.join(
+            filepath, filename + "_" + uuid4().hex[:8] + self.extension + ".part"
+        )
+        self._final_filename = None
+        self._lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, error_traceback):
+        if error_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def quantity(self):
+        """Retorna la cantidad de filas recibidas"""
+        return self._quantity + len(self._buffer)
+
+    @property
+    def final_filename(self):
+        """Retorna el valor actual del atributo final_filename"""
+        return self._final_filename
+
+    def write(self, rows):
+        """Agrega filas al buffer y las escribe en el disco si se llenó, puede ser llamado desde varios hilos
+
+        Args:
+            rows (list): Lista de filas con las columnas del atributo columns
+        """
+        with self._lock:
+            self._buffer.extend(rows)
+            if len(self._buffer) >= self._buffer_size:
+                self.flush()
+
+    def flush(self):
+        """Escribe en el disco las filas del buffer"""
+        if self._buffer:
+            self.write_rows(self._buffer)
+            self._quantity += len(self._buffer)
+            self._buffer = []
+
+    @abstractmethod
+    def write_rows(self, rows):
+        """Escribe un bloque de filas en el archivo, cada formato define cómo hacerlo
+
+        Args:
+            rows (list): Lista de filas con las columnas del atributo columns
+        """
+
+    def close_file(self):
+        """Cierra el archivo si fue abierto"""
+
+    def close(self):
+        """Escribe las filas pendientes y renombra el archivo a su nombre final de forma atómica
+
+        Returns:
+            str or None: Ruta del archivo final o None si no se escribió ninguna fila
+        """
+        with self._lock:
+            self.flush()
+            self.close_file()
+            if self._quantity == 0:
+                if path.isfile(self._temp_filename):
+                    remove(self._temp_filename)
+                return None
+            filename = self._filename
+            if self._with_quantity:
+                filename += "_" + str(self._quantity)
+            self._final_filename = path.join(self._filepath, filename + self.extension)
+            replace(self._temp_filename, self._final_filename)
+            return self._final_filename
+
+    def abort(self):
+        """Descarta el archivo sin renombrarlo"""
+        with self._lock:
+            self._buffer = []
+            self.close_file()
+            if path.isfile(self._temp_filename):
+                remove(self._temp_filename)
+
+
+class CsvSink(DataSink):
+    """Destino de datos que agrega las filas al final de un archivo CSV separado por punto y coma"""
+
+    extension = ".csv"
+
+    def write_rows(self, rows):
+        """Escribe un bloque de filas en el archivo CSV, con la cabecera solo en el primer bloque
+
+        Args:
+            rows (list): Lista de filas con las columnas del atributo columns
+        """
+        with open(self._temp_filename, "a", encoding=self._encoding, newline="") as file:
+            DataFrame(rows, columns=self._columns).to_csv(
+                file, sep=";", index=False, header=self._quantity == 0
+            )
+
+
+class JsonlSink(DataSink):
+    """Destino de datos que escribe una fila por línea en formato JSON"""
+
+    extension = ".jsonl"
+
+    def write_rows(self, rows):
+        """Escribe un bloque de filas en el archivo JSONL
+
+        Args:
+            rows (list): Lista de filas con las columnas del atributo columns
+        """
+        with open(self._temp_filename, "a", encoding="utf-8") as file:
+            file.writelines(
+                dumps(dict(zip(self._columns, row)), ensure_ascii=False) + "\n"
+                for row in rows
+            )
+
+
+class ParquetSink(DataSink):
+    """Destino de datos que escribe cada bloque de filas como un row group de un archivo Parquet
+
+    Attributes:
+        dictionary_columns (list): Columnas codificadas como diccionario
+        writer (pyarrow.parquet.ParquetWriter): Escritor del archivo Parquet, se abre con el primer bloque
+        schema (pyarrow.Schema): Esquema del archivo, inferido del primer bloque
+    """
+
+    extension = ".parquet"
+
+    def __init__(self, *args, dictionary_columns=None, **kwargs):
+        """Genera todos los atributos para una instancia de la clase ParquetSink
+
+        Args:
+            dictionary_columns (list, optional): Columnas codificadas como diccionario. Defaults to None.
+        """
+        super().__init__(*args, **kwargs)
+        self._dictionary_columns = dictionary_columns or False
+        self._writer = None
+        self._schema = None
+
+    def write_rows(self, rows):
+        """Escribe un bloque de filas como un row group del archivo Parquet
+
+        Args:
+            rows (list): Lista de filas con las columnas del atributo columns
+        """
+        df_rows = DataFrame(rows, columns=self._columns)
+        if self._writer is None:
+            # Las columnas sin valores en el primer bloque se guardan como texto
+            inferred = Table.from_pandas(df_rows, preserve_index=False).schema
+            self._schema = schema(
+                [
+                    (column.name, string() if str(column.type) == "null" else column.type)
+                    for column in inferred
+                ]
+            )
+            self._writer = ParquetWriter(
+                self._temp_filename,
+                self._schema,
+                use_dictionary=self._dictionary_columns,
+                compression="zstd",
+            )
+        self._writer.write_table(
+            Table.from_pandas(df_rows, schema=self._schema, preserve_index=False)
+        )
+
+    def close_file(self):
+        """Cierra el escritor del archivo Parquet si fue abierto"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+SINK_FORMATS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+
+class CrawlCheckpoint:
+    """Representa un punto de control del recorrido del árbol de categorías, guardado en disco como JSON comprimido
+
+    Attributes:
+        filename (str): Nombre del archivo del punto de control
+        interval (float): Tiempo mínimo en segundos entre dos guardados
+        state (dict): Parámetros del recorrido que no cambian (profundidad y motor)
+    """
+
+    def __init__(self, filename=CHECKPOINT_FILENAME, interval=CHECKPOINT_INTERVAL, **state):
+        """Genera todos los atributos para una instancia de la clase CrawlCheckpoint
+
+        Args:
+            filename (str, optional): Nombre del archivo del punto de control. Defaults to CHECKPOINT_FILENAME.
+            interval (float, optional): Tiempo mínimo en segundos entre dos guardados. Defaults to CHECKPOINT_INTERVAL.
+        """
+        self._filename = filename
+        self._interval = interval
+        self._state = state
+        self._last_save = monotonic()
+
+    def maybe_save(self, tree, frontier):
+        """Guarda el estado del recorrido si ya pasó el intervalo desde el último guardado
+
+        Args:
+            tree (CategoryTree): Árbol de categorías registradas
+            frontier (iterable): Tuplas (id, nombre y path de la categoría, nivel de profundidad de sus subcategorías) pendientes de expandir
+        """
+        if monotonic() - self._last_save >= self._interval:
+            self.save(tree, frontier)
+
+    def save(self, tree, frontier):
+        """Guarda el estado del recorrido reemplazando el punto de control anterior de forma atómica
+
+        Args:
+            tree (CategoryTree): Árbol de categorías registradas
+            frontier (iterable): Tuplas (id, nombre y path de la categoría, nivel de profundidad de sus subcategorías) pendientes de expandir
+        """
+        data = dict(
+            self._state,
+            tree=tree.to_records(),
+            frontier=[[*category_level, depth] for category_level, depth in frontier],
+        )
+        temp_filename = self._filename + ".tmp"
+        with gzip_open(temp_filename, "wt", encoding="utf-8") as file:
+            dump(data, file, separators=(",", ":"))
+        replace(temp_filename, self._filename)
+        self._last_save = monotonic()
+        LOGGER.info(
+            f"Punto de control guardado: {len(data['frontier'])} categorías pendientes"
+        )
+
+    @classmethod
+    def load(cls, filename=CHECKPOINT_FILENAME):
+        """Carga un punto de control guardado por el método save
+
+        Args:
+            filename (str, optional): Nombre del archivo del punto de control. Defaults to CHECKPOINT_FILENAME.
+
+        Returns:
+            tuple: Instancia de la clase CrawlCheckpoint y estado guardado, o (None, None) si el archivo no existe
+        """
+        if not path.isfile(filename):
+            return None, None
+        with gzip_open(filename, "rt", encoding="utf-8") as file:
+            data = load_json(file)
+        state = {key: data[key] for key in ["level", "engine"]}
+        return cls(filename, **state), data
+
+    def remove(self):
+        """Elimina el punto de control una vez terminado el recorrido"""
+        if path.isfile(self._filename):
+            remove(self._filename)
+
+
+class IdRegistry:
+    """Representa un registro de ids de categorías respaldado por un conjunto hash para comprobar duplicados en tiempo constante
+
+    Attributes:
+        ids (set): Conjunto de ids registrados
+    """
+
+    def __init__(self, ids=None):
+        """Genera todos los atributos para una instancia de la clase IdRegistry
+
+        Args:
+            ids (iterable, optional): Ids a registrar inicialmente. Defaults to None.
+        """
+        self._ids = set(ids) if ids is not None else set()
+        self._lock = Lock()
+
+    def __contains__(self, id_cat):
+        return id_cat in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def add(self, id_cat):
+        """Registra un id
+
+        Args:
+            id_cat (str): Id de la categoría
+
+        Returns:
+            bool: Booleano que indica si el id no había sido registrado antes
+        """
+        with self._lock:
+            if id_cat in self._ids:
+                return False
+            self._ids.add(id_cat)
+            return True
+
+    def add_many(self, ids):
+        """Registra una lista de ids
+
+        Args:
+            ids (iterable): Ids de las categorías
+
+        Returns:
+            list: Lista de booleanos que indica qué ids no habían sido registrados antes (primera aparición)
+        """
+        return [self.add(id_cat) for id_cat in ids]
+
+    def save(self, filename):
+        """Guarda los ids registrados en un archivo de texto, un id por línea
+
+        Args:
+            filename (str): Nombre del archivo
+        """
+        temp_filename = filename + ".tmp"
+        with open(temp_filename, "w", encoding="utf-8") as file:
+            file.writelines(id_cat + "\n" for id_cat in sorted(self._ids))
+        replace(temp_filename, filename)
+
+    @classmethod
+    def load(cls, filename):
+        """Genera un registro de ids a partir de un archivo generado por el método save
+
+        Args:
+            filename (str): Nombre del archivo
+
+        Returns:
+            IdRegistry: Registro vacío si el archivo no existe
+        """
+        if not path.isfile(filename):
+            return cls()
+        with open(filename, encoding="utf-8") as file:
+            return cls(line.rstrip("\n") for line in file if line.strip())
+
+
+class WorkQueue:
+    """Representa una cola de trabajo compartida entre procesos (o máquinas con una carpeta compartida) guardada en un archivo SQLite, donde cada tarea es reclamada por un solo proceso
+
+    Attributes:
+        filename (str): Nombre del archivo de la cola
+        timeout (float): Tiempo en segundos tras el cual una tarea reclamada sin terminar vuelve a estar disponible
+        max_attempts (int): Cantidad máxima de intentos por tarea
+        connection (sqlite3.Connection): Conexión a la base de datos de la cola
+    """
+
+    def __init__(
+        self,
+        filename=QUEUE_FILENAME,
+        timeout=QUEUE_TASK_TIMEOUT,
+        max_attempts=QUEUE_MAX_ATTEMPTS,
+    ):
+        """Genera todos los atributos para una instancia de la clase WorkQueue
+
+        Args:
+            filename (str, optional): Nombre del archivo de la cola. Defaults to QUEUE_FILENAME.
+            timeout (float, optional): Tiempo en segundos para recuperar una tarea abandonada. Defaults to QUEUE_TASK_TIMEOUT.
+            max_attempts (int, optional): Intentos por tarea. Defaults to QUEUE_MAX_ATTEMPTS.
+        """
+        self._filename = filename
+        self._timeout = timeout
+        self._max_attempts = max_attempts
+        self._connection = connect(filename, timeout=60, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                claimed_at REAL,
+                result TEXT
+            )"""
+        )
+
+    @property
+    def filename(self):
+        """Retorna el valor actual del atributo filename"""
+        return self._filename
+
+    def put_many(self, kind, payloads):
+        """Agrega tareas a la cola
+
+        Args:
+            kind (str): Tipo de tarea ("category" o "product")
+            payloads (list): Parámetros de cada tarea, serializables en JSON
+        """
+        self._connection.executemany(
+            "INSERT INTO tasks (kind, payload) VALUES (?, ?)",
+            [(kind, dumps(payload)) for payload in payloads],
+        )
+
+    def claim(self, kind, worker):
+        """Reclama la siguiente tarea pendiente o abandonada por otro proceso
+
+        Args:
+            kind (str): Tipo de tarea
+            worker (str): Nombre del proceso que reclama la tarea
+
+        Returns:
+            tuple: Id y parámetros de la tarea, o (None, None) si no quedan tareas
+        """
+        now = time()
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.fail_expired(kind, now)
+            row = self._connection.execute(
+                """SELECT id, payload FROM tasks WHERE kind = ? AND attempts < ?
+                AND (status = 'pending' OR (status = 'running' AND claimed_at < ?))
+                ORDER BY id LIMIT 1""",
+                (kind, self._max_attempts, now - self._timeout),
+            ).fetchone()
+            if row is not None:
+                self._connection.execute(
+                    """UPDATE tasks SET status = 'running', attempts = attempts + 1,
+                    worker = ?, claimed_at = ? WHERE id = ?""",
+                    (worker, now, row[0]),
+                )
+        finally:
+            self._connection.execute("COMMIT")
+        return (row[0], loads(row[1])) if row is not None else (None, None)
+
+    def fail_expired(self, kind, now=None):
+        """Marca como fallidas las tareas abandonadas que ya agotaron sus intentos, pues ningún proceso las volverá a reclamar
+
+        Args:
+            kind (str): Tipo de tarea
+            now (float, optional): Momento de la consulta. Defaults to None (momento actual).
+        """
+        self._connection.execute(
+            """UPDATE tasks SET status = 'failed' WHERE kind = ? AND status = 'running'
+            AND attempts >= ? AND claimed_at < ?""",
+            (kind, self._max_attempts, (time() if now is None else now) - self._timeout),
+        )
+
+    def complete(self, task_id, result):
+        """Marca una tarea como terminada
+
+        Args:
+            task_id (int): Id de la tarea
+            result (str): Resultado de la tarea (ruta de la salida parcial)
+        """
+        self._connection.execute(
+            "UPDATE tasks SET status = 'done', result = ? WHERE id = ?",
+            (result, task_id),
+        )
+
+    def fail(self, task_id):
+        """Devuelve una tarea fallida a la cola, o la marca como fallida si agotó sus intentos
+
+        Args:
+            task_id (int): Id de la tarea
+        """
+        self._connection.execute(
+            """UPDATE tasks SET status = CASE WHEN attempts < ? THEN 'pending'
+            ELSE 'failed' END WHERE id = ?""",
+            (self._max_attempts, task_id),
+        )
+
+    def counts(self, kind):
+        """Cuenta las tareas de un tipo por estado
+
+        Args:
+            kind (str): Tipo de tarea
+
+        Returns:
+            dict: Cantidad de tareas por estado
+        """
+        return dict(
+            self._connection.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE kind = ? GROUP BY status",
+                (kind,),
+            ).fetchall()
+        )
+
+    def results(self, kind):
+        """Retorna los resultados de las tareas terminadas en el orden en que fueron agregadas
+
+        Args:
+            kind (str): Tipo de tarea
+
+        Returns:
+            list: Lista de resultados
+        """
+        return [
+            result
+            for (result,) in self._connection.execute(
+                "SELECT result FROM tasks WHERE kind = ? AND status = 'done' ORDER BY id",
+                (kind,),
+            )
+        ]
+
+    def wait_done(self, kind, interval=QUEUE_POLL_INTERVAL):
+        """Espera a que todas las tareas de un tipo terminen o fallen
+
+        Args:
+            kind (str): Tipo de tarea
+            interval (float, optional): Tiempo en segundos entre cada consulta. Defaults to QUEUE_POLL_INTERVAL.
+
+        Returns:
+            dict: Cantidad de tareas por estado
+        """
+        while True:
+            # Si los procesos murieron en el último intento, nadie más reclamará sus tareas
+            self.fail_expired(kind)
+            counts = self.counts(kind)
+            if counts.get("pending", 0) + counts.get("running", 0) == 0:
+                return counts
+            sleep(interval)
+
+    def clear(self, kind):
+        """Elimina todas las tareas de un tipo
+
+        Args:
+            kind (str): Tipo de tarea
+        """
+        self._connection.execute("DELETE FROM tasks WHERE kind = ?", (kind,))
+
+    def close(self):
+        """Cierra la conexión a la cola"""
+        self._connection.close()
+
+
+class BoundedExecutor:
+    """Representa un pool de trabajadores con nombre cuya cola de envío está acotada: si el pool está lleno, submit espera a que termine una tarea (contrapresión) y lo registra en el log
+
+    Attributes:
+        name (str): Nombre del pool
+        max_workers (int): Cantidad de hilos o procesos del pool
+        queue_size (int): Cantidad de tareas que pueden esperar en cola además de las que se están ejecutando
+        processes (bool): Indica si el pool usa procesos en lugar de hilos
+        num_submitted (int): Cantidad de tareas enviadas al pool
+        num_saturated (int): Cantidad de veces que una tarea tuvo que esperar porque el pool estaba lleno
+        wait_time (float): Tiempo total en segundos que se esperó por un lugar en el pool
+    """
+
+    def __init__(self, name, max_workers, queue_size, processes=False):
+        """Genera todos los atributos para una instancia de la clase BoundedExecutor. El pool se inicia recién con la primera tarea
+
+        Args:
+            name (str): Nombre del pool
+            max_workers (int): Cantidad de hilos o procesos del pool
+            queue_size (int): Cantidad de tareas que pueden esperar en cola
+            processes (bool, optional): Usar procesos en lugar de hilos. Defaults to False.
+        """
+        self._name = name
+        self._max_workers = max(1, max_workers)
+        self._queue_size = max(0, queue_size)
+        self._processes = processes
+        self._executor = None
+        self._slots = BoundedSemaphore(self._max_workers + self._queue_size)
+        self._lock = Lock()
+        self._num_submitted = 0
+        self._num_saturated = 0
+        self._wait_time = 0.0
+        self._last_log = 0.0
+
+    @property
+    def name(self):
+        """Retorna el valor actual del atributo name"""
+        return self._name
+
+    @property
+    def max_workers(self):
+        """Retorna el valor actual del atributo max_workers"""
+        return self._max_workers
+
+    @property
+    def queue_size(self):
+        """Retorna el valor actual del atributo queue_size"""
+        return self._queue_size
+
+    @property
+    def processes(self):
+        """Retorna el valor actual del atributo processes"""
+        return self._processes
+
+    def get_executor(self):
+        """Retorna el pool de hilos o de procesos, iniciándolo si aún no ha sido iniciado
+
+        Returns:
+            concurrent.futures.Executor: Pool de trabajadores
+        """
+        with self._lock:
+            if self._executor is None:
+                if self._processes:
+                    # Los procesos se inician desde cero para no heredar hilos ni conexiones abiertas
+                    self._executor = ProcessPoolExecutor(
+                        self._max_workers, mp_context=get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        self._max_workers, thread_name_prefix=self._name
+                    )
+            return self._executor
+
+    def register_saturated(self):
+        """Cuenta una espera por el pool lleno y la registra en el log como máximo una vez por intervalo"""
+        now = monotonic()
+        with self._lock:
+            self._num_saturated += 1
+            if now - self._last_log >= EXECUTOR_LOG_INTERVAL:
+                self._last_log = now
+                LOGGER.warning(
+                    f"El pool {self._name} está saturado ({self._max_workers} trabajadores y {self._queue_size} tareas en cola), se espera a que termine una tarea"
+                )
+
+    def acquire(self):
+        """Reserva un lugar en el pool, esperando si está lleno"""
+        if self._slots.acquire(blocking=False):
+            return
+        start = monotonic()
+        self.register_saturated()
+        self._slots.acquire()
+        with self._lock:
+            self._wait_time += monotonic() - start
+
+    async def acquire_async(self):
+        """Versión asíncrona de acquire, espera sin bloquear el bucle de eventos"""
+        if self._slots.acquire(blocking=False):
+            return
+        start = monotonic()
+        self.register_saturated()
+        while not self._slots.acquire(blocking=False):
+            await sleep_async(EXECUTOR_POLL_INTERVAL)
+        with self._lock:
+            self._wait_time += monotonic() - start
+
+    def release(self, future=None):
+        """Libera el lugar reservado por una tarea terminada
+
+        Args:
+            future (concurrent.futures.Future, optional): Tarea terminada. Defaults to None.
+        """
+        self._slots.release()
+
+    def submit(self, fn, *args, **kwargs):
+        """Envía una tarea al pool, esperando si ya hay max_workers + queue_size tareas en curso o en cola
+
+        Args:
+            fn (function): Función a ejecutar
+
+        Returns:
+            concurrent.futures.Future: Resultado futuro de la tarea
+        """
+        self.acquire()
+        return self.start(fn, *args, **kwargs)
+
+    def start(self, fn, *args, **kwargs):
+        """Envía una tarea al pool con el lugar ya reservado, liberándolo cuando la tarea termine
+
+        Args:
+            fn (function): Función a ejecutar
+
+        Returns:
+            concurrent.futures.Future: Resultado futuro de la tarea
+        """
+        try:
+            future = self.get_executor().submit(fn, *args, **kwargs)
+        except BaseException:
+            self.release()
+            raise
+        with self._lock:
+            self._num_submitted += 1
+        future.add_done_callback(self.release)
+        return future
+
+    def map(self, fn, iterable):
+        """Aplica una función a cada elemento usando el pool, respetando el límite de la cola
+
+        Args:
+            fn (function): Función a ejecutar
+            iterable (iterable): Elementos a procesar
+
+        Returns:
+            generator: Resultados en el mismo orden que los elementos
+        """
+        futures = [self.submit(fn, item) for item in iterable]
+        return (future.result() for future in futures)
+
+    def call(self, fn, *args):
+        """Ejecuta una tarea de CPU: en un proceso del pool si usa procesos o directamente en el hilo actual si usa hilos, donde otro hilo no aportaría nada por el GIL
+
+        Args:
+            fn (function): Función a ejecutar, debe poder serializarse si el pool usa procesos
+
+        Returns:
+            Any: Resultado de la función
+        """
+        if self._processes:
+            return self.submit(fn, *args).result()
+        return fn(*args)
+
+    async def call_async(self, fn, *args):
+        """Versión asíncrona de call que espera el resultado del proceso sin bloquear el bucle de eventos
+
+        Args:
+            fn (function): Función a ejecutar, debe poder serializarse si el pool usa procesos
+
+        Returns:
+            Any: Resultado de la función
+        """
+        if self._processes:
+            await self.acquire_async()
+            return await wrap_future(self.start(fn, *args))
+        return fn(*args)
+
+    def stats(self):
+        """Retorna los contadores del pool
+
+        Returns:
+            dict: Contadores del pool
+        """
+        return {
+            "submitted": self._num_submitted,
+            "saturated": self._num_saturated,
+            "wait_time": round(self._wait_time, 2),
+        }
+
+    def shutdown(self, wait=True):
+        """Cierra el pool si fue iniciado, esperando a que terminen sus tareas
+
+        Args:
+            wait (bool, optional): Esperar a que terminen las tareas en curso. Defaults to True.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class ExecutionPolicy:
+    """Representa la política de ejecución del scraper: un pool acotado por tipo de trabajo (network para las peticiones HTTP, browser para los navegadores web y cpu para la decodificación de las respuestas)
+
+    Attributes:
+        pools (dict): Pools acotados por nombre
+    """
+
+    def __init__(self, pools):
+        """Genera todos los atributos para una instancia de la clase ExecutionPolicy
+
+        Args:
+            pools (dict): Configuración de cada pool por nombre, con las llaves max_workers, queue_size y processes
+        """
+        self._pools = {
+            name: BoundedExecutor(name, **config) for name, config in pools.items()
+        }
+
+    def __getitem__(self, name):
+        return self._pools[name]
+
+    def configure(self, name, max_workers=None, queue_size=None, processes=None):
+        """Reemplaza un pool por otro con nuevos tamaños, cerrando el anterior
+
+        Args:
+            name (str): Nombre del pool
+            max_workers (int, optional): Cantidad de hilos o procesos. Defaults to None (sin cambios).
+            queue_size (int, optional): Cantidad de tareas en cola. Defaults to None (sin cambios).
+            processes (bool, optional): Usar procesos en lugar de hilos. Defaults to None (sin cambios).
+        """
+        pool = self._pools[name]
+        pool.shutdown()
+        self._pools[name] = BoundedExecutor(
+            name,
+            pool.max_workers if max_workers is None else max_workers,
+            pool.queue_size if queue_size is None else queue_size,
+            pool.processes if processes is None else processes,
+        )
+
+    def log_stats(self):
+        """Registra en el log los contadores de los pools que fueron usados"""
+        for name, pool in self._pools.items():
+            stats = pool.stats()
+            if stats["submitted"] > 0:
                 LOGGER.info(
-                    "Actualizando el diccionario de datos con las nuevas incidencias encontradas"
+                    f"Pool {name}: {stats['submitted']} tareas, {stats['saturated']} veces saturado, {stats['wait_time']} segundos de espera"
+                )
+
+    def shutdown(self, wait=True):
+        """Cierra todos los pools
+
+        Args:
+            wait (bool, optional): Esperar a que terminen las tareas en curso. Defaults to True.
+        """
+        for pool in self._pools.values():
+            pool.shutdown(wait)
+
+
+EXECUTORS = ExecutionPolicy(
+    {
+        "network": {"max_workers": NETWORK_WORKERS, "queue_size": NETWORK_QUEUE_SIZE},
+        "browser": {"max_workers": BROWSER_WORKERS, "queue_size": BROWSER_QUEUE_SIZE},
+        "cpu": {
+            "max_workers": CPU_WORKERS,
+            "queue_size": CPU_QUEUE_SIZE,
+            "processes": CPU_PROCESSES,
+        },
+    }
+)
+
+
+class ScraperFalabellaCategory:
+    """Representa a un bot para hacer web scraping en saga falabella
+
+    Attributes:
+        metadata (Metadata): Objeto de la clase Metadata que maneja información generada durante la ejecución del scraper
+        df_category (pandas.core.frame.DataFrame): Objeto de la clase DataFrame que maneja información de las categorías principales extraídas por el scraper
+        tree (CategoryTree): Árbol de todas las categorías extraídas por el scraper, se guarda por bloques sin generar el DataFrame completo
+        df_diff (pandas.core.frame.DataFrame): Categorías agregadas, eliminadas o renombradas respecto a la ejecución anterior (solo en modo incremental)
+        dict_category (CategoryDictionary): Objeto de la clase CategoryDictionary que funciona como diccionario para mapear las categorías de saga falabella
+        driver (WebDriver): Objeto de la clase WebDriver que maneja un navegador para hacer web scraping, solo se inicializa cuando se necesita
+        browserless (bool): Indica si se intenta obtener las categorías principales sin usar el navegador web
+        lean (bool): Indica si el navegador web usa el perfil ligero
+        page_load_times (list): Tiempos de carga en segundos de los links recorridos con el navegador web
+        session (SessionApi): Objeto de la clase SessionApi que reutiliza las conexiones hechas a la api
+        scheduler (ApiScheduler): Objeto de la clase ApiScheduler que limita la tasa y la concurrencia de las peticiones a la api
+        cache (ResponseCache): Objeto de la clase ResponseCache que guarda en disco las respuestas de la api
+    """
+
+    def __init__(
+        self,
+        dict_filename,
+        cache_filename=API_CACHE_FILENAME,
+        offline=False,
+        browserless=False,
+        lean=False,
+        scheduler=None,
+    ):
+        """Genera todos los atributos para una instancia de la clase ScraperFalabellaCategory
+
+        Args:
+            dict_filename (str): Nombre del archivo que va a ser usado como diccionario de datos
+            cache_filename (str, optional): Nombre del archivo de la caché de respuestas de la api. Defaults to API_CACHE_FILENAME.
+            offline (bool, optional): Usar solo las respuestas guardadas en la caché sin realizar peticiones a la api. Defaults to False.
+            browserless (bool, optional): Obtener las categorías principales sin usar el navegador web, usándolo solo si falla. Defaults to False.
+            lean (bool, optional): Usar el perfil ligero del navegador web. Defaults to False.
+            scheduler (ApiScheduler, optional): Planificador de las peticiones a la api, si no se indica se usan los límites por defecto del motor. Defaults to None.
+        """
+        self._metadata = Metadata()
+        self._df_category = DataFrame()
+        self._tree = None
+        self._df_diff = None
+        self._dict_category = CategoryDictionary(dict_filename)
+        self._lean = lean
+        self._page_load_times = []
+        self._driver = None if browserless else WebDriver(lean=lean)
+        self._browserless = browserless
+        self._session = SessionApi()
+        self._scheduler = build_scheduler() if scheduler is None else scheduler
+        self._default_scheduler = scheduler is None
+        self._cache = ResponseCache(cache_filename, offline=offline)
+
+    @property
+    def metadata(self):
+        """Retorna el valor actual del atributo metadata"""
+        return self._metadata
+
+    @property
+    def tree(self):
+        """Retorna el valor actual del atributo tree"""
+        return self._tree
+
+    def start_driver(self):
+        """Inicializa el navegador web si aún no ha sido inicializado"""
+        if self._driver is None:
+            LOGGER.info("Inicializando navegador web")
+            self._driver = WebDriver(lean=self._lean)
+
+    def quit_driver(self):
+        """Cierra el navegador web si ha sido inicializado"""
+        if self._driver is not None:
+            LOGGER.info("Cerrando navegador web")
+            self._driver.quit()
+            self._driver = None
+
+    def close_popups(self):
+        """Cierra todas las ventanas emergentes que nos muestra la página principal de Saga Falabella"""
+        marks = [
+            (By.CLASS_NAME, "dy-lb-close"),
+            (By.ID, "testId-accept-cookies-btn"),
+            (By.CLASS_NAME, "airship-btn airship-btn-deny"),
+            (By.CLASS_NAME, "dy-lb-close"),
+        ]
+        for selector, xpath in marks:
+            try:
+                self._driver.get_element(
+                    EC.element_to_be_clickable((selector, xpath))
+                ).click()
+            except:
+                pass
+
+    def is_permanent_category(self, text):
+        """Comprueba si la categoría mostrada por el menú es creada solo por temporadas o es permanente
+
+        Args:
+            text (str): Nombre de la categoría
+
+        Returns:
+            bool: Booleano
+        """
+        return text.split("\n")[-1] not in ["NUEVO", "Emprendedores", "SALE"]
+
+    def is_url_category(self, url):
+        """Comprueba si el link no pertenece a una categoría de falabella
+
+        Args:
+            url (str): Enlace web
+
+        Returns:
+            bool: Booleano que indica si el link pertenece o no a una categoría de falabella
+        """
+        return url.find("category") != -1
+
+    def get_menu_links(self):
+        """Función que navega por el menú de Saga Falabella y extrae todos los links mostrados por dicha interfaz
+
+        Returns:
+            list: Lista de enlaces
+        """
+
+        menu_links = []
+        LOGGER.info("Accediendo al menú principal de saga falabella")
+        self._driver.get_element(
+            EC.element_to_be_clickable(
+                (By.CLASS_NAME, "MarketplaceHamburgerBtn-module_hamburgerBtn__61t-r")
+            )
+        ).click()
+
+        LOGGER.info(
+            "Registrando la lista de categorías que nos muestra el menú principal"
+        )
+        category_list = self._driver.get_element(
+            EC.visibility_of_all_elements_located(
+                (
+                    By.XPATH,
+                    "//div[@class='FirstLevelCategories-module_categories__x82VK']",
+                )
+            )
+        )
+
+        LOGGER.info("Filtrando categorías que son creadas temporalmente")
+        category_list = [
+            category
+            for category, text in zip(
+                category_list,
+                EXECUTORS["browser"].map(lambda x: x.text, category_list),
+            )
+            if self.is_permanent_category(text)
+        ]
+
+        LOGGER.info("Navegando por el menú principal")
+        for category in category_list:
+            try:
+                category.click()
+                subcategory_list = self._driver.get_element(
+                    EC.presence_of_all_elements_located(
+                        (
+                            By.XPATH,
+                            "//li[@class='SecondLevelCategories-module_thirdLevelCategory__2ZQFF']/a",
+                        )
+                    )
+                )
+                menu_links += list(
+                    EXECUTORS["browser"].map(
+                        lambda x: sub(r"\?.+", "", x.get_attribute("href")),
+                        subcategory_list,
+                    )
                 )
-                self._df_dict_category = concat(
-                    [self._df_dict_category, df_dict_info], axis=0, ignore_index=True
+
+            except TimeoutException:
+                LOGGER.error(
+                    "Tiempo agotado para recuperar las subcategorías mostradas por el menú principal de saga falabella",
                 )
+
+        LOGGER.info("Filtrando links duplicados")
+        menu_links = list(set(menu_links))
+
+        LOGGER.info("Filtrando los links que no pertenecen a una categoría")
+        menu_links = [link for link in menu_links if self.is_url_category(link)]
+        LOGGER.info(f"Se han extraído satisfactoriamente {len(menu_links)} links")
+        return menu_links
+
+    def get_category_info(self, subcategory_links):
+        """Retorna un conjunto de datos que contiene toda la información de las categorías principales de saga falabella
+
+        Args:
+            subcategory_links (list): Lista de links correspondientes a las subcategorías encontradas en el menú de Saga Falabella
+
+        Returns:
+            pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+        """
+        # Diccionario de datos que almacena la información de las categorías de saga falabella
+        category_info_link = {}
+        # Diccionario de datos que almacena las categorías de los links recorridos
+        category_dict_info = {
+            "Link_subcat": [],
+            "Name": [],
+            "Link_cat": [],
+        }
+
+        LOGGER.info(
+            "Recopilando los links de las categorías principales a partir de los links presentados por el menú de Saga Falabella",
+        )
+        # Comprobando si el diccionario de links recorridos ha sido definido
+        if self._dict_category.loaded:
             LOGGER.info(
-                f"Cantidad de incidencias a ser guardadas: {df_dict_info_length}"
+                "Usando el diccionario de datos para encontrar las categorías principales",
             )
-            self._df_dict_category.sort_values(DATA_DICT_HEADERS[0], inplace=True)
-            self._df_dict_category.to_csv(
-                self._df_dict_category_filename,
-                header=False,
-                index=False,
-                encoding="utf-8-sig",
+            with self._metadata.stage("dictionary") as stage:
+                results, temp_subcat_links = self._dict_category.lookup(
+                    subcategory_links
+                )
+                stage.add("hits", len(subcategory_links) - len(temp_subcat_links))
+                stage.add("misses", len(temp_subcat_links))
+            # Guardando la información de la primera coincidencia de cada link
+            category_info_link.update(results)
+
+            LOGGER.info(
+                f"El diccionario de datos ha mapeado {len(subcategory_links) - len(temp_subcat_links)} links de las subcategorías"
+            )
+            subcategory_links = temp_subcat_links
+            del temp_subcat_links
+
+        LOGGER.info(f"Hay {len(subcategory_links)} links que faltan recorrer")
+        if self._browserless and len(subcategory_links) > 0:
+            LOGGER.info("Recorriendo los links faltantes sin usar el navegador web")
+            with self._metadata.stage("http_traversal") as stage:
+                results = list(
+                    EXECUTORS["network"].map(
+                        self.get_root_category_http, subcategory_links
+                    )
+                )
+                stage.add("links", len(subcategory_links))
+            new_incidences = [
+                (link, *result)
+                for link, result in zip(subcategory_links, results)
+                if result is not None
+            ]
+            subcategory_links = [
+                link for link, result in zip(subcategory_links, results) if result is None
+            ]
+            LOGGER.info(
+                f"Se han recorrido {len(new_incidences)} links sin usar el navegador web, {len(subcategory_links)} links se van a recorrer con el navegador web"
+            )
+        else:
+            new_incidences = []
+
+        if len(subcategory_links) > 0:
+            with self._metadata.stage("selenium_traversal") as stage:
+                new_incidences += self.traverse_links(subcategory_links)
+                stage.add("links", len(subcategory_links))
+
+        for link, name_cat, url_cat in new_incidences:
+            # Guardando las nuevas incidencias al diccionario de categorías
+            category_dict_info["Link_subcat"].append(link)
+            category_dict_info["Name"].append(name_cat)
+            category_dict_info["Link_cat"].append(url_cat)
+            category_info_link[name_cat] = url_cat
+            LOGGER.info(f"Categoría Obtenida: {name_cat}")
+
+        LOGGER.info("Comprobado si existen nuevas incidencias")
+        df_dict_info = DataFrame(category_dict_info)
+        df_dict_info_length = df_dict_info.shape[0]
+        if df_dict_info_length == 0:
+            LOGGER.info(
+                "No se va a guardar el diccionario de links recorridos. Razón: No han aparecido nuevas incidencias",
+            )
+        else:
+            LOGGER.info(
+                f"Agregando las nuevas incidencias encontradas al diccionario de datos. Cantidad de incidencias a ser guardadas: {df_dict_info_length}"
+            )
+            self._dict_category.append(df_dict_info)
+            LOGGER.info(
+                f"Diccionarios de datos guardado satisfactoriamente con el nombre {self._dict_category.filename} en la ruta {ROOT_PATH}",
+            )
+
+        LOGGER.info("Filtrando categoría Especiales")
+        category_info_link = {
+            key: category_info_link[key]
+            for key in category_info_link
+            if key != "Especiales"
+        }
+        LOGGER.info("Categorías principales recuperadas satisfactoriamente\n")
+        return DataFrame(
+            {
+                "Id_0": [
+                    extract_text(r"/.*/(.*)/", x) for x in category_info_link.values()
+                ],
+                "Name_0": category_info_link.keys(),
+                "Category_path_0": ["" for _ in range(len(category_info_link))],
+            }
+        )
+
+    def traverse_links(self, subcategory_links):
+        """Recorre con el navegador web los links de las subcategorías hasta llegar a su categoría principal
+
+        Args:
+            subcategory_links (list): Lista de links de las subcategorías
+
+        Returns:
+            list: Lista de tuplas (link de la subcategoría, nombre y link de la categoría principal)
+        """
+        pool_size = min(EXECUTORS["browser"].max_workers, len(subcategory_links))
+        if pool_size > 1:
+            new_incidences = self.traverse_links_pool(subcategory_links, pool_size)
+        else:
+            new_incidences = []
+            self.start_driver()
+            self.close_modal(self._driver, subcategory_links[0])
+            # Recorriendo los links faltantes
+            for link in subcategory_links:
+                result = self.get_root_category_selenium(self._driver, link)
+                if result is not None:
+                    new_incidences.append((link, *result))
+
+        if len(self._page_load_times) > 0:
+            LOGGER.info(
+                f"Tiempo de carga promedio por link (perfil {'ligero' if self._lean else 'completo'}): {sum(self._page_load_times) / len(self._page_load_times):.2f} segundos"
+            )
+        return new_incidences
+
+    def traverse_links_pool(self, subcategory_links, pool_size):
+        """Recorre los links de las subcategorías repartiéndolos mediante una cola entre varios navegadores web sin interfaz gráfica
+
+        Args:
+            subcategory_links (list): Lista de links de las subcategorías
+            pool_size (int): Cantidad de navegadores web
+
+        Returns:
+            list: Lista de tuplas (link de la subcategoría, nombre y link de la categoría principal)
+        """
+        LOGGER.info(f"Recorriendo los links faltantes con {pool_size} navegadores web")
+        links_queue = Queue()
+        for link in subcategory_links:
+            links_queue.put(link)
+
+        # El binario del driver se busca una sola vez para todos los navegadores
+        driver_path = get_driver_path()
+        new_incidences = []
+        futures = [
+            EXECUTORS["browser"].submit(
+                self.traverse_links_worker, links_queue, driver_path
             )
+            for _ in range(pool_size)
+        ]
+        # Uniendo los resultados de cada navegador en el hilo principal
+        for future in futures:
+            new_incidences += future.result()
+        return new_incidences
+
+    def traverse_links_worker(self, links_queue, driver_path):
+        """Recorre los links de la cola con un navegador web propio, reiniciándolo cada BROWSER_RECYCLE_PAGES páginas para limitar su consumo de memoria
+
+        Args:
+            links_queue (queue.Queue): Cola de links de las subcategorías
+            driver_path (str): Ruta del binario de ChromeDriver
+
+        Returns:
+            list: Lista de tuplas (link de la subcategoría, nombre y link de la categoría principal)
+        """
+        new_incidences = []
+        driver = None
+        num_pages = 0
+        try:
+            while True:
+                try:
+                    link = links_queue.get_nowait()
+                except Empty:
+                    break
+
+                if driver is None or num_pages >= BROWSER_RECYCLE_PAGES:
+                    if driver is not None:
+                        quit_quietly(driver)
+                    driver = WebDriver(
+                        headless=True, driver_path=driver_path, lean=self._lean
+                    )
+                    self.close_modal(driver, link)
+                    num_pages = 0
+
+                try:
+                    result = self.get_root_category_selenium(driver, link)
+                except TimeoutException:
+                    LOGGER.error(f"Tiempo agotado para recorrer el link {link}")
+                    result = None
+                except WebDriverException as error:
+                    # Un elemento obsoleto o una pestaña caída no deben detener el resto de la cola,
+                    # se descarta el link y se reinicia el navegador web por si quedó inutilizable
+                    LOGGER.error(
+                        f"Error del navegador web al recorrer el link {link}: {error.msg}"
+                    )
+                    result = None
+                    num_pages = BROWSER_RECYCLE_PAGES
+                    continue
+                num_pages += 1
+                if result is not None:
+                    new_incidences.append((link, *result))
+        finally:
+            if driver is not None:
+                quit_quietly(driver)
+        return new_incidences
+
+    def close_modal(self, driver, link):
+        """Cierra la ventana emergente que muestra la primera página de categoría visitada
+
+        Args:
+            driver (WebDriver): Navegador web
+            link (str): Link de una subcategoría
+        """
+        try:
+            driver.get(link)
+            driver.get_element(
+                EC.element_to_be_clickable((By.ID, "testId-modal-close"))
+            ).click()
+        except:
+            pass
+
+    def get_root_category_selenium(self, driver, link):
+        """Navega desde una subcategoría hasta su categoría principal usando el breadcrumb de la página
+
+        Args:
+            driver (WebDriver): Navegador web
+            link (str): Link de la subcategoría
+
+        Returns:
+            tuple or None: Nombre y link de la categoría principal o None si el link redirige a otra página
+        """
+        start = time()
+        driver.get(link)
+        page_load_time = time() - start
+        self._page_load_times.append(page_load_time)
+        LOGGER.info(f"Tiempo de carga del link {link}: {page_load_time:.2f} segundos")
+        # Comprobando que el link no te rediriga a otra página
+        current_link = driver.execute_script("return document.URL")
+        if not self.is_url_category(current_link):
             LOGGER.info(
-                f"Diccionarios de datos guardado satisfactoriamente con el nombre {self._df_dict_category_filename} en la ruta {ROOT_PATH}",
+                f"No se va a extraer categorías del link {link}, pues te redirige a otro link: {current_link}",
             )
+            return None
 
-        LOGGER.info("Filtrando categoría Especiales")
-        category_info_link = {
-            key: category_info_link[key]
-            for key in category_info_link
-            if key != "Especiales"
+        # Navegar hasta la categoría padre de la subcategoría
+        is_not_root_path = True
+        while is_not_root_path:
+            try:
+                driver.get_element(
+                    EC.presence_of_element_located(
+                        (By.XPATH, "//a[@class='jsx-2883309125 l1category']")
+                    )
+                ).click()
+
+            except ElementNotInteractableException:
+                LOGGER.info("Se ha conseguido llegar hasta la categoría principal")
+                is_not_root_path = False
+
+        url_cat = driver.execute_script("return document.URL")
+        name_cat = driver.get_element(
+            EC.presence_of_element_located(
+                (By.XPATH, "//h1[@class='jsx-2883309125 l2category']")
+            ),
+        ).text
+        return name_cat, url_cat
+
+    def get_menu_links_http(self):
+        """Extrae los links de las categorías a partir del JSON __NEXT_DATA__ de la página principal sin usar el navegador web
+
+        Returns:
+            list: Lista de enlaces, vacía si no se pudo obtener la información
+        """
+        LOGGER.info("Extrayendo los links de las categorías sin usar el navegador web")
+        try:
+            data = extract_next_data(self._session.get(URL_FALABELLA).text)
+        except (RequestException, JSONDecodeError) as error:
+            LOGGER.warning(f"No se pudo leer la página principal: {error}")
+            return []
+        if data is None:
+            LOGGER.warning("La página principal no contiene el JSON __NEXT_DATA__")
+            return []
+
+        menu_links = {
+            sub(r"\?.+", "", urljoin(URL_FALABELLA, value))
+            for value in iter_json_strings(data)
+            if self.is_url_category(value)
         }
-        LOGGER.info("Categorías principales recuperadas satisfactoriamente\n")
-        return DataFrame(
-            {
-                "Id_0": [
-                    extract_text(r"/.*/(.*)/", x) for x in category_info_link.values()
-                ],
-                "Name_0": category_info_link.keys(),
-                "Category_path_0": ["" for _ in range(len(category_info_link))],
-            }
-        )
+        LOGGER.info(f"Se han extraído satisfactoriamente {len(menu_links)} links")
+        return list(menu_links)
+
+    def get_root_category_http(self, link):
+        """Obtiene la categoría principal de una subcategoría sin usar el navegador web, usando el breadcrumb del JSON __NEXT_DATA__ o en su defecto los links l1category de la página
 
-    def send_request_api(self, id_cat, name_subcat, path_subcat):
+        Args:
+            link (str): Link de la subcategoría
+
+        Returns:
+            tuple or None: Nombre y link de la categoría principal o None si no se pudo obtener
+        """
+        url = link
+        try:
+            for _ in range(MAX_CATEGORY_DEPTH):
+                response = self._session.get(url)
+                url = sub(r"\?.+", "", str(response.url))
+                # Comprobando que el link no te rediriga a otra página
+                if not self.is_url_category(url):
+                    return None
+
+                html = response.text
+                root = extract_breadcrumb_root(extract_next_data(html))
+                if root is not None:
+                    name_cat, url_cat = root
+                    return name_cat, sub(r"\?.+", "", urljoin(url, url_cat))
+
+                # Navegar hasta la categoría padre de la subcategoría
+                tag = extract_text(r"(<a[^>]*\bl1category\b[^>]*>)", html)
+                parent = extract_text(r'href="([^"]+)"', tag) if tag else None
+                if parent:
+                    parent = sub(r"\?.+", "", urljoin(url, unescape(parent)))
+                if parent and parent != url and self.is_url_category(parent):
+                    url = parent
+                    continue
+
+                # Se ha conseguido llegar hasta la categoría principal
+                name_cat = extract_text(
+                    r"(?s)<h1[^>]*\bl2category\b[^>]*>(.*?)</h1>", html
+                )
+                if name_cat is None:
+                    return None
+                return unescape(sub(r"<[^>]+>", "", name_cat)).strip(), url
+        except (RequestException, JSONDecodeError):
+            pass
+        return None
+
+    def send_request_api(self, id_cat, name_subcat, path_subcat, depth=1):
         """Realiza una petición a la api usando el id, nombre y path de una categoría de Saga Falabella y retorna el id, nombre y path de todas sus subcategorías
 
         Args:
             id_cat (str): Id de la categoría a extraer su información
             name_subcat (str): Nombre de la categoría a extraer su información
             path_subcat (str): Path de la categoría a extraer su información
+            depth (int, optional): Nivel de profundidad de las subcategorías, usado para las métricas. Defaults to 1.
 
         Returns:
-            list: Lista de subcategorías
+            list or None: Lista de subcategorías o None si no se pudo obtener la respuesta de la api
         """
-        subcategory_info = []
-        try:
+        stage = self._metadata.stage("api_level_" + str(depth))
+        key = self._cache.make_key(id_cat, name_subcat, path_subcat)
+        body, headers = self._cache.lookup(key)
+        if body is None and self._cache.offline:
+            return None
+        if body is None:
             # Realizando la petición a la api usando algunos parámetros necesarios
-            response = get(
-                API_URL.format(
-                    path_subcat,
-                    id_cat,
-                    quote_plus(name_subcat),
-                ),
-                headers=API_HEADERS,
-            )
-            filters_value = response.json()["data"]["facets"][:4]
-            # Recorriendo los 4 primeros filtros que posee la categoría
-            for filter_value in filters_value[::-1]:
-                # Comprobando si uno de los filtros contiene subcategorías
-                if filter_value["name"] == "Categoría":
-                    data_values = filter_value["values"]
-                    # Guardando la información de una subcategoría
-                    subcategory_info += [
-                        [
-                            id_cat,
-                            item["id"],
-                            item["title"],
-                            item["url"].replace("+", "%20"),
-                        ]
-                        for item in data_values
-                    ]
-                    break
-        except (KeyError, IndexError, JSONDecodeError):
-            pass
-        return subcategory_info
+            body = self.request_api(
+                build_api_url(id_cat, name_subcat, path_subcat), key, headers, stage
+            )
+            if body is None:
+                stage.add("errors")
+                self.register_lost_branch(id_cat, name_subcat)
+                return None
+        else:
+            stage.add("cache_hits")
+        return EXECUTORS["cpu"].call(parse_subcategories, body, id_cat)
 
-    def get_subcategory_info(self, column_values, whole_id):
-        """Retorna un conjunto de datos que contiene toda la información de las subcategorías de saga falabella
+    def request_api(self, url, key, headers, stage=None):
+        """Realiza una petición a la api respetando el límite de peticiones del planificador y reintentando con espera exponencial si falla
 
         Args:
-            column_values (list): Lista de valores a ser usados para la extracción de subcategorías
-            whole_id (list): Lista de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            url (str): Enlace de la api
+            key (str): Llave de la caché
+            headers (dict): Cabeceras para revalidar la respuesta guardada en la caché
+            stage (StageMetrics, optional): Métricas de la etapa donde se registran las peticiones. Defaults to None.
+
         Returns:
-            pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+            bytes or None: Cuerpo de la respuesta o None si se agotaron los reintentos
+        """
+        stage = stage or self._metadata.stage("api")
+        retry_after = None
+        for attempt in range(self._scheduler.retries + 1):
+            if attempt > 0:
+                stage.add("retries")
+                sleep(self._scheduler.backoff(attempt - 1, retry_after))
+            self._scheduler.acquire()
+            start = time()
+            status_code = None
+            try:
+                response = self._session.get(url, headers=headers, timeout=API_TIMEOUT)
+                status_code = response.status_code
+                retry_after = response.headers.get("Retry-After")
+            except (RequestException, HttpxError) as error:
+                LOGGER.warning(f"Falló la petición a la api: {error}")
+            finally:
+                latency = time() - start
+                self._scheduler.release(status_code, latency)
+                stage.record_request(
+                    latency, len(response.content) if status_code is not None else 0
+                )
+
+            if status_code == 304:
+                stage.add("cache_revalidated")
+            if status_code == 304 or (
+                status_code == 200 and is_json_body(response.content)
+            ):
+                return self._cache.store(
+                    key, status_code, response.headers, response.content
+                )
+            if not self._scheduler.is_retryable(status_code):
+                break
+        return None
+
+    async def send_request_api_async(
+        self, client, semaphore, id_cat, name_subcat, path_subcat, depth=1
+    ):
+        """Versión asíncrona de send_request_api que limita las peticiones simultáneas mediante un semáforo
+
+        Args:
+            client (aiohttp.ClientSession): Sesión asíncrona usada para realizar la petición
+            semaphore (asyncio.Semaphore): Semáforo que limita la cantidad de peticiones en vuelo
+            id_cat (str): Id de la categoría a extraer su información
+            name_subcat (str): Nombre de la categoría a extraer su información
+            path_subcat (str): Path de la categoría a extraer su información
+            depth (int, optional): Nivel de profundidad de las subcategorías, usado para las métricas. Defaults to 1.
+
+        Returns:
+            list or None: Lista de subcategorías o None si no se pudo obtener la respuesta de la api
+        """
+        stage = self._metadata.stage("api_level_" + str(depth))
+        key = self._cache.make_key(id_cat, name_subcat, path_subcat)
+        # La caché es SQLite en disco, se consulta fuera del bucle de eventos
+        body, headers = await get_running_loop().run_in_executor(
+            None, self._cache.lookup, key
+        )
+        if body is None and self._cache.offline:
+            return None
+        if body is None:
+            async with semaphore:
+                body = await self.request_api_async(
+                    client,
+                    build_api_url(id_cat, name_subcat, path_subcat),
+                    key,
+                    headers,
+                    stage,
+                )
+            if body is None:
+                stage.add("errors")
+                self.register_lost_branch(id_cat, name_subcat)
+                return None
+        else:
+            stage.add("cache_hits")
+        return await EXECUTORS["cpu"].call_async(parse_subcategories, body, id_cat)
+
+    async def request_api_async(self, client, url, key, headers, stage=None):
+        """Versión asíncrona de request_api
+
+        Args:
+            client (aiohttp.ClientSession): Sesión asíncrona usada para realizar la petición
+            url (str): Enlace de la api
+            key (str): Llave de la caché
+            headers (dict): Cabeceras para revalidar la respuesta guardada en la caché
+            stage (StageMetrics, optional): Métricas de la etapa donde se registran las peticiones. Defaults to None.
+
+        Returns:
+            bytes or None: Cuerpo de la respuesta o None si se agotaron los reintentos
+        """
+        stage = stage or self._metadata.stage("api")
+        retry_after = None
+        for attempt in range(self._scheduler.retries + 1):
+            if attempt > 0:
+                stage.add("retries")
+                await sleep_async(self._scheduler.backoff(attempt - 1, retry_after))
+            await self._scheduler.acquire_async()
+            start = time()
+            status_code = None
+            content = b""
+            try:
+                async with client.get(
+                    URL(url, encoded=True),
+                    headers=headers,
+                    timeout=ClientTimeout(total=API_TIMEOUT),
+                ) as response:
+                    status_code = response.status
+                    retry_after = response.headers.get("Retry-After")
+                    response_headers = response.headers
+                    content = await response.read()
+            except (ClientError, AsyncTimeoutError) as error:
+                status_code = None
+                LOGGER.warning(f"Falló la petición a la api: {error!r}")
+            finally:
+                latency = time() - start
+                self._scheduler.release(status_code, latency)
+                stage.record_request(
+                    latency, len(content) if status_code is not None else 0
+                )
+
+            if status_code == 304:
+                stage.add("cache_revalidated")
+            if status_code == 304 or (status_code == 200 and is_json_body(content)):
+                return await get_running_loop().run_in_executor(
+                    None,
+                    self._cache.store,
+                    key,
+                    status_code,
+                    response_headers,
+                    content,
+                )
+            if not self._scheduler.is_retryable(status_code):
+                break
+        return None
+
+    def register_lost_branch(self, id_cat, name_subcat):
+        """Registra como error una categoría cuyas subcategorías no se pudieron obtener de la api
+
+        Args:
+            id_cat (str): Id de la categoría
+            name_subcat (str): Nombre de la categoría
+        """
+        LOGGER.error(
+            f"No se pudo obtener las subcategorías de {name_subcat} ({id_cat}) después de {self._scheduler.retries} reintentos"
+        )
+        self._metadata.add_error()
+
+    def register_subcategories(self, subcategory_info, depth, level, whole_id, tree):
+        """Registra las subcategorías obtenidas de una petición y retorna las que aún deben ser expandidas
+
+        Args:
+            subcategory_info (list or None): Lista de subcategorías devuelta por la api o None si la petición falló
+            depth (int): Nivel de profundidad de las subcategorías
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            tree (CategoryTree): Árbol de categorías registradas
+
+        Returns:
+            list: Lista de subcategorías a expandir en el siguiente nivel
+        """
+        frontier = []
+        # La rama perdida ya fue registrada por send_request_api
+        for id_cat, id_subcat, name_subcat, path_subcat in subcategory_info or []:
+            # Comprobando que no existan duplicados
+            if not whole_id.add(id_subcat):
+                continue
+            tree.add(id_cat, id_subcat, name_subcat, path_subcat, depth)
+            if depth + 1 < level:
+                frontier.append((id_subcat, name_subcat, path_subcat))
+        return frontier
+
+    def register_in_order(self, order, responses, level, whole_id, tree):
+        """Registra las respuestas que ya llegaron respetando el orden de un recorrido por niveles, para que una categoría
+        con varios padres quede siempre bajo el mismo padre y nivel sin importar el orden en que lleguen las respuestas
+
+        Args:
+            order (deque): Tuplas (id, nombre y path de la categoría, nivel de profundidad de sus subcategorías) pendientes de registrar, en orden de recorrido por niveles
+            responses (dict): Subcategorías devueltas por la api indexadas por el id de la categoría consultada
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            tree (CategoryTree): Árbol de categorías registradas
+
+        Returns:
+            list: Lista de tuplas (id, nombre y path de la categoría a expandir, nivel de profundidad de sus subcategorías) agregadas al orden
+        """
+        queued = []
+        while order and order[0][0][0] in responses:
+            category_level, depth = order.popleft()
+            for child_level in self.register_subcategories(
+                responses.pop(category_level[0]), depth, level, whole_id, tree
+            ):
+                order.append((child_level, depth + 1))
+                queued.append((child_level, depth + 1))
+        return queued
+
+    def prefetch_subcategories(self, subcategory_info, depth, level, whole_id, requested):
+        """Retorna las subcategorías de una respuesta cuya petición puede adelantarse antes de registrarlas
+
+        Args:
+            subcategory_info (list or None): Lista de subcategorías devuelta por la api o None si la petición falló
+            depth (int): Nivel de profundidad de las subcategorías
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            requested (set): Ids de las categorías cuya petición ya fue enviada
+
+        Returns:
+            list: Lista de tuplas (id, nombre y path de la categoría a expandir, nivel de profundidad de sus subcategorías)
+        """
+        if depth + 1 >= level or subcategory_info is None:
+            return []
+        return [
+            ((id_subcat, name_subcat, path_subcat), depth + 1)
+            for _, id_subcat, name_subcat, path_subcat in subcategory_info
+            if id_subcat not in whole_id and id_subcat not in requested
+        ]
+
+    def crawl_subcategories(self, frontier, level, whole_id, tree, checkpoint=None):
+        """Recorre el árbol de subcategorías enviando cada subcategoría a expandir apenas llega la respuesta de su categoría padre.
+        Las respuestas se registran en el orden de un recorrido por niveles, así los duplicados se resuelven igual en cada ejecución
+
+        Args:
+            frontier (list): Lista de tuplas (id, nombre y path de la categoría a expandir, nivel de profundidad de sus subcategorías)
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            tree (CategoryTree): Árbol de categorías registradas
+            checkpoint (CrawlCheckpoint, optional): Punto de control donde se guarda periódicamente el estado del recorrido. Defaults to None.
+
+        Returns:
+            CategoryTree: Árbol de categorías registradas
+        """
+        order = deque(frontier)
+        responses = {}
+        requested = set()
+        pending = {}
+
+        def submit(category_level, depth):
+            if category_level[0] in requested:
+                return
+            requested.add(category_level[0])
+            future = EXECUTORS["network"].submit(
+                self.send_request_api, *category_level, depth
+            )
+            pending[future] = (category_level, depth)
+
+        for category_level, depth in frontier:
+            submit(category_level, depth)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                category_level, depth = pending.pop(future)
+                responses[category_level[0]] = future.result()
+                # Adelantando las peticiones de las subcategorías que aún no tienen dueño
+                for child_level, child_depth in self.prefetch_subcategories(
+                    responses[category_level[0]], depth, level, whole_id, requested
+                ):
+                    submit(child_level, child_depth)
+            for child_level, child_depth in self.register_in_order(
+                order, responses, level, whole_id, tree
+            ):
+                submit(child_level, child_depth)
+            if checkpoint is not None:
+                checkpoint.maybe_save(tree, order)
+        return tree
+
+    async def crawl_subcategories_async(
+        self, frontier, level, whole_id, tree, checkpoint=None
+    ):
+        """Versión asíncrona de crawl_subcategories que realiza todas las peticiones a la api en un solo hilo
+
+        Args:
+            frontier (list): Lista de tuplas (id, nombre y path de la categoría a expandir, nivel de profundidad de sus subcategorías)
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            tree (CategoryTree): Árbol de categorías registradas
+            checkpoint (CrawlCheckpoint, optional): Punto de control donde se guarda periódicamente el estado del recorrido. Defaults to None.
+
+        Returns:
+            CategoryTree: Árbol de categorías registradas
+        """
+        order = deque(frontier)
+        responses = {}
+        requested = set()
+        pending = {}
+        semaphore = Semaphore(API_ASYNC_LIMIT)
+        connector = TCPConnector(limit=API_ASYNC_LIMIT, limit_per_host=API_ASYNC_LIMIT)
+        async with ClientSession(headers=API_HEADERS, connector=connector) as client:
+
+            def submit(category_level, depth):
+                if category_level[0] in requested:
+                    return
+                requested.add(category_level[0])
+                task = create_task(
+                    self.send_request_api_async(
+                        client, semaphore, *category_level, depth
+                    )
+                )
+                pending[task] = (category_level, depth)
+
+            for category_level, depth in frontier:
+                submit(category_level, depth)
+            while pending:
+                done, _ = await wait_async(pending, return_when=FIRST_COMPLETED)
+                for task in done:
+                    category_level, depth = pending.pop(task)
+                    responses[category_level[0]] = task.result()
+                    # Adelantando las peticiones de las subcategorías que aún no tienen dueño
+                    for child_level, child_depth in self.prefetch_subcategories(
+                        responses[category_level[0]], depth, level, whole_id, requested
+                    ):
+                        submit(child_level, child_depth)
+                for child_level, child_depth in self.register_in_order(
+                    order, responses, level, whole_id, tree
+                ):
+                    submit(child_level, child_depth)
+                if checkpoint is not None:
+                    checkpoint.maybe_save(tree, order)
+        return tree
+
+    def crawl(
+        self,
+        engine,
+        column_values,
+        level,
+        whole_id,
+        tree,
+        depth=1,
+        checkpoint=None,
+    ):
+        """Recorre el árbol de subcategorías usando el motor indicado
+
+        Args:
+            engine (str): Motor usado para realizar las peticiones a la api ("thread" o "async")
+            column_values (list): Lista de id, nombre y path de las categorías a expandir
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            tree (CategoryTree): Árbol de categorías registradas
+            depth (int, optional): Nivel de profundidad de las subcategorías de column_values. Defaults to 1.
+            checkpoint (CrawlCheckpoint, optional): Punto de control donde se guarda periódicamente el estado del recorrido. Defaults to None.
+
+        Returns:
+            CategoryTree: Árbol de categorías registradas
+        """
+        frontier = [(tuple(category_level), depth) for category_level in column_values]
+        return self.crawl_frontier(engine, frontier, level, whole_id, tree, checkpoint)
+
+    def crawl_frontier(self, engine, frontier, level, whole_id, tree, checkpoint=None):
+        """Recorre el árbol de subcategorías a partir de una frontera de categorías con distintos niveles de profundidad
+
+        Args:
+            engine (str): Motor usado para realizar las peticiones a la api ("thread" o "async")
+            frontier (list): Lista de tuplas (id, nombre y path de la categoría a expandir, nivel de profundidad de sus subcategorías)
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            tree (CategoryTree): Árbol de categorías registradas
+            checkpoint (CrawlCheckpoint, optional): Punto de control donde se guarda periódicamente el estado del recorrido. Defaults to None.
+
+        Returns:
+            CategoryTree: Árbol de categorías registradas
+        """
+        if engine == "async":
+            return run(
+                self.crawl_subcategories_async(
+                    frontier, level, whole_id, tree, checkpoint
+                )
+            )
+        return self.crawl_subcategories(frontier, level, whole_id, tree, checkpoint)
+
+    def reuse_branch(self, stack, level, whole_id, tree, previous_tree):
+        """Copia al árbol actual las subcategorías de la ejecución anterior que cuelgan de las categorías indicadas
+
+        Args:
+            stack (list): Ids de las categorías ya registradas cuyas subcategorías se copian
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            tree (CategoryTree): Árbol de categorías registradas
+            previous_tree (CategoryTree): Árbol de categorías de la ejecución anterior
+        """
+        while stack:
+            for depth, id_parent, id_subcat, name_subcat, path_subcat in (
+                previous_tree.children(stack.pop())
+            ):
+                if depth < level and whole_id.add(id_subcat):
+                    tree.add(id_parent, id_subcat, name_subcat, path_subcat, depth)
+                    stack.append(id_subcat)
+
+    def refresh_subcategories(
+        self, engine, column_values, level, whole_id, tree, previous_tree, checkpoint=None
+    ):
+        """Actualiza el árbol de subcategorías de la ejecución anterior consultando solo las categorías principales y recorriendo únicamente las ramas cuyas subcategorías cambiaron
+
+        Args:
+            engine (str): Motor usado para realizar las peticiones a la api ("thread" o "async")
+            column_values (list): Lista de id, nombre y path de las categorías principales
+            level (int): Profundidad máxima del árbol de categorías
+            whole_id (IdRegistry): Registro de ids de todas las categorías que ha obtenido el scraper hasta el momento
+            tree (CategoryTree): Árbol de categorías registradas
+            previous_tree (CategoryTree): Árbol de categorías de la ejecución anterior
+            checkpoint (CrawlCheckpoint, optional): Punto de control donde se guarda periódicamente el estado del recorrido. Defaults to None.
+
+        Returns:
+            CategoryTree: Árbol de categorías registradas
         """
+        LOGGER.info("Consultando las subcategorías de las categorías principales")
+        frontier = []
+        num_changed = 0
+        num_failed = 0
+        responses = EXECUTORS["network"].map(
+            lambda category_level: self.send_request_api(*category_level),
+            column_values,
+        )
+        previous_whole_id = set(previous_tree.ids())
+        for (id_cat, name_cat, _), subcategory_info in zip(column_values, responses):
+            if subcategory_info is None:
+                # Una petición fallida no indica que la rama cambió, se conserva la de la ejecución anterior
+                LOGGER.warning(
+                    f"No se pudo consultar la categoría {name_cat} ({id_cat}), se reutiliza su rama de la ejecución anterior"
+                )
+                num_failed += 1
+                self.reuse_branch([id_cat], level, whole_id, tree, previous_tree)
+                continue
+
+            previous_ids = {node[2] for node in previous_tree.children(id_cat)}
+            branch = self.register_subcategories(
+                subcategory_info, 1, level, whole_id, tree
+            )
+            # Comprobando si las subcategorías de la rama cambiaron, ignorando las que
+            # en la ejecución anterior quedaron registradas en otra rama por ser duplicadas
+            current_ids = {
+                row[1]
+                for row in subcategory_info
+                if row[1] in previous_ids or row[1] not in previous_whole_id
+            }
+            if current_ids != previous_ids:
+                num_changed += 1
+                frontier += branch
+                continue
+
+            # Reutilizando la rama de la ejecución anterior
+            self.reuse_branch(
+                [id_subcat for id_subcat, _, _ in branch],
+                level,
+                whole_id,
+                tree,
+                previous_tree,
+            )
+
         LOGGER.info(
-            f"Se van a extraer información de {len(column_values)} subcategorías"
+            f"Cantidad de ramas que cambiaron desde la ejecución anterior: {num_changed} de {len(column_values)}"
+        )
+        if num_failed > 0:
+            LOGGER.warning(
+                f"Cantidad de ramas reutilizadas sin consultar la api por peticiones fallidas: {num_failed}"
+            )
+        return self.crawl(
+            engine, frontier, level, whole_id, tree, depth=2, checkpoint=checkpoint
         )
-        subcategory_info = []
-        # Realizando peticiones a la api
-        futures_list_cat = [
-            THREAD.submit(self.send_request_api, *category_level)
-            for category_level in column_values
+
+    def get_root_categories(self):
+        """Obtiene las categorías principales de saga falabella sin duplicados y ordenadas por id
+
+        Returns:
+            list: Lista de id, nombre y path de las categorías principales
+        """
+        with self._metadata.stage("menu"):
+            menu_links = self.get_menu_links_http() if self._browserless else []
+            if len(menu_links) == 0:
+                self.start_driver()
+                LOGGER.info("Entrando a la página web de la tienda de saga falabella")
+                self._driver.get(URL_FALABELLA)
+                self._driver.get(URL_FALABELLA) # Truco para eliminar varias ventanas molestosas
+
+                LOGGER.info("Cerrando ventanas emergentes")
+                self.close_popups()
+                menu_links = self.get_menu_links()
+
+        self._df_category = self.get_category_info(menu_links)
+        whole_id = IdRegistry()
+        LOGGER.info("Filtrando categorías principales duplicadas")
+        self._df_category = self._df_category[
+            whole_id.add_many(self._df_category["Id_0"].values)
         ]
+        self._df_category.sort_values("Id_0", inplace=True, ignore_index=True)
+
+        self.quit_driver()
+        return self._df_category[
+            ["Id_0", "Name_0", "Category_path_0"]
+        ].values.tolist()
+
+    def extract_categories(self, level, engine="thread", incremental=False):
+        """Extrae la información de las categorías de saga falabella hasta cierto nivel de profundidad
+
+        Args:
+            level (int): Profundidad del árbol de categorías de saga falabella
+            engine (str, optional): Motor usado para realizar las peticiones a la api ("thread" o "async"). Defaults to "thread".
+            incremental (bool, optional): Actualizar el árbol de la ejecución anterior recorriendo solo las ramas que cambiaron. Defaults to False.
+        """
+        LOGGER.info(
+            f"Extrayendo el árbol de categorías de saga falabella con profundidad {level}",
+        )
+        if level <= 0:
+            LOGGER.error(
+                f"La cantidad de niveles de jerarquía de la clasificación de las categorías debe ser mayor o igual a 0",
+            )
+            self.quit_driver()
+            return
+
+        engine = self.check_engine(engine)
+        column_values = self.get_root_categories()
+        whole_id = IdRegistry(id_cat for id_cat, _, _ in column_values)
+        tree = CategoryTree()
+        for id_cat, name_cat, path_cat in column_values:
+            tree.add(None, id_cat, name_cat, path_cat, 0)
+        if level == 1:
+            LOGGER.info(
+                f"Se ha especificado nivel de profundidad {level}. No se va a extraer la información de las subcategorías.",
+            )
+            self.build_category_tree(tree, level)
+            return
+
+        LOGGER.info("Extrayendo información de las subcategorías")
+
+        previous_tree = None
+        if incremental:
+            previous_filename = find_previous_data(DATA_FOLDER, DATA_FILENAME)
+            if previous_filename is None:
+                LOGGER.info(
+                    "No se encontró una ejecución anterior. Se va a recorrer el árbol completo"
+                )
+            else:
+                LOGGER.info(f"Usando la ejecución anterior {previous_filename}")
+                previous_tree = CategoryTree.from_frame(
+                    read_csv(previous_filename, sep=";", encoding="utf-8-sig", dtype=str)
+                )
+
+        checkpoint = CrawlCheckpoint(level=level, engine=engine)
+        if previous_tree is None:
+            self.crawl(
+                engine, column_values, level, whole_id, tree, checkpoint=checkpoint
+            )
+        else:
+            self.refresh_subcategories(
+                engine, column_values, level, whole_id, tree, previous_tree, checkpoint
+            )
+            self._df_diff = diff_category_trees(previous_tree, tree)
+            LOGGER.info(
+                f"Cambios respecto a la ejecución anterior: {self._df_diff.shape[0]}"
+            )
+
+        self.build_category_tree(tree, level)
+        checkpoint.remove()
+
+    def resume_categories(self, checkpoint_filename=CHECKPOINT_FILENAME):
+        """Continúa la extracción de las categorías desde el último punto de control guardado sin repetir las peticiones ya completadas
+
+        Args:
+            checkpoint_filename (str, optional): Nombre del archivo del punto de control. Defaults to CHECKPOINT_FILENAME.
+
+        Returns:
+            bool: Booleano que indica si se pudo reanudar la extracción
+        """
+        self.quit_driver()
+        checkpoint, state = CrawlCheckpoint.load(checkpoint_filename)
+        if checkpoint is None:
+            LOGGER.error(
+                f"No se puede reanudar la extracción. Razón: No existe el punto de control {checkpoint_filename}"
+            )
+            return False
+
+        level = state["level"]
+        engine = self.check_engine(state["engine"])
+        tree = CategoryTree.from_records(state["tree"])
+        frontier = [(tuple(item[:3]), item[3]) for item in state["frontier"]]
+        LOGGER.info(
+            f"Reanudando la extracción de las categorías con profundidad {level}: {len(tree)} categorías recuperadas y {len(frontier)} pendientes"
+        )
+        whole_id = IdRegistry(tree.ids())
+        self.crawl_frontier(engine, frontier, level, whole_id, tree, checkpoint)
+        self.build_category_tree(tree, level)
+        checkpoint.remove()
+        return True
+
+    def shard_categories(self, queue, level, engine="thread", num_shards=1):
+        """Divide las categorías principales en grupos y los agrega a la cola de trabajo para que cada proceso recorra sus subárboles
 
-        # Recorriendo y registrando el resultado de todas las peticiones a la api
-        for futures in as_completed(futures_list_cat):
-            subcategory_info += futures.result()
+        Args:
+            queue (WorkQueue): Cola de trabajo compartida
+            level (int): Profundidad del árbol de categorías de saga falabella
+            engine (str, optional): Motor usado para realizar las peticiones a la api ("thread" o "async"). Defaults to "thread".
+            num_shards (int, optional): Cantidad de grupos. Defaults to 1.
 
-        LOGGER.info(f"Se han extraído {len(subcategory_info)} subcategoría(s) nueva(s)")
-        df_subcat_info = DataFrame(
-            subcategory_info,
-            columns=["Id", "Id_subcat", "Subcategory", "Category_path"],
+        Returns:
+            int: Cantidad de grupos agregados a la cola
+        """
+        column_values = self.get_root_categories()
+        size = max(1, -(-len(column_values) // num_shards))
+        shards = [
+            {
+                "roots": column_values[start : start + size],
+                "level": level,
+                "engine": engine,
+                "rate": self._scheduler.rate,
+                "max_rate": self._scheduler.max_rate,
+                **executor_settings(),
+            }
+            for start in range(0, len(column_values), size)
+        ]
+        queue.clear("category")
+        queue.put_many("category", shards)
+        LOGGER.info(
+            f"Se han agregado {len(shards)} grupos con {len(column_values)} categorías principales a la cola {queue.filename}"
         )
+        return len(shards)
+
+    def crawl_shard(self, roots, level, engine="thread"):
+        """Recorre los subárboles de un grupo de categorías principales
+
+        Args:
+            roots (list): Lista de id, nombre y path de las categorías principales del grupo
+            level (int): Profundidad del árbol de categorías de saga falabella
+            engine (str, optional): Motor usado para realizar las peticiones a la api ("thread" o "async"). Defaults to "thread".
 
-        LOGGER.info("Comprobando que no existan duplicados")
-        index_values = [
-            id_index
-            for id_index, id_subcat in enumerate(df_subcat_info["Id_subcat"].values)
-            if id_subcat in whole_id
-        ]
-        if len(index_values) > 0:
-            LOGGER.info(f"Cantidad de subcategorías repetidas: {len(index_values)}")
-            df_subcat_info.drop(index_values, inplace=True)
-        return df_subcat_info
+        Returns:
+            CategoryTree: Árbol de categorías del grupo
+        """
+        engine = self.check_engine(engine)
+        whole_id = IdRegistry(id_cat for id_cat, _, _ in roots)
+        tree = CategoryTree()
+        for id_cat, name_cat, path_cat in roots:
+            tree.add(None, id_cat, name_cat, path_cat, 0)
+        if level > 1:
+            self.crawl(engine, roots, level, whole_id, tree)
+        return tree
 
-    def extract_categories(self, level):
-        """Extrae la información de las categorías de saga falabella hasta cierto nivel de profundidad
+    def merge_category_shards(self, queue, level, wait_workers=True):
+        """Une los árboles parciales generados por los procesos en un solo árbol, descartando las categorías repetidas entre grupos
 
         Args:
+            queue (WorkQueue): Cola de trabajo compartida
             level (int): Profundidad del árbol de categorías de saga falabella
+            wait_workers (bool, optional): Esperar a que los procesos externos terminen todos los grupos. Defaults to True.
+
+        Returns:
+            bool: Booleano que indica si todos los grupos terminaron correctamente
         """
-        LOGGER.info(
-            f"Extrayendo el árbol de categorías de saga falabella con profundidad {level}",
-        )
-        if level <= 0:
+        counts = queue.wait_done("category") if wait_workers else queue.counts("category")
+        num_failed = sum(count for status, count in counts.items() if status != "done")
+        if num_failed > 0:
             LOGGER.error(
-                f"La cantidad de niveles de jerarquía de la clasificación de las categorías debe ser mayor o igual a 0",
+                f"No se puede unir el árbol de categorías. Razón: {num_failed} grupos no terminaron"
             )
-            self._driver.quit()
-            return
+            return False
 
-        LOGGER.info("Entrando a la página web de la tienda de saga falabella")
-        self._driver.get(URL_FALABELLA)
-        self._driver.get(URL_FALABELLA) # Truco para eliminar varias ventanas molestosas
+        tree = CategoryTree()
+        skipped = set()
+        shard_filenames = queue.results("category")
+        for shard_filename in shard_filenames:
+            with gzip_open(shard_filename, "rt", encoding="utf-8") as file:
+                records = load_json(file)
+            for id_parent, id_cat, name_cat, path_cat, depth in records:
+                # Una categoría repetida se descarta junto con todo su subárbol
+                if id_cat in tree or id_parent in skipped:
+                    skipped.add(id_cat)
+                    continue
+                tree.add(id_parent, id_cat, name_cat, path_cat, depth)
+        LOGGER.info(f"Se han unido {len(shard_filenames)} árboles parciales")
+        self.build_category_tree(tree, level)
+        return True
 
-        LOGGER.info("Cerrando ventanas emergentes")
-        self.close_popups()
+    def close(self):
+        """Cierra el navegador web, la sesión y la caché de la api"""
+        self.quit_driver()
+        self._session.close()
+        self._cache.close()
 
-        self._df_category = self.get_category_info(self.get_menu_links())
-        self._df_category.sort_values("Id_0", inplace=True)
-        df_subcategory = self._df_category
-        whole_id = self._df_category["Id_0"].values.tolist()
+    def check_engine(self, engine):
+        """Comprueba que el motor indicado pueda ser usado
 
-        LOGGER.info("Cerrando navegador web")
-        self._driver.quit()
-        if level == 1:
-            LOGGER.info(
-                f"Se ha especificado nivel de profundidad {level}. No se va a extraer la información de las subcategorías.",
-            )
-            return
+        Args:
+            engine (str): Motor usado para realizar las peticiones a la api ("thread" o "async")
 
-        LOGGER.info("Extrayendo información de las subcategorías")
-        for i in range(1, level):
-            LOGGER.info(f"Obteniendo información de las subcategorías de nivel {i}")
-            id_prev = "Id_" + str(i - 1)
-            name_prev = "Name_" + str(i - 1)
-            category_path_prev = "Category_path_" + str(i - 1)
-            df_subcategory = self.get_subcategory_info(
-                df_subcategory[
-                    [id_prev, name_prev, category_path_prev]
-                ].values.tolist(),
-                whole_id,
+        Returns:
+            str: Motor a usar
+        """
+        if engine == "async" and ClientSession is None:
+            LOGGER.warning(
+                "No se puede usar el motor asíncrono. Razón: La librería aiohttp no está instalada"
             )
+            return "thread"
+        # El planificador por defecto está dimensionado para hilos
+        if engine == "async" and self._default_scheduler:
+            self._scheduler = build_scheduler(engine)
+            self._default_scheduler = False
+        return engine
 
-            # Comprobando si ya no hay más resultados
-            if df_subcategory.shape[0] == 0:
-                level = i
-                LOGGER.info(
-                    f"Se ha llegado al máximo de profundidad con un valor de {level}.",
-                )
-                break
-
-            df_subcategory.rename(
-                {
-                    "Id": id_prev,
-                    "Subcategory": "Name_" + str(i),
-                    "Id_subcat": "Id_" + str(i),
-                    "Category_path": "Category_path_" + str(i),
-                },
-                axis=1,
-                inplace=True,
-            )
-            df_subcategory.drop_duplicates(
-                ["Id_" + str(i)], keep="first", inplace=True, ignore_index=True
-            )
-            whole_id += df_subcategory["Id_" + str(i)].values.tolist()
+    def build_category_tree(self, tree, level):
+        """Registra el árbol de categorías extraído, que se convierte al formato ancho (Id_i, Name_i, Category_path_i) recién al guardarlo
 
-            LOGGER.info("Agregando las subcategorías encontradas al DataFrame original")
-            self._df_category = self._df_category.merge(
-                df_subcategory, how="left", left_on=id_prev, right_on=id_prev
+        Args:
+            tree (CategoryTree): Árbol de categorías registradas
+            level (int): Profundidad máxima del árbol de categorías
+        """
+        if tree.max_depth + 1 < level:
+            LOGGER.info(
+                f"Se ha llegado al máximo de profundidad con un valor de {tree.max_depth + 1}.",
             )
-            LOGGER.info(f"Subcategorías de nivel {i} recuperadas satisfactoriamente")
+        LOGGER.info(f"Se han registrado {len(tree)} categorías en el árbol")
+        self._tree = tree
 
-        self._df_category.drop("Category_path_0", axis=1, inplace=True)
-        self._df_category.replace("\n", "")
+        stats = self._session.connection_stats()
+        LOGGER.info(
+            f"Peticiones a la api: {stats['requests']}, conexiones abiertas: {stats['opened']}, conexiones reutilizadas: {stats['reused']}"
+        )
+        stats = self._scheduler.stats()
+        LOGGER.info(
+            f"Planificador de la api: concurrencia final {stats['concurrency']}, tasa final {stats['rate']} peticiones por segundo, {stats['retries']} reintentos, {stats['throttled']} reducciones de concurrencia"
+        )
+        stats = self._cache.stats()
         LOGGER.info(
-            f"Extracción de las categorías con un nivel de profundidad {level} completado satisfactoriamente\n",
+            f"Caché de la api: {stats['hits']} aciertos, {stats['misses']} fallos, {stats['revalidated']} revalidadas"
+        )
+        self._cache.close()
+        LOGGER.info(
+            f"Extracción de las categorías con un nivel de profundidad {min(level, tree.max_depth + 1)} completado satisfactoriamente\n",
         )
 
-    def save_data(self, folder, filename, encoding="utf-8-sig"):
-        """Guarda los datos o errores obtenidos durante la ejecución del scraper
+    def save_data(self, folder, filename, encoding="utf-8-sig", parquet=False):
+        """Guarda los datos o errores obtenidos durante la ejecución del scraper, escribiendo el árbol de categorías por bloques
 
         Args:
             folder (str): Ruta del archivo
             filename (str): Nombre del archivo
             encoding (str): Codificación usada para guardar el archivo. Defaults to "utf-8-sig"
+            parquet (bool, optional): Guardar también los datos en el dataset Parquet particionado por fecha. Defaults to False.
         """
         LOGGER.info("Guardando la data")
-        quantity = self._df_category.shape[0]
-        self._metadata.quantity = quantity
-
         # Comprobando que el dataset contenga información
-        if quantity == 0:
+        if self._tree is None or len(self._tree) == 0:
             LOGGER.info(
                 f"El archivo de datos no se va a guardar por no tener información",
             )
             return
 
-        # Generando la ruta donde se va a guardar la información
         datetime_obj = datetime.strptime(self._metadata.execution_date, "%d/%m/%Y")
-        filepath = path.join(folder, datetime_obj.strftime("%d-%m-%Y"))
-        filename = (
-            filename
-            + "_"
-            + datetime_obj.strftime("%d%m%Y")
-            + "_"
-            + str(quantity)
-            + ".csv"
-        )
-
-        # Verificando si la ruta donde se va a guardar la información existe
-        if not path.exists(filepath):
-            # Creando la ruta donde se va a guardar la información
-            makedirs(filepath)
-        self._df_category.to_csv(
-            path.join(filepath, filename),
-            sep=";",
-            index=False,
+        with self._metadata.stage("save") as stage, open_sink(
+            "csv",
+            folder,
+            filename,
+            self._tree.columns(root_path=False),
+            datetime_obj,
             encoding=encoding,
-        )
+        ) as sink:
+            for rows in self._tree.iter_chunks(SINK_BUFFER_SIZE, root_path=False):
+                sink.write(rows)
+                stage.add("rows", len(rows))
+        self._metadata.quantity = sink.quantity
+        filepath, filename = path.split(sink.final_filename)
         LOGGER.info(
             f"El archivo de datos {filename} ha sido guardado correctamente en la ruta {path.join(ROOT_PATH, filepath)}",
         )
 
+        # Guardando los cambios respecto a la ejecución anterior
+        if self._df_diff is not None:
+            diff_filename = filename.replace(".csv", "_diff.csv")
+            self._df_diff.to_csv(
+                path.join(filepath, diff_filename),
+                sep=";",
+                index=False,
+                encoding=encoding,
+            )
+            LOGGER.info(
+                f"El archivo de cambios {diff_filename} ha sido guardado correctamente en la ruta {path.join(ROOT_PATH, filepath)}",
+            )
+
+        if parquet:
+            self.save_parquet(path.join(folder, PARQUET_FOLDER), datetime_obj)
+
+    def save_parquet(self, folder, datetime_obj):
+        """Agrega los datos al dataset Parquet particionado por fecha de ejecución, codificando los nombres de las categorías como diccionario
+
+        Args:
+            folder (str): Ruta del dataset
+            datetime_obj (datetime.datetime): Fecha de ejecución del scraper
+        """
+        if write_table is None:
+            LOGGER.warning(
+                "No se va a guardar el dataset Parquet. Razón: La librería pyarrow no está instalada"
+            )
+            return
+
+        # Cada ejecución agrega un archivo nuevo a la partición de su fecha
+        filepath = path.join(
+            folder, PARQUET_PARTITION + "=" + datetime_obj.strftime("%Y-%m-%d")
+        )
+        columns = self._tree.columns(root_path=False)
+        with ParquetSink(
+            filepath,
+            DATA_FILENAME + "_" + strftime("%H%M%S") + "_" + uuid4().hex[:8],
+            columns,
+            with_quantity=False,
+            dictionary_columns=[
+                column for column in columns if column.startswith("Name_")
+            ],
+        ) as sink:
+            for rows in self._tree.iter_chunks(SINK_BUFFER_SIZE, root_path=False):
+                sink.write(rows)
+        filename = path.basename(sink.final_filename)
+        LOGGER.info(
+            f"El archivo Parquet {filename} ha sido guardado correctamente en la ruta {path.join(ROOT_PATH, filepath)}",
+        )
+
+    def save_metrics(self, folder, filename):
+        """Guarda las métricas por etapa del scraper junto a los logs de la ejecución
+
+        Args:
+            folder (str): Carpeta donde se guardan las métricas
+            filename (str): Nombre base de los archivos de métricas
+        """
+        LOGGER.info("Guardando las métricas por etapa")
+        self._metadata.save_metrics(
+            path.join(folder, CURRENT_DATE.strftime("%d-%m-%Y")),
+            filename + "_" + CURRENT_DATE.strftime("%d%m%Y"),
+        )
+
     def save_metadata(self, filename, sheet_name):
         """Guarda la información de la metadata generada durante la ejecución del scraper
 
@@ -737,8 +3745,7 @@ class ScraperFalabellaCategory:
             ]
             worksheet.append(keys)
 
-        values = list(self._metadata.__dict__.values())[1:]
-        worksheet.append(values)
+        worksheet.append(self._metadata.to_row())
         wb_time.save(filename)
         wb_time.close()
         LOGGER.info(
@@ -791,6 +3798,401 @@ def validate_params(parameters):
     return True
 
 
+def quit_quietly(driver):
+    """Cierra un navegador web ignorando los errores de uno que ya no responde
+
+    Args:
+        driver (WebDriver): Navegador web
+    """
+    try:
+        driver.quit()
+    except WebDriverException as error:
+        LOGGER.warning(f"No se pudo cerrar el navegador web: {error.msg}")
+
+
+def get_driver_path():
+    """Retorna la ruta del binario de ChromeDriver, guardándola en disco para no consultar a ChromeDriverManager en cada inicio del navegador
+
+    Returns:
+        str: Ruta del binario de ChromeDriver
+    """
+    with DRIVER_PATH_LOCK:
+        if path.isfile(DRIVER_PATH_FILENAME) and (
+            time() - path.getmtime(DRIVER_PATH_FILENAME) < DRIVER_PATH_MAX_AGE
+        ):
+            with open(DRIVER_PATH_FILENAME, encoding="utf-8") as file:
+                driver_path = file.read().strip()
+            if path.isfile(driver_path):
+                return driver_path
+
+        driver_path = ChromeDriverManager().install()
+        with open(DRIVER_PATH_FILENAME, "w", encoding="utf-8") as file:
+            file.write(driver_path)
+        return driver_path
+
+
+def is_json_body(body):
+    """Comprueba de forma rápida si el cuerpo de una respuesta es un objeto JSON y no una página de bloqueo
+
+    Args:
+        body (bytes): Cuerpo de la respuesta
+
+    Returns:
+        bool: Booleano
+    """
+    return body.lstrip()[:1] == b"{"
+
+
+def wake_waiter(waiter):
+    """Despierta a una corrutina que espera un espacio del planificador, si aún no fue cancelada
+
+    Args:
+        waiter (asyncio.Future): Futuro que espera la corrutina
+    """
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def build_scheduler(engine=API_ENGINE, rate=API_RATE, max_rate=API_MAX_RATE):
+    """Genera el planificador de las peticiones a la api con la concurrencia máxima que admite el motor usado
+
+    Args:
+        engine (str, optional): Motor usado para realizar las peticiones a la api ("thread", "async" o "http"). Defaults to API_ENGINE.
+        rate (float, optional): Peticiones por segundo permitidas al iniciar. Defaults to API_RATE.
+        max_rate (float, optional): Peticiones por segundo máximas. Defaults to API_MAX_RATE.
+
+    Returns:
+        ApiScheduler: Planificador de las peticiones a la api
+    """
+    # Con hilos no puede haber más peticiones en vuelo que hilos del pool network, con asyncio el límite es el del conector
+    if engine == "async":
+        max_concurrency = API_ASYNC_LIMIT
+    else:
+        max_concurrency = EXECUTORS["network"].max_workers
+    return ApiScheduler(rate=rate, max_concurrency=max_concurrency, max_rate=max_rate)
+
+
+def build_api_url(id_cat, name_subcat, path_subcat, page=1, page_size=API_FACETS_PAGE_SIZE):
+    """Genera el enlace de la api usando el id, nombre y path de una categoría de Saga Falabella
+
+    Args:
+        id_cat (str): Id de la categoría
+        name_subcat (str): Nombre de la categoría
+        path_subcat (str): Path de la categoría
+        page (int, optional): Número de página de productos. Defaults to 1.
+        page_size (int, optional): Cantidad de productos por página. Defaults to API_FACETS_PAGE_SIZE.
+
+    Returns:
+        str: Enlace de la api
+    """
+    return API_URL.format(path_subcat, id_cat, quote_plus(name_subcat), page, page_size)
+
+
+def slice_json_value(body, path):
+    """Ubica el valor (lista u objeto) de una ruta de llaves dentro de un JSON sin decodificarlo. Como los filtros van al final
+    de la respuesta, la profundidad de cada coincidencia de la llave se comprueba recorriendo solo el texto que le sigue
+
+    Args:
+        body (bytes): Cuerpo de la respuesta
+        path (tuple): Llaves desde el objeto raíz hasta el valor, por ejemplo (b"data", b"facets")
+
+    Returns:
+        bytes or None: Fragmento del JSON con el valor de la ruta o None si no se encontró
+    """
+    parents = [
+        search(rb'"' + key + rb'"\s*:\s*\{', body) for key in path[:-1]
+    ]
+    if None in parents:
+        return None
+    values = []
+    for match in finditer(rb'"' + path[-1] + rb'"\s*:\s*(?=[\[{])', body):
+        if parents and match.start() < parents[-1].end():
+            continue
+        depth = 0
+        end = None
+        for token in API_JSON_TOKEN.finditer(body, match.end()):
+            bracket = token.group()
+            # Los textos se saltan completos para no contar los corchetes que contienen
+            if bracket[:1] == b'"':
+                continue
+            depth += 1 if bracket in b"[{" else -1
+            if depth == 0 and end is None:
+                end = token.end()
+            elif depth < 0 and bracket != b"}":
+                break
+        else:
+            # El valor debe colgar directamente de los objetos de la ruta hasta cerrar el objeto raíz
+            if end is not None and depth == -len(path) and not body[token.end() :].strip():
+                values.append(body[match.end() : end])
+    # Si otra rama con la misma profundidad tiene la llave, no se puede saber cuál es la buscada
+    return values[0] if len(values) == 1 else None
+
+
+def decode_facets(body):
+    """Decodifica solo los filtros (facets) de la respuesta de la api. Si no se pueden ubicar, decodifica la respuesta completa
+
+    Args:
+        body (bytes): Cuerpo de la respuesta
+
+    Returns:
+        list: Lista de filtros de la categoría
+    """
+    facets = slice_json_value(body, (b"data", b"facets"))
+    if facets is not None:
+        try:
+            return fast_loads(facets)
+        except (ValueError, UnicodeDecodeError):
+            pass
+    return fast_loads(body)["data"]["facets"]
+
+
+def extract_subcategories(facets, id_cat):
+    """Extrae el id, nombre y path de las subcategorías a partir de los filtros de la respuesta de la api
+
+    Args:
+        facets (list): Filtros de la respuesta de la api
+        id_cat (str): Id de la categoría padre
+
+    Returns:
+        list: Lista de subcategorías
+    """
+    filters_value = facets[:4]
+    # Recorriendo los 4 primeros filtros que posee la categoría
+    for filter_value in filters_value[::-1]:
+        # Comprobando si uno de los filtros contiene subcategorías
+        if filter_value["name"] == "Categoría":
+            # Guardando la información de una subcategoría
+            return [
+                [
+                    id_cat,
+                    item["id"],
+                    item["title"],
+                    item["url"].replace("+", "%20"),
+                ]
+                for item in filter_value["values"]
+            ]
+    return []
+
+
+def parse_subcategories(body, id_cat):
+    """Decodifica los filtros de una respuesta de la api y extrae sus subcategorías. Puede ejecutarse en el pool de procesos de cpu
+
+    Args:
+        body (bytes): Cuerpo de la respuesta de la api
+        id_cat (str): Id de la categoría padre
+
+    Returns:
+        list: Lista de subcategorías, vacía si la respuesta no tiene el formato esperado
+    """
+    try:
+        return extract_subcategories(decode_facets(body), id_cat)
+    except (KeyError, IndexError, TypeError, JSONDecodeError):
+        return []
+
+
+def find_previous_data(folder, filename, extensions=(".csv",)):
+    """Busca el archivo de datos más reciente generado por una ejecución anterior del scraper
+
+    Args:
+        folder (str): Carpeta donde se guardan los archivos de datos
+        filename (str): Nombre base de los archivos de datos
+        extensions (tuple, optional): Extensiones de los archivos a buscar. Defaults to (".csv",).
+
+    Returns:
+        str or None: Ruta del archivo más reciente o None si no existe
+    """
+    candidates = []
+    for data_filename in glob(path.join(folder, "*", filename + "_*")):
+        if not data_filename.endswith(tuple(extensions)):
+            continue
+        date_text = extract_text(r"_(\d{8})_\d+\.\w+$", data_filename)
+        if date_text is None:
+            continue
+        candidates.append(
+            (
+                datetime.strptime(date_text, "%d%m%Y"),
+                path.getmtime(data_filename),
+                data_filename,
+            )
+        )
+    return max(candidates)[2] if candidates else None
+
+
+def open_sink(
+    data_format,
+    folder,
+    filename,
+    columns,
+    execution_date=CURRENT_DATE,
+    buffer_size=SINK_BUFFER_SIZE,
+    encoding="utf-8-sig",
+):
+    """Abre un destino de datos en la carpeta de la fecha de ejecución (por ejemplo Data/31-12-2023/falabella_category_31122023_<cantidad>.csv)
+
+    Args:
+        data_format (str): Formato del archivo ("csv", "jsonl" o "parquet")
+        folder (str): Carpeta donde se guardan los archivos de datos
+        filename (str): Nombre base del archivo
+        columns (list): Columnas de las filas
+        execution_date (datetime.date, optional): Fecha de ejecución del scraper. Defaults to CURRENT_DATE.
+        buffer_size (int, optional): Filas en memoria antes de escribirlas. Defaults to SINK_BUFFER_SIZE.
+        encoding (str, optional): Codificación usada para guardar el archivo. Defaults to "utf-8-sig".
+
+    Returns:
+        DataSink: Destino de datos
+    """
+    if data_format == "parquet" and write_table is None:
+        LOGGER.warning(
+            "No se puede guardar en formato Parquet. Razón: La librería pyarrow no está instalada. Se usará el formato CSV"
+        )
+        data_format = "csv"
+    return SINK_FORMATS[data_format](
+        path.join(folder, execution_date.strftime("%d-%m-%Y")),
+        filename + "_" + execution_date.strftime("%d%m%Y"),
+        columns,
+        buffer_size=buffer_size,
+        encoding=encoding,
+    )
+
+
+def diff_category_trees(previous_tree, tree):
+    """Compara dos árboles de categorías y retorna las categorías agregadas, eliminadas o renombradas
+
+    Args:
+        previous_tree (CategoryTree): Árbol de categorías de la ejecución anterior
+        tree (CategoryTree): Árbol de categorías de la ejecución actual
+
+    Returns:
+        pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+    """
+    previous = {
+        id_cat: (depth, name_cat)
+        for depth, _, id_cat, name_cat, _ in previous_tree.nodes()
+    }
+    current = {
+        id_cat: (depth, name_cat) for depth, _, id_cat, name_cat, _ in tree.nodes()
+    }
+    changes = []
+    for id_cat, (depth, name_cat) in current.items():
+        if id_cat not in previous:
+            changes.append(["Agregada", depth, id_cat, name_cat, None])
+        elif previous[id_cat][1] != name_cat:
+            changes.append(["Renombrada", depth, id_cat, name_cat, previous[id_cat][1]])
+    for id_cat, (depth, name_cat) in previous.items():
+        if id_cat not in current:
+            changes.append(["Eliminada", depth, id_cat, None, name_cat])
+    return DataFrame(
+        changes, columns=["Cambio", "Nivel", "Id", "Name", "Name_anterior"]
+    )
+
+
+def extract_next_data(html):
+    """Extrae el JSON __NEXT_DATA__ embebido en una página de saga falabella
+
+    Args:
+        html (str): Código HTML de la página
+
+    Returns:
+        dict or None: Contenido del JSON o None si la página no lo contiene
+    """
+    text = extract_text(
+        r'(?s)<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', html or ""
+    )
+    return loads(text) if text else None
+
+
+def iter_json_strings(data):
+    """Recorre todos los textos contenidos en un JSON
+
+    Args:
+        data (Any): Contenido del JSON
+
+    Yields:
+        str: Texto encontrado
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            stack += value.values()
+        elif isinstance(value, list):
+            stack += value
+
+
+def extract_breadcrumb_root(data):
+    """Busca el breadcrumb de una categoría en el JSON __NEXT_DATA__ y retorna su primer elemento que sea una categoría
+
+    Args:
+        data (dict or None): Contenido del JSON __NEXT_DATA__
+
+    Returns:
+        tuple or None: Nombre y link de la categoría principal o None si no se encontró
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, list):
+            stack += value
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if "breadcrumb" in key.lower() and isinstance(item, list):
+                    for crumb in item:
+                        if not isinstance(crumb, dict):
+                            continue
+                        url_cat = crumb.get("link") or crumb.get("url") or crumb.get("href")
+                        name_cat = crumb.get("label") or crumb.get("name") or crumb.get("title")
+                        if url_cat and name_cat and url_cat.find("category") != -1:
+                            return name_cat, url_cat
+                else:
+                    stack.append(item)
+    return None
+
+
+def load_category_dataset(folder=None, start_date=None, end_date=None):
+    """Carga el dataset Parquet de las categorías usando mapeo en memoria, leyendo solo las particiones del rango de fechas indicado
+
+    Args:
+        folder (str, optional): Ruta del dataset. Defaults to None (Data/parquet).
+        start_date (str, optional): Fecha inicial en formato %Y-%m-%d. Defaults to None.
+        end_date (str, optional): Fecha final en formato %Y-%m-%d. Defaults to None.
+
+    Returns:
+        pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+    """
+    if write_table is None:
+        LOGGER.error(
+            "No se puede cargar el dataset Parquet. Razón: La librería pyarrow no está instalada"
+        )
+        return DataFrame()
+
+    folder = folder or path.join(DATA_FOLDER, PARQUET_FOLDER)
+    options = {
+        "format": "parquet",
+        "partitioning": HivePartitioning(schema([(PARQUET_PARTITION, string())])),
+        "filesystem": LocalFileSystem(use_mmap=True),
+    }
+    category_dataset = dataset(folder, **options)
+    # Las ejecuciones pueden tener distinta profundidad, se unen los esquemas de todos los archivos
+    category_dataset = dataset(
+        folder,
+        schema=unify_schemas(
+            [fragment.physical_schema for fragment in category_dataset.get_fragments()]
+            + [options["partitioning"].schema]
+        ),
+        **options,
+    )
+
+    condition = None
+    if start_date:
+        condition = field(PARQUET_PARTITION) >= start_date
+    if end_date:
+        end_condition = field(PARQUET_PARTITION) <= end_date
+        condition = end_condition if condition is None else condition & end_condition
+    return category_dataset.to_table(filter=condition).to_pandas()
+
+
 def extract_text(pattern, text, n=1):
     """Extrae el texto deseado de una cadena dado una expresión regular
 
@@ -806,7 +4208,214 @@ def extract_text(pattern, text, n=1):
     return groups.group(n) if groups else groups
 
 
+def run_category_worker(queue_filename=QUEUE_FILENAME, worker="worker"):
+    """Reclama grupos de categorías principales de la cola de trabajo hasta que no queden, guardando el árbol parcial de cada grupo en la carpeta de grupos
+
+    Args:
+        queue_filename (str, optional): Nombre del archivo de la cola. Defaults to QUEUE_FILENAME.
+        worker (str, optional): Nombre del proceso. Defaults to "worker".
+    """
+    config_log("Log", "fb_ropa_log_" + worker)
+    queue = WorkQueue(queue_filename)
+    scraper = None
+    shard_folder = path.join(DATA_FOLDER, SHARD_FOLDER)
+    makedirs(shard_folder, exist_ok=True)
+    try:
+        while True:
+            task_id, shard = queue.claim("category", worker)
+            if task_id is None:
+                break
+            # Los pools y el planificador se dimensionan con los valores indicados en el grupo
+            if scraper is None:
+                configure_executors(shard)
+                scraper = ScraperFalabellaCategory(
+                    DATA_DICT_FILENAME,
+                    browserless=True,
+                    scheduler=build_scheduler(
+                        shard["engine"],
+                        shard.get("rate", API_RATE),
+                        shard.get("max_rate", API_MAX_RATE),
+                    ),
+                )
+            LOGGER.info(
+                f"Recorriendo el grupo {task_id} con {len(shard['roots'])} categorías principales"
+            )
+            try:
+                tree = scraper.crawl_shard(
+                    shard["roots"], shard["level"], shard["engine"]
+                )
+                shard_filename = path.join(
+                    shard_folder, DATA_FILENAME + "_shard_" + str(task_id) + ".json.gz"
+                )
+                with gzip_open(shard_filename, "wt", encoding="utf-8") as file:
+                    dump(tree.to_records(), file, separators=(",", ":"))
+                queue.complete(task_id, shard_filename)
+                LOGGER.info(f"Grupo {task_id} terminado con {len(tree)} categorías")
+            except Exception as error:
+                Error(error).imprimir_error()
+                queue.fail(task_id)
+    finally:
+        if scraper is not None:
+            scraper.close()
+        queue.close()
+        EXECUTORS.log_stats()
+        EXECUTORS.shutdown()
+        shutdown()
+
+
+def executor_settings():
+    """Retorna los tamaños de los pools del proceso actual, que se envían en cada grupo a los procesos de trabajo
+
+    Returns:
+        dict: Cantidad de hilos del pool network y uso del pool de procesos cpu
+    """
+    return {
+        "network_workers": EXECUTORS["network"].max_workers,
+        "cpu_processes": EXECUTORS["cpu"].processes,
+    }
+
+
+def configure_executors(shard):
+    """Configura los pools del proceso de trabajo con los tamaños enviados en un grupo por executor_settings
+
+    Args:
+        shard (dict): Parámetros del grupo
+    """
+    if "network_workers" in shard:
+        EXECUTORS.configure("network", max_workers=shard["network_workers"])
+    if "cpu_processes" in shard:
+        EXECUTORS.configure("cpu", processes=shard["cpu_processes"])
+
+
+def run_workers(target, num_workers, queue_filename=QUEUE_FILENAME):
+    """Inicia procesos que ejecutan una función de trabajo sobre la cola y espera a que terminen
+
+    Args:
+        target (function): Función de trabajo, recibe el nombre del archivo de la cola y el nombre del proceso
+        num_workers (int): Cantidad de procesos
+        queue_filename (str, optional): Nombre del archivo de la cola. Defaults to QUEUE_FILENAME.
+    """
+    # Cada proceso se inicia desde cero para no heredar hilos ni conexiones abiertas
+    context = get_context("spawn")
+    processes = [
+        context.Process(target=target, args=(queue_filename, "worker" + str(i)))
+        for i in range(num_workers)
+    ]
+    for process in processes:
+        process.start()
+    LOGGER.info(f"Se han iniciado {num_workers} procesos")
+    for process in processes:
+        process.join()
+
+
+def parse_arguments():
+    """Función que lee los argumentos de la línea de comandos
+
+    Returns:
+        argparse.Namespace: Argumentos del programa
+    """
+    parser = ArgumentParser(description="Extrae el árbol de categorías de saga falabella")
+    parser.add_argument(
+        "--level", type=int, default=LEVEL, help="Profundidad del árbol de categorías"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["thread", "async"],
+        default=API_ENGINE,
+        help="Motor usado para realizar las peticiones a la api",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=API_RATE,
+        help="Peticiones por segundo a la api al iniciar, la tasa crece mientras el servidor responda bien",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=API_MAX_RATE,
+        help="Peticiones por segundo máximas a la api",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=INCREMENTAL,
+        help="Recorrer solo las ramas que cambiaron desde la ejecución anterior",
+    )
+    parser.add_argument(
+        "--browserless",
+        action="store_true",
+        default=BROWSERLESS,
+        help="Obtener las categorías principales sin usar el navegador web",
+    )
+    parser.add_argument(
+        "--lean",
+        action="store_true",
+        default=BROWSER_LEAN,
+        help="Usar el perfil ligero del navegador web",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=API_CACHE_OFFLINE,
+        help="Usar solo las respuestas de la api guardadas en la caché",
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        default=DATA_PARQUET,
+        help="Guardar también los datos en el dataset Parquet particionado por fecha",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continuar la extracción desde el último punto de control",
+    )
+    parser.add_argument(
+        "--network-workers",
+        type=int,
+        default=NETWORK_WORKERS,
+        help="Cantidad de hilos del pool usado para las peticiones HTTP",
+    )
+    parser.add_argument(
+        "--cpu-processes",
+        action="store_true",
+        default=CPU_PROCESSES,
+        help="Decodificar las respuestas de la api en un pool de procesos",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        help="Dividir las categorías principales en grupos recorridos por varios procesos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=cpu_count() or 1,
+        help="Cantidad de procesos locales usados con --shards (0 para usar solo procesos externos con --worker)",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Procesar los grupos de la cola de trabajo compartida y terminar",
+    )
+    parser.add_argument(
+        "--queue",
+        default=QUEUE_FILENAME,
+        help="Archivo de la cola de trabajo compartida",
+    )
+    return parser.parse_args()
+
+
 def main():
+    arguments = parse_arguments()
+    EXECUTORS.configure("network", max_workers=arguments.network_workers)
+    EXECUTORS.configure("cpu", processes=arguments.cpu_processes)
+    if arguments.worker:
+        run_category_worker(arguments.queue, "worker_" + uuid4().hex[:8])
+        return
+    scraper = None
     try:
         # Formato para el debugger
         config_log("Log", "fb_ropa_log")
@@ -827,22 +4436,56 @@ def main():
         LOGGER.info("Parámetros válidos")
 
         LOGGER.info("Inicializando scraper")
-        scraper = ScraperFalabellaCategory(DATA_DICT_FILENAME)
+        scraper = ScraperFalabellaCategory(
+            DATA_DICT_FILENAME,
+            API_CACHE_FILENAME,
+            arguments.offline,
+            # Al reanudar no se necesita el navegador web
+            arguments.browserless or arguments.resume,
+            arguments.lean,
+            build_scheduler(arguments.engine, arguments.rate, arguments.max_rate),
+        )
         LOGGER.info("Scraper inicializado satisfactoriamente")
 
-        LOGGER.info("Extrayendo las categorias de falabella")
-        scraper.extract_categories(5)
+        if arguments.resume:
+            LOGGER.info("Reanudando la extracción de las categorias de falabella")
+            if not scraper.resume_categories(CHECKPOINT_FILENAME):
+                return
+        elif arguments.shards > 0:
+            LOGGER.info("Extrayendo las categorias de falabella con varios procesos")
+            queue = WorkQueue(arguments.queue)
+            scraper.shard_categories(
+                queue, arguments.level, arguments.engine, arguments.shards
+            )
+            if arguments.workers > 0:
+                run_workers(run_category_worker, arguments.workers, arguments.queue)
+            merged = scraper.merge_category_shards(
+                queue, arguments.level, wait_workers=arguments.workers == 0
+            )
+            queue.close()
+            if not merged:
+                return
+        else:
+            LOGGER.info("Extrayendo las categorias de falabella")
+            scraper.extract_categories(
+                arguments.level, arguments.engine, arguments.incremental
+            )
 
         LOGGER.info("Guardando toda la información generada por el scraper")
-        scraper.save_data(DATA_FOLDER, DATA_FILENAME)
+        scraper.save_data(DATA_FOLDER, DATA_FILENAME, parquet=arguments.parquet)
         scraper.save_metadata(METADATA_FILENAME, METADATA_SHEET_NAME)
+        scraper.save_metrics(METRICS_FOLDER, METRICS_FILENAME)
         LOGGER.info("Programa finalizado")
 
     except Exception as error:
         Error(error).imprimir_error()
         LOGGER.error("Programa ejecutado con fallos")
-        del scraper # Forzando el cierre del navegador web si es que se requiere
     finally:
+        # Cerrando el navegador web, la sesión y la caché de la api
+        if scraper is not None:
+            scraper.close()
+        EXECUTORS.log_stats()
+        EXECUTORS.shutdown()
         # Liberar el archivo log
         shutdown()
 
@@ -0,0 +1,574 @@
+# Librerías a importar
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from glob import glob
+from logging import shutdown
+from os import makedirs, path, remove, replace
+from sys import stdout
+
+from pandas import concat, DataFrame, read_csv, read_json, read_parquet
+
+from Falabella_Category_Extraction import (
+    config_log,
+    CURRENT_DATE,
+    DATA_FOLDER,
+    Error,
+    extract_text,
+    find_previous_data,
+    LOGGER,
+)
+from Falabella_Products_Extraction import (
+    PRODUCT_CHANGES_FILENAME,
+    PRODUCT_COLUMNS,
+    PRODUCT_FILENAME,
+    price_to_cents,
+)
+
+try:
+    # Librería necesaria para guardar el historial en formato columnar
+    from pyarrow import (
+        bool_,
+        date32,
+        dictionary,
+        int32,
+        int64,
+        schema,
+        string,
+        Table,
+    )
+    from pyarrow.dataset import dataset, field
+    from pyarrow.parquet import read_schema, write_table
+except ImportError:
+    write_table = None
+
+# Constantes usadas en el script
+HISTORY_FOLDER = "falabella_price_history"
+HISTORY_BASE_FILENAME = "base.parquet"
+HISTORY_LATEST_FILENAME = "latest.parquet"
+HISTORY_DELTA_PREFIX = "delta_"
+HISTORY_COMPACT_EVERY = 30
+HISTORY_ROW_GROUP_SIZE = 64 * 1024
+HISTORY_DATE_KEY = b"last_date"
+HISTORY_DROP = 0.2
+HISTORY_DAYS = 7
+HISTORY_SNAPSHOT_EXTENSIONS = (".csv", ".jsonl", ".parquet")
+# Columnas de precios de PRODUCT_COLUMNS y su nombre en el historial
+HISTORY_PRICE_COLUMNS = {
+    PRODUCT_COLUMNS[3]: "regular",
+    PRODUCT_COLUMNS[4]: "discount",
+    PRODUCT_COLUMNS[5]: "card",
+}
+HISTORY_COLUMNS = ["product_id", "date", "category", "name", "available"] + list(
+    HISTORY_PRICE_COLUMNS.values()
+)
+
+
+class PriceHistory:
+    """Representa el historial de precios de los productos, guardado como un dataset Parquet que solo contiene los cambios: cada fila es el estado de un producto desde su fecha hasta la fecha de la siguiente fila del mismo producto
+
+    Cada carga diaria escribe solo un archivo delta con sus cambios y reemplaza el archivo latest con el estado vigente de cada producto (una fila por producto),
+    sin reescribir el historial. Cada HISTORY_COMPACT_EVERY cargas los deltas se unen al archivo base, ordenado por producto y fecha para que las consultas de
+    un producto lean solo sus row groups
+
+    Attributes:
+        folder (str): Carpeta del historial
+        last_date (datetime.date or None): Fecha de la última foto diaria agregada al historial
+    """
+
+    def __init__(self, folder=path.join(DATA_FOLDER, HISTORY_FOLDER)):
+        """Genera todos los atributos para una instancia de la clase PriceHistory
+
+        Args:
+            folder (str, optional): Carpeta del historial. Defaults to Data/HISTORY_FOLDER.
+        """
+        if write_table is None:
+            raise ImportError(
+                "El historial de precios necesita la librería pyarrow, que no está instalada"
+            )
+        self._folder = folder
+        self._schema = schema(
+            [
+                ("product_id", dictionary(int32(), string())),
+                ("date", date32()),
+                ("category", dictionary(int32(), string())),
+                ("name", string()),
+                ("available", bool_()),
+            ]
+            + [(column, int64()) for column in HISTORY_PRICE_COLUMNS.values()]
+        )
+
+    @property
+    def folder(self):
+        """Retorna el valor actual del atributo folder"""
+        return self._folder
+
+    @property
+    def last_date(self):
+        """Retorna la fecha de la última foto diaria guardada en los metadatos del archivo latest"""
+        filename = path.join(self._folder, HISTORY_LATEST_FILENAME)
+        if not path.isfile(filename):
+            return None
+        metadata = read_schema(filename).metadata or {}
+        if HISTORY_DATE_KEY not in metadata:
+            return None
+        return datetime.strptime(metadata[HISTORY_DATE_KEY].decode(), "%Y-%m-%d").date()
+
+    def get_files(self):
+        """Retorna los archivos con las filas del historial: el archivo base y los deltas en orden de fecha
+
+        Returns:
+            list: Lista de rutas de los archivos
+        """
+        filenames = sorted(
+            glob(path.join(self._folder, HISTORY_DELTA_PREFIX + "*.parquet"))
+        )
+        base_filename = path.join(self._folder, HISTORY_BASE_FILENAME)
+        if path.isfile(base_filename):
+            filenames.insert(0, base_filename)
+        return filenames
+
+    def load(self):
+        """Carga todo el historial
+
+        Returns:
+            pandas.core.frame.DataFrame: Historial con las columnas HISTORY_COLUMNS ordenado por producto y fecha
+        """
+        return self.scan(None).sort_values(
+            ["product_id", "date"], kind="stable", ignore_index=True
+        )
+
+    def load_latest(self):
+        """Carga el estado vigente de cada producto: su última fila en el historial
+
+        Returns:
+            pandas.core.frame.DataFrame: Una fila por producto con las columnas HISTORY_COLUMNS
+        """
+        filename = path.join(self._folder, HISTORY_LATEST_FILENAME)
+        if not path.isfile(filename):
+            return self._schema.empty_table().to_pandas()
+        return read_parquet(filename)
+
+    def scan(self, condition):
+        """Lee solo las filas del historial que cumplen una condición, descartando los row groups cuyas estadísticas no la cumplen
+
+        Args:
+            condition (pyarrow.compute.Expression or None): Condición sobre las columnas del historial, None para leer todo
+
+        Returns:
+            pandas.core.frame.DataFrame: Filas que cumplen la condición
+        """
+        filenames = self.get_files()
+        if not filenames:
+            return self._schema.empty_table().to_pandas()
+        return (
+            dataset(filenames, schema=self._schema, format="parquet")
+            .to_table(filter=condition)
+            .to_pandas()
+        )
+
+    def ingest(self, df_snapshot, snapshot_date, partial=False):
+        """Agrega una foto diaria de los productos al historial, guardando solo los productos nuevos, los que cambiaron de precio y los que dejaron de aparecer
+
+        Args:
+            df_snapshot (pandas.core.frame.DataFrame): Productos con las columnas de PRODUCT_COLUMNS
+            snapshot_date (datetime.date): Fecha de la foto diaria
+            partial (bool, optional): La foto solo tiene las páginas que cambiaron (extracción incremental), por lo que los productos ausentes no se marcan como no disponibles. Defaults to False.
+
+        Returns:
+            int: Cantidad de filas agregadas al historial
+        """
+        last_date = self.last_date
+        if last_date is not None and snapshot_date <= last_date:
+            LOGGER.warning(
+                f"La foto del {snapshot_date.strftime('%d/%m/%Y')} no se agrega al historial. Razón: El historial ya llega hasta el {last_date.strftime('%d/%m/%Y')}"
+            )
+            return 0
+
+        df_new = snapshot_to_history(df_snapshot, snapshot_date).set_index("product_id")
+        df_last = self.load_latest().astype({"product_id": str}).set_index("product_id")
+
+        df_previous = df_last.reindex(df_new.index)
+        # Un producto cambia si es nuevo, si vuelve a estar disponible o si cambió uno de sus precios.
+        # La categoría no cuenta: un producto listado en varias categorías puede aparecer en otra sin haber cambiado
+        is_changed = df_previous["available"].ne(True)
+        for column in HISTORY_PRICE_COLUMNS.values():
+            is_changed |= (
+                df_new[column]
+                .astype("float64")
+                .fillna(-1)
+                .ne(df_previous[column].astype("float64").fillna(-1))
+            )
+        df_changed = df_new[is_changed]
+
+        # Los productos que estaban disponibles y no aparecen en la foto se marcan como no disponibles
+        is_removed = df_last["available"].astype(bool) & ~df_last.index.isin(df_new.index)
+        # En una foto parcial la ausencia de un producto no indica que dejó de estar disponible
+        df_removed = df_last[is_removed & (not partial)].copy()
+        df_removed["date"] = snapshot_date
+        df_removed["available"] = False
+        for column in HISTORY_PRICE_COLUMNS.values():
+            df_removed[column] = None
+
+        df_delta = concat([df_changed, df_removed])
+        LOGGER.info(
+            f"Foto del {snapshot_date.strftime('%d/%m/%Y')}: {df_new.shape[0]} productos, {df_changed.shape[0]} nuevos o con cambios, {df_removed.shape[0]} no disponibles"
+        )
+        # Primero el delta y luego el estado vigente: si se interrumpe, repetir la carga reemplaza el mismo delta
+        if df_delta.shape[0] > 0:
+            self.write(
+                df_delta.reset_index(),
+                HISTORY_DELTA_PREFIX + snapshot_date.strftime("%Y%m%d") + ".parquet",
+            )
+        df_latest = concat([df_last[~df_last.index.isin(df_delta.index)], df_delta])
+        self.write(df_latest.reset_index(), HISTORY_LATEST_FILENAME, snapshot_date)
+
+        if len(self.get_files()) > HISTORY_COMPACT_EVERY:
+            self.compact()
+        return df_delta.shape[0]
+
+    def write(self, df_history, filename, last_date=None):
+        """Guarda filas del historial ordenadas por producto y fecha en un archivo de la carpeta, reemplazando el anterior de forma atómica
+
+        Args:
+            df_history (pandas.core.frame.DataFrame): Filas con las columnas HISTORY_COLUMNS
+            filename (str): Nombre del archivo dentro de la carpeta del historial
+            last_date (datetime.date, optional): Fecha de la última foto diaria agregada, se guarda en los metadatos. Defaults to None.
+        """
+        df_history = df_history[HISTORY_COLUMNS].astype(
+            {
+                "product_id": str,
+                "category": str,
+                "available": bool,
+                **{column: "Int64" for column in HISTORY_PRICE_COLUMNS.values()},
+            }
+        )
+        df_history = df_history.sort_values(
+            ["product_id", "date"], kind="stable", ignore_index=True
+        )
+        table = Table.from_pandas(df_history, schema=self._schema, preserve_index=False)
+        if last_date is not None:
+            table = table.replace_schema_metadata(
+                {HISTORY_DATE_KEY: last_date.isoformat()}
+            )
+        makedirs(self._folder, exist_ok=True)
+        filename = path.join(self._folder, filename)
+        temp_filename = filename + ".part"
+        write_table(
+            table,
+            temp_filename,
+            row_group_size=HISTORY_ROW_GROUP_SIZE,
+            compression="zstd",
+            write_statistics=True,
+        )
+        replace(temp_filename, filename)
+        LOGGER.info(f"El archivo {filename} ha sido guardado con {table.num_rows} filas")
+
+    def compact(self):
+        """Une los deltas al archivo base, ordenado por producto y fecha, y elimina los deltas unidos"""
+        filenames = self.get_files()
+        delta_filenames = [
+            filename
+            for filename in filenames
+            if path.basename(filename).startswith(HISTORY_DELTA_PREFIX)
+        ]
+        if not delta_filenames:
+            return
+        self.write(self.load(), HISTORY_BASE_FILENAME)
+        for filename in delta_filenames:
+            remove(filename)
+        LOGGER.info(f"Se han unido {len(delta_filenames)} deltas al historial base")
+
+    def series(self, product_id, start_date=None, end_date=None):
+        """Retorna la serie de precios de un producto, con una fila por cada cambio
+
+        Args:
+            product_id (str): Id del producto
+            start_date (datetime.date, optional): Fecha inicial, se incluye el estado vigente en esa fecha. Defaults to None.
+            end_date (datetime.date, optional): Fecha final. Defaults to None.
+
+        Returns:
+            pandas.core.frame.DataFrame: Cambios del producto ordenados por fecha
+        """
+        condition = field("product_id") == str(product_id)
+        if end_date is not None:
+            condition &= field("date") <= end_date
+        df_series = self.scan(condition).sort_values("date", ignore_index=True)
+        if start_date is not None:
+            # El estado vigente al inicio es el último cambio anterior a la fecha inicial
+            is_before = df_series["date"] < start_date
+            first = max(int(is_before.sum()) - 1, 0)
+            df_series = df_series.iloc[first:].reset_index(drop=True)
+        return df_series
+
+    def price_drops(
+        self,
+        start_date,
+        end_date,
+        category=None,
+        min_drop=HISTORY_DROP,
+        price="discount",
+    ):
+        """Busca las bajadas de precio de un rango de fechas, opcionalmente solo de una categoría
+
+        Args:
+            start_date (datetime.date): Fecha inicial
+            end_date (datetime.date): Fecha final
+            category (str, optional): Link de la categoría. Defaults to None (todas).
+            min_drop (float, optional): Bajada mínima respecto al precio anterior, por ejemplo 0.2 es 20%. Defaults to HISTORY_DROP.
+            price (str, optional): Precio comparado ("regular", "discount" o "card"). El precio con descuento usa el precio regular si el producto no tiene descuento. Defaults to "discount".
+
+        Returns:
+            pandas.core.frame.DataFrame: Bajadas de precio con el precio anterior, el nuevo y la variación
+        """
+        condition = field("date") <= end_date
+        if category is not None:
+            condition &= field("category") == category
+        df_scan = self.scan(condition)
+        # Solo interesan los productos que cambiaron dentro del rango
+        changed_ids = df_scan.loc[df_scan["date"] >= start_date, "product_id"].unique()
+        df_scan = df_scan[df_scan["product_id"].isin(changed_ids)].sort_values(
+            ["product_id", "date"], kind="stable", ignore_index=True
+        )
+
+        df_scan["price"] = df_scan[price]
+        if price == "discount":
+            df_scan["price"] = df_scan["price"].fillna(df_scan["regular"])
+        # El precio anterior es el último conocido, sin contar los días en que no estuvo disponible
+        prices = df_scan.groupby("product_id", observed=True)["price"].ffill()
+        df_scan["previous_price"] = prices.groupby(
+            df_scan["product_id"], observed=True
+        ).shift()
+        df_drops = df_scan[
+            (df_scan["date"] >= start_date)
+            & df_scan["previous_price"].notna()
+            & (df_scan["price"] <= df_scan["previous_price"] * (1 - min_drop))
+        ].copy()
+        df_drops["change"] = (
+            df_drops["price"] / df_drops["previous_price"] - 1
+        ).astype(float).round(4)
+        df_drops = df_drops.astype({"previous_price": "Int64", "price": "Int64"})
+        return df_drops[
+            ["product_id", "date", "category", "name", "previous_price", "price", "change"]
+        ].reset_index(drop=True)
+
+
+def snapshot_to_history(df_snapshot, snapshot_date):
+    """Convierte una foto diaria de los productos en filas del historial, con los precios en céntimos
+
+    Args:
+        df_snapshot (pandas.core.frame.DataFrame): Productos con las columnas de PRODUCT_COLUMNS
+        snapshot_date (datetime.date): Fecha de la foto diaria
+
+    Returns:
+        pandas.core.frame.DataFrame: Filas con las columnas HISTORY_COLUMNS, una por producto
+    """
+    df_snapshot = df_snapshot[df_snapshot[PRODUCT_COLUMNS[8]].notna()]
+    df_new = DataFrame(
+        {
+            "product_id": df_snapshot[PRODUCT_COLUMNS[8]].astype(str).values,
+            "date": snapshot_date,
+            "category": df_snapshot[PRODUCT_COLUMNS[0]].values,
+            "name": df_snapshot[PRODUCT_COLUMNS[1]].values,
+            "available": True,
+        }
+    )
+    for column, history_column in HISTORY_PRICE_COLUMNS.items():
+        df_new[history_column] = price_to_cents(df_snapshot[column].values)
+    # Un producto listado en varias categorías se asigna siempre a la de menor link, sin depender del orden de extracción
+    df_new = df_new.sort_values(["product_id", "category"], kind="stable")
+    return df_new.drop_duplicates("product_id", keep="first").reset_index(drop=True)
+
+
+def read_product_snapshot(filename):
+    """Lee un archivo de productos generado por Falabella_Products_Extraction.py en cualquiera de sus formatos
+
+    Args:
+        filename (str): Nombre del archivo (.csv, .jsonl o .parquet)
+
+    Returns:
+        pandas.core.frame.DataFrame: Productos con las columnas de PRODUCT_COLUMNS
+    """
+    if filename.endswith(".parquet"):
+        return read_parquet(filename, columns=PRODUCT_COLUMNS)
+    if filename.endswith(".jsonl"):
+        return read_json(filename, lines=True, dtype=False)[PRODUCT_COLUMNS]
+    return read_csv(
+        filename,
+        sep=";",
+        encoding="utf-8-sig",
+        dtype=str,
+        usecols=PRODUCT_COLUMNS,
+    )
+
+
+def get_snapshot_date(filename):
+    """Obtiene la fecha de una foto diaria a partir del nombre de su archivo (por ejemplo falabella_product_31122023_1500.csv)
+
+    Args:
+        filename (str): Nombre del archivo
+
+    Returns:
+        datetime.date or None: Fecha de la foto o None si el nombre no la contiene
+    """
+    date_text = extract_text(r"_(\d{8})_\d+\.\w+$", filename)
+    if date_text is None:
+        return None
+    return datetime.strptime(date_text, "%d%m%Y").date()
+
+
+def parse_date(text):
+    """Convierte una fecha en formato %d-%m-%Y usada en la línea de comandos
+
+    Args:
+        text (str): Fecha
+
+    Returns:
+        datetime.date: Fecha
+    """
+    return datetime.strptime(text, "%d-%m-%Y").date()
+
+
+def parse_arguments():
+    """Función que lee los argumentos de la línea de comandos
+
+    Returns:
+        argparse.Namespace: Argumentos del programa
+    """
+    parser = ArgumentParser(
+        description="Guarda y consulta el historial de precios de los productos de saga falabella"
+    )
+    parser.add_argument(
+        "--history",
+        default=path.join(DATA_FOLDER, HISTORY_FOLDER),
+        help="Carpeta del historial de precios",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_ingest = subparsers.add_parser(
+        "ingest", help="Agregar fotos diarias de los productos al historial"
+    )
+    parser_ingest.add_argument(
+        "files",
+        nargs="*",
+        help="Archivos de productos, por defecto el más reciente de la carpeta de datos",
+    )
+    parser_ingest.add_argument(
+        "--partial",
+        action="store_true",
+        help=f"Los archivos solo tienen los productos que cambiaron (por defecto solo los archivos {PRODUCT_CHANGES_FILENAME}_*)",
+    )
+    parser_ingest.add_argument(
+        "--date",
+        type=parse_date,
+        help="Fecha de la foto (dd-mm-YYYY) si el nombre del archivo no la contiene",
+    )
+
+    subparsers.add_parser(
+        "compact", help="Unir los deltas diarios al archivo base del historial"
+    )
+
+    parser_series = subparsers.add_parser(
+        "series", help="Mostrar la serie de precios de un producto"
+    )
+    parser_series.add_argument("product_id", help="Id del producto")
+    parser_series.add_argument("--start", type=parse_date, help="Fecha inicial (dd-mm-YYYY)")
+    parser_series.add_argument("--end", type=parse_date, help="Fecha final (dd-mm-YYYY)")
+
+    parser_drops = subparsers.add_parser(
+        "drops", help="Mostrar las bajadas de precio de un rango de fechas"
+    )
+    parser_drops.add_argument("--category", help="Link de la categoría")
+    parser_drops.add_argument(
+        "--end",
+        type=parse_date,
+        default=CURRENT_DATE,
+        help="Fecha final (dd-mm-YYYY), por defecto hoy",
+    )
+    parser_drops.add_argument(
+        "--days",
+        type=int,
+        default=HISTORY_DAYS,
+        help="Cantidad de días del rango que termina en la fecha final",
+    )
+    parser_drops.add_argument(
+        "--min-drop",
+        type=float,
+        default=HISTORY_DROP,
+        help="Bajada mínima respecto al precio anterior (0.2 es 20%%)",
+    )
+    parser_drops.add_argument(
+        "--price",
+        choices=list(HISTORY_PRICE_COLUMNS.values()),
+        default="discount",
+        help="Precio comparado",
+    )
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    try:
+        # Las consultas escriben su resultado en la consola, solo la carga usa el log
+        if arguments.command in ["ingest", "compact"]:
+            config_log("Log", "fb_price_history_log")
+        if write_table is None:
+            LOGGER.error(
+                "No se puede usar el historial de precios. Razón: La librería pyarrow no está instalada"
+            )
+            return
+        history = PriceHistory(arguments.history)
+
+        if arguments.command == "ingest":
+            filenames = arguments.files or [
+                find_previous_data(
+                    DATA_FOLDER, PRODUCT_FILENAME, HISTORY_SNAPSHOT_EXTENSIONS
+                )
+            ]
+            if None in filenames:
+                LOGGER.error("No existe ningún archivo de productos")
+                return
+            snapshots = []
+            for filename in filenames:
+                snapshot_date = get_snapshot_date(filename) or arguments.date
+                if snapshot_date is None:
+                    LOGGER.error(
+                        f"No se pudo obtener la fecha de {filename}. Indíquela con --date"
+                    )
+                    return
+                snapshots.append((snapshot_date, filename))
+            # Los cambios se calculan respecto al día anterior, las fotos se agregan en orden
+            for snapshot_date, filename in sorted(snapshots):
+                LOGGER.info(f"Agregando {filename} al historial de precios")
+                partial = arguments.partial or path.basename(filename).startswith(
+                    PRODUCT_CHANGES_FILENAME
+                )
+                history.ingest(read_product_snapshot(filename), snapshot_date, partial)
+
+        elif arguments.command == "compact":
+            history.compact()
+
+        elif arguments.command == "series":
+            history.series(arguments.product_id, arguments.start, arguments.end).to_csv(
+                stdout, sep=";", index=False
+            )
+
+        else:
+            start_date = arguments.end - timedelta(days=arguments.days - 1)
+            history.price_drops(
+                start_date,
+                arguments.end,
+                arguments.category,
+                arguments.min_drop,
+                arguments.price,
+            ).to_csv(stdout, sep=";", index=False)
+
+    except Exception as error:
+        Error(error).imprimir_error()
+        LOGGER.error("Programa ejecutado con fallos")
+    finally:
+        # Liberar el archivo log
+        shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1234 @@
+# Librerías a importar
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from hashlib import blake2b
+from json import JSONDecodeError, loads
+from logging import shutdown
+from math import ceil
+from os import cpu_count, path
+from re import sub
+from sqlite3 import connect
+from time import sleep, time
+from uuid import uuid4
+
+from numpy import nan, where
+from pandas import DataFrame, factorize, read_csv, Series, to_numeric
+from requests import RequestException
+
+from Falabella_Category_Extraction import (
+    API_MAX_RATE,
+    API_RATE,
+    API_TIMEOUT,
+    build_api_url,
+    build_scheduler,
+    CategoryTree,
+    config_log,
+    configure_executors,
+    CPU_PROCESSES,
+    CURRENT_DATE,
+    DATA_FILENAME,
+    DATA_FOLDER,
+    Error,
+    executor_settings,
+    EXECUTORS,
+    extract_next_data,
+    fast_loads,
+    find_previous_data,
+    IdRegistry,
+    is_json_body,
+    JsonlSink,
+    LOGGER,
+    MAX_WORKERS,
+    Metadata,
+    METRICS_FOLDER,
+    NETWORK_WORKERS,
+    open_sink,
+    QUEUE_FILENAME,
+    ROOT_PATH,
+    run_workers,
+    SessionApi,
+    SHARD_FOLDER,
+    SINK_BUFFER_SIZE,
+    SINK_FORMATS,
+    URL_FALABELLA,
+    WebDriver,
+    WorkQueue,
+)
+
+try:
+    # Librería opcional para realizar peticiones usando HTTP/2
+    from httpx import HTTPError as HttpxError
+except ImportError:
+    HttpxError = RequestException
+
+# Constantes usadas en el script
+PRODUCT_FILENAME = "falabella_product"
+PRODUCT_CHANGES_FILENAME = "falabella_changed_product"
+PRODUCT_METRICS_FILENAME = "fb_product_metrics"
+PRODUCT_COLUMNS = [
+    "Link",
+    "Nombre",
+    "Vendedor",
+    "Precio Regular",
+    "Precio Descuento",
+    "Precio Descuento Tarjeta",
+    "Marca",
+    "Shipping Details",
+    "Id Producto",
+]
+PRODUCT_SELLER_FILTER = "facetSelected=true&f.derived.variant.sellerId=FALABELLA"
+PRODUCT_ENGINE = "http"
+PRODUCT_MAX_PAGES = 500
+PRODUCT_PAGE_SIZE = 48
+PRODUCT_CONCURRENCY = MAX_WORKERS * 2
+PRODUCT_FORMAT = "csv"
+PRODUCT_SHIPPING_KEYS = ["homeDeliveryShipping", "pickUpFromStoreShipping"]
+PRODUCT_PRICE_COLUMNS = {
+    "Precio Regular": "Precio Regular Centimos",
+    "Precio Descuento": "Precio Descuento Centimos",
+    "Precio Descuento Tarjeta": "Precio Descuento Tarjeta Centimos",
+}
+PRODUCT_DISCOUNT_COLUMNS = {
+    "Precio Descuento Centimos": "Porcentaje Descuento",
+    "Precio Descuento Tarjeta Centimos": "Porcentaje Descuento Tarjeta",
+}
+PRODUCT_SHIPPING_PATTERNS = {
+    "Despacho a Domicilio": r"(?i)domicilio",
+    "Retiro en Tienda": r"(?i)tienda",
+}
+PRODUCT_CURRENCIES = {"S/": "PEN", "US$": "USD", "$": "USD"}
+PRODUCT_DEFAULT_CURRENCY = "PEN"
+FINGERPRINT_FILENAME = "page_fingerprints.sqlite"
+FINGERPRINT_MAX_AGE = 7 * 24 * 60 * 60
+NEXT_DATA_SCRIPT = (
+    "var data = document.getElementById('__NEXT_DATA__');"
+    "return data ? data.textContent : null;"
+)
+
+
+class PageFingerprints:
+    """Representa las huellas del contenido (ids y precios de los productos) de cada página de productos, guardadas en SQLite para detectar las páginas que no cambiaron desde la ejecución anterior
+
+    Attributes:
+        filename (str): Nombre del archivo de las huellas
+        max_age (int): Tiempo en segundos tras el cual una categoría se vuelve a recorrer completa aunque su primera página no haya cambiado
+        matched (int): Cantidad de páginas cuya huella coincidió con la guardada
+        changed (int): Cantidad de páginas nuevas o cuya huella cambió
+    """
+
+    def __init__(self, filename=FINGERPRINT_FILENAME, max_age=FINGERPRINT_MAX_AGE):
+        """Genera todos los atributos para una instancia de la clase PageFingerprints
+
+        Args:
+            filename (str, optional): Nombre del archivo de las huellas. Defaults to FINGERPRINT_FILENAME.
+            max_age (int, optional): Tiempo máximo en segundos sin recorrer completa una categoría. Defaults to FINGERPRINT_MAX_AGE.
+        """
+        self._filename = filename
+        self._max_age = max_age
+        self._matched = 0
+        self._changed = 0
+        self._connection = connect(filename, timeout=60, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                category TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                PRIMARY KEY (category, page)
+            )"""
+        )
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS categories (
+                category TEXT PRIMARY KEY,
+                count INTEGER,
+                verified_at REAL NOT NULL
+            )"""
+        )
+        # Las huellas se leen una sola vez y los cambios se guardan juntos en save
+        self._pages = {
+            (category, page): fingerprint
+            for category, page, fingerprint in self._connection.execute(
+                "SELECT category, page, fingerprint FROM pages"
+            )
+        }
+        self._categories = {
+            category: (count, verified_at)
+            for category, count, verified_at in self._connection.execute(
+                "SELECT category, count, verified_at FROM categories"
+            )
+        }
+        self._new_pages = {}
+        self._new_categories = {}
+
+    @property
+    def filename(self):
+        """Retorna el valor actual del atributo filename"""
+        return self._filename
+
+    @property
+    def matched(self):
+        """Retorna el valor actual del atributo matched"""
+        return self._matched
+
+    @property
+    def changed(self):
+        """Retorna el valor actual del atributo changed"""
+        return self._changed
+
+    def match(self, id_cat, page, fingerprint):
+        """Compara la huella de una página con la guardada y registra la nueva huella si cambió
+
+        Args:
+            id_cat (str): Id de la categoría
+            page (int): Número de página
+            fingerprint (str): Huella del contenido de la página
+
+        Returns:
+            bool: Booleano que indica si la página no cambió
+        """
+        key = (id_cat, page)
+        if self._pages.get(key) == fingerprint:
+            self._matched += 1
+            return True
+        self._pages[key] = fingerprint
+        self._new_pages[key] = fingerprint
+        self._changed += 1
+        return False
+
+    def is_verified(self, id_cat, count):
+        """Indica si la categoría se recorrió completa hace poco con la misma cantidad de productos
+
+        Args:
+            id_cat (str): Id de la categoría
+            count (int): Cantidad de productos informada por la api
+
+        Returns:
+            bool: Booleano que indica si se puede omitir el resto de páginas de la categoría
+        """
+        if id_cat not in self._categories:
+            return False
+        stored_count, verified_at = self._categories[id_cat]
+        return stored_count == count and time() - verified_at < self._max_age
+
+    def mark_verified(self, id_cat, count):
+        """Registra que todas las páginas de la categoría se recorrieron en esta ejecución
+
+        Args:
+            id_cat (str): Id de la categoría
+            count (int): Cantidad de productos informada por la api
+        """
+        self._categories[id_cat] = self._new_categories[id_cat] = (count, time())
+
+    def save(self):
+        """Guarda en el disco las huellas registradas desde el último guardado en una sola transacción"""
+        if not self._new_pages and not self._new_categories:
+            return
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                [(*key, fingerprint) for key, fingerprint in self._new_pages.items()],
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO categories VALUES (?, ?, ?)",
+                [(key, *value) for key, value in self._new_categories.items()],
+            )
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+        self._new_pages = {}
+        self._new_categories = {}
+
+    def close(self):
+        """Cierra la conexión al archivo de las huellas sin guardar los cambios pendientes"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class ScraperFalabellaProduct:
+    """Representa a un bot para extraer los productos de saga falabella leyendo el JSON __NEXT_DATA__ de cada página de productos
+
+    Attributes:
+        metadata (Metadata): Objeto de la clase Metadata que maneja información generada durante la ejecución del scraper
+        df_product (pandas.core.frame.DataFrame): Objeto de la clase DataFrame que maneja información de los productos extraídos por el scraper
+        engine (str): Motor usado para obtener las páginas ("http" o "browser")
+        lean (bool): Indica si el navegador web usa el perfil ligero
+        driver (WebDriver): Objeto de la clase WebDriver, solo se inicializa cuando se necesita
+        session (SessionApi): Objeto de la clase SessionApi que reutiliza las conexiones hechas a saga falabella
+        scheduler (ApiScheduler): Objeto de la clase ApiScheduler que limita la tasa y la concurrencia de las peticiones a la api
+        product_ids (IdRegistry): Registro de ids de los productos extraídos, usado para no repetir productos de categorías que se solapan
+    """
+
+    def __init__(self, engine=PRODUCT_ENGINE, lean=True, scheduler=None):
+        """Genera todos los atributos para una instancia de la clase ScraperFalabellaProduct
+
+        Args:
+            engine (str, optional): Motor usado para obtener las páginas ("http" o "browser"). Con "http" solo se usa el navegador web si la página no contiene el JSON. Defaults to PRODUCT_ENGINE.
+            lean (bool, optional): Usar el perfil ligero del navegador web. Defaults to True.
+            scheduler (ApiScheduler, optional): Planificador de las peticiones a la api, si no se indica se usan los límites por defecto. Defaults to None.
+        """
+        self._metadata = Metadata()
+        self._df_product = DataFrame(columns=PRODUCT_COLUMNS)
+        self._engine = engine
+        self._lean = lean
+        self._driver = None
+        self._session = SessionApi()
+        self._scheduler = build_scheduler(engine) if scheduler is None else scheduler
+        self._product_ids = IdRegistry()
+
+    @property
+    def df_product(self):
+        return self._df_product
+
+    @property
+    def metadata(self):
+        """Retorna el valor actual del atributo metadata"""
+        return self._metadata
+
+    def start_driver(self):
+        """Inicializa el navegador web si aún no ha sido inicializado"""
+        if self._driver is None:
+            LOGGER.info("Inicializando navegador web")
+            self._driver = WebDriver(lean=self._lean)
+
+    def quit_driver(self):
+        """Cierra el navegador web si fue inicializado"""
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+    def close(self):
+        """Cierra el navegador web y la sesión"""
+        self.quit_driver()
+        self._session.close()
+
+    def save_metrics(self, folder, filename):
+        """Guarda las métricas por etapa del scraper junto a los logs de la ejecución
+
+        Args:
+            folder (str): Carpeta donde se guardan las métricas
+            filename (str): Nombre base de los archivos de métricas
+        """
+        self._metadata.save_metrics(
+            path.join(folder, CURRENT_DATE.strftime("%d-%m-%Y")),
+            filename + "_" + CURRENT_DATE.strftime("%d%m%Y"),
+        )
+
+    def get_page_data_http(self, url):
+        """Obtiene el JSON __NEXT_DATA__ de una página sin usar el navegador web
+
+        Args:
+            url (str): Link de la página
+
+        Returns:
+            dict or None: Contenido del JSON o None si no se pudo obtener
+        """
+        try:
+            return extract_next_data(self._session.get(url).text)
+        except (RequestException, HttpxError, JSONDecodeError) as error:
+            LOGGER.warning(f"No se pudo leer la página {url}: {error}")
+        return None
+
+    def get_page_data_browser(self, url):
+        """Obtiene el JSON __NEXT_DATA__ de una página usando el navegador web en una sola llamada
+
+        Args:
+            url (str): Link de la página
+
+        Returns:
+            dict or None: Contenido del JSON o None si no se pudo obtener
+        """
+        self.start_driver()
+        self._driver.get(url)
+        text = self._driver.execute_script(NEXT_DATA_SCRIPT)
+        try:
+            return loads(text) if text else None
+        except JSONDecodeError as error:
+            LOGGER.warning(f"No se pudo leer la página {url}: {error}")
+        return None
+
+    def get_page_data(self, url):
+        """Obtiene el JSON __NEXT_DATA__ de una página usando el motor indicado, recurriendo al navegador web si la petición HTTP falla
+
+        Args:
+            url (str): Link de la página
+
+        Returns:
+            dict or None: Contenido del JSON o None si no se pudo obtener
+        """
+        data = None
+        if self._engine == "http":
+            data = self.get_page_data_http(url)
+        if data is None:
+            data = self.get_page_data_browser(url)
+        return data
+
+    def iter_link_products(self, link, max_pages=PRODUCT_MAX_PAGES):
+        """Recorre todas las páginas de una categoría generando los productos de cada página
+
+        Args:
+            link (str): Link de la categoría
+            max_pages (int, optional): Cantidad máxima de páginas a recorrer. Defaults to PRODUCT_MAX_PAGES.
+
+        Yields:
+            list: Lista de productos de una página
+        """
+        page, num_pages, quantity = 1, max_pages, 0
+        while page <= num_pages:
+            data = self.get_page_data(build_product_url(link, page))
+            results, pagination = extract_product_results(data)
+            if not results:
+                break
+            quantity += len(results)
+            yield parse_products(results, link)
+            num_pages = min(max_pages, get_page_count(pagination) or max_pages)
+            page += 1
+        LOGGER.info(f"Se han extraído {quantity} productos de {page - 1} páginas de {link}")
+
+    def extract_products(self, links, sink=None, max_pages=PRODUCT_MAX_PAGES):
+        """Extrae los productos de una lista de categorías de saga falabella, enviándolos al destino de datos página por página
+
+        Args:
+            links (list): Lista de links de las categorías
+            sink (DataSink, optional): Destino de datos donde se escriben los productos, si no se indica se guardan en el atributo df_product. Defaults to None.
+            max_pages (int, optional): Cantidad máxima de páginas a recorrer por categoría. Defaults to PRODUCT_MAX_PAGES.
+        """
+        LOGGER.info(f"Extrayendo los productos de {len(links)} categorías")
+        rows = []
+        quantity = 0
+        for link in links:
+            try:
+                for page_rows in self.iter_link_products(link, max_pages):
+                    quantity += len(page_rows)
+                    if sink is None:
+                        rows += page_rows
+                    else:
+                        sink.write(page_rows)
+            except Exception as error:
+                self._metadata.add_error()
+                LOGGER.error(f"No se pudo extraer los productos de {link}: {error}")
+        self.quit_driver()
+        if sink is None:
+            self._df_product = DataFrame(rows, columns=PRODUCT_COLUMNS)
+        self._metadata.quantity = quantity
+        LOGGER.info(
+            f"Extracción de {quantity} productos completada satisfactoriamente"
+        )
+
+    def request_listing(self, url):
+        """Realiza una petición a la api de productos respetando el límite de peticiones del planificador y reintentando con espera exponencial si falla
+
+        Args:
+            url (str): Enlace de la api
+
+        Returns:
+            dict or None: Respuesta de la api en formato json o None si se agotaron los reintentos
+        """
+        stage = self._metadata.stage("product_api")
+        retry_after = None
+        for attempt in range(self._scheduler.retries + 1):
+            if attempt > 0:
+                stage.add("retries")
+                sleep(self._scheduler.backoff(attempt - 1, retry_after))
+            self._scheduler.acquire()
+            start = time()
+            status_code = None
+            try:
+                response = self._session.get(url, timeout=API_TIMEOUT)
+                status_code = response.status_code
+                retry_after = response.headers.get("Retry-After")
+            except (RequestException, HttpxError) as error:
+                LOGGER.warning(f"Falló la petición a la api: {error}")
+            finally:
+                latency = time() - start
+                self._scheduler.release(status_code, latency)
+                stage.record_request(
+                    latency, len(response.content) if status_code is not None else 0
+                )
+
+            if status_code == 200 and is_json_body(response.content):
+                try:
+                    return fast_loads(response.content)
+                except ValueError:
+                    stage.add("errors")
+                    return None
+            if not self._scheduler.is_retryable(status_code):
+                break
+        stage.add("errors")
+        return None
+
+    def fetch_listing_page(self, category, page):
+        """Obtiene una página de productos de una categoría usando la api
+
+        Args:
+            category (tuple): Id, nombre y path de la categoría
+            page (int): Número de página
+
+        Returns:
+            tuple: Lista de productos y diccionario de paginación
+        """
+        data = self.request_listing(build_listing_url(*category, page))
+        if data is None:
+            self._metadata.add_error()
+            LOGGER.warning(
+                f"No se pudo obtener la página {page} de la categoría {category[1]}"
+            )
+        return extract_product_results(data)
+
+    def register_products(self, results, link):
+        """Convierte en filas los productos que aún no han sido extraídos
+
+        Args:
+            results (list): Lista de productos del JSON
+            link (str): Link de la categoría donde se encontraron los productos
+
+        Returns:
+            list: Lista de filas de los productos nuevos
+        """
+        results = [
+            result
+            for result in results
+            if result.get("productId") is None
+            or self._product_ids.add(result["productId"])
+        ]
+        return EXECUTORS["cpu"].call(parse_products, results, link)
+
+    def crawl_tree(
+        self, tree, sink, max_pages=PRODUCT_MAX_PAGES, fingerprints=None, incremental=False
+    ):
+        """Extrae los productos de todas las categorías hoja del árbol de categorías
+
+        Args:
+            tree (CategoryTree): Árbol de categorías generado por extract_categories
+            sink (DataSink): Destino de datos donde se escriben los productos
+            max_pages (int, optional): Cantidad máxima de páginas a recorrer por categoría. Defaults to PRODUCT_MAX_PAGES.
+            fingerprints (PageFingerprints, optional): Huellas de las páginas de la ejecución anterior. Defaults to None.
+            incremental (bool, optional): Omitir las páginas que no cambiaron. Defaults to False.
+        """
+        self.crawl_leaves(
+            get_leaf_categories(tree), sink, max_pages, fingerprints, incremental
+        )
+
+    def crawl_leaves(
+        self,
+        leaves,
+        sink,
+        max_pages=PRODUCT_MAX_PAGES,
+        fingerprints=None,
+        incremental=False,
+    ):
+        """Extrae los productos de una lista de categorías, pidiendo todas sus páginas a la api de forma concurrente y enviando los productos al destino de datos a medida que llegan
+
+        Si se indican las huellas de las páginas, se registra la huella de cada página obtenida. En modo incremental las páginas
+        cuya huella no cambió no se convierten ni se escriben, y si la primera página de una categoría no cambió, la cantidad de
+        productos es la misma y la categoría se recorrió completa hace menos de FINGERPRINT_MAX_AGE, no se piden sus demás páginas
+
+        Args:
+            leaves (list): Lista de id, nombre y path de las categorías
+            sink (DataSink): Destino de datos donde se escriben los productos
+            max_pages (int, optional): Cantidad máxima de páginas a recorrer por categoría. Defaults to PRODUCT_MAX_PAGES.
+            fingerprints (PageFingerprints, optional): Huellas de las páginas de la ejecución anterior. Defaults to None.
+            incremental (bool, optional): Omitir las páginas que no cambiaron. Defaults to False.
+        """
+        LOGGER.info(f"Extrayendo los productos de {len(leaves)} categorías hoja")
+        stage = self._metadata.stage("product_fingerprints")
+
+        # La primera página de cada categoría indica cuántas páginas faltan pedir
+        queue = deque((tuple(category), 1) for category in leaves)
+        pending = {}
+        # Páginas que faltan obtener y cantidad de productos de cada categoría recorrida completa
+        progress = {}
+        while queue or pending:
+            while queue and len(pending) < PRODUCT_CONCURRENCY:
+                category, page = queue.popleft()
+                future = EXECUTORS["network"].submit(
+                    self.fetch_listing_page, category, page
+                )
+                pending[future] = (category, page)
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                category, page = pending.pop(future)
+                try:
+                    results, pagination = future.result()
+                    unchanged = (
+                        fingerprints is not None
+                        and bool(results)
+                        and fingerprints.match(category[0], page, fingerprint_page(results))
+                    )
+                    if page == 1 and results:
+                        num_pages = min(max_pages, get_page_count(pagination) or 1)
+                        count = pagination.get("count")
+                        if (
+                            incremental
+                            and unchanged
+                            and fingerprints.is_verified(category[0], count)
+                        ):
+                            stage.add("categories_skipped")
+                        else:
+                            queue.extend(
+                                (category, next_page)
+                                for next_page in range(2, num_pages + 1)
+                            )
+                            if fingerprints is not None:
+                                progress[category] = [num_pages, count]
+                    if category in progress:
+                        if not results:
+                            # Una página fallida impide dar por recorrida la categoría
+                            progress.pop(category)
+                        else:
+                            progress[category][0] -= 1
+                            if progress[category][0] == 0:
+                                fingerprints.mark_verified(
+                                    category[0], progress.pop(category)[1]
+                                )
+
+                    if fingerprints is not None and results:
+                        stage.add("pages_unchanged" if unchanged else "pages_changed")
+                    if incremental and unchanged:
+                        # Los productos se registran para no repetirlos en otras categorías
+                        for result in results:
+                            if result.get("productId") is not None:
+                                self._product_ids.add(result["productId"])
+                        continue
+                    rows = self.register_products(
+                        results, build_category_link(category[0], category[1])
+                    )
+                except Exception as error:
+                    # Una respuesta inesperada de una categoría no debe detener el recorrido de las demás
+                    self._metadata.add_error()
+                    progress.pop(category, None)
+                    LOGGER.error(
+                        f"No se pudo procesar la página {page} de la categoría {category[1]}: {error!r}"
+                    )
+                    continue
+                sink.write(rows)
+        self._metadata.quantity = sink.quantity
+        LOGGER.info(
+            f"Extracción de {sink.quantity} productos completada satisfactoriamente"
+        )
+
+
+def build_product_url(link, page=1):
+    """Genera el link de una página de productos vendidos por saga falabella
+
+    Args:
+        link (str): Link de la categoría
+        page (int, optional): Número de página. Defaults to 1.
+
+    Returns:
+        str: Link de la página
+    """
+    separator = "&" if "?" in link else "?"
+    url = link + separator + PRODUCT_SELLER_FILTER
+    return url if page == 1 else url + "&page=" + str(page)
+
+
+def build_listing_url(id_cat, name_cat, path_cat, page=1):
+    """Genera el enlace de la api para una página de productos vendidos por saga falabella
+
+    Args:
+        id_cat (str): Id de la categoría
+        name_cat (str): Nombre de la categoría
+        path_cat (str): Path de la categoría
+        page (int, optional): Número de página. Defaults to 1.
+
+    Returns:
+        str: Enlace de la api
+    """
+    return (
+        build_api_url(id_cat, name_cat, path_cat, page, PRODUCT_PAGE_SIZE)
+        + "&"
+        + PRODUCT_SELLER_FILTER
+    )
+
+
+def build_category_link(id_cat, name_cat):
+    """Genera el link de la página de una categoría de saga falabella
+
+    Args:
+        id_cat (str): Id de la categoría
+        name_cat (str): Nombre de la categoría
+
+    Returns:
+        str: Link de la categoría
+    """
+    return (
+        URL_FALABELLA + "/category/" + id_cat + "/" + sub(r"\s+", "-", name_cat.strip())
+    )
+
+
+def get_leaf_categories(tree):
+    """Retorna las categorías hoja del árbol de categorías
+
+    Args:
+        tree (CategoryTree): Árbol de categorías
+
+    Returns:
+        list: Lista de id, nombre y path de las categorías hoja
+    """
+    return [
+        (id_cat, name_cat, path_cat)
+        for _, _, id_cat, name_cat, path_cat in tree.leaves()
+    ]
+
+
+def load_category_tree(folder=DATA_FOLDER, filename=DATA_FILENAME):
+    """Carga el árbol de categorías más reciente generado por Falabella_Category_Extraction.py
+
+    Args:
+        folder (str, optional): Carpeta donde se guardan los archivos de datos. Defaults to DATA_FOLDER.
+        filename (str, optional): Nombre base de los archivos de categorías. Defaults to DATA_FILENAME.
+
+    Returns:
+        CategoryTree or None: Árbol de categorías o None si no existe ningún archivo
+    """
+    tree_filename = find_previous_data(folder, filename)
+    if tree_filename is None:
+        return None
+    LOGGER.info(f"Usando el árbol de categorías {tree_filename}")
+    return CategoryTree.from_frame(
+        read_csv(tree_filename, sep=";", encoding="utf-8-sig", dtype=str)
+    )
+
+
+def extract_product_results(data):
+    """Extrae la lista de productos y la paginación a partir del JSON __NEXT_DATA__ o de la respuesta de la api
+
+    Args:
+        data (dict): JSON __NEXT_DATA__ de una página de productos o respuesta de la api
+
+    Returns:
+        tuple: Lista de productos y diccionario de paginación
+    """
+    if not data:
+        return [], {}
+    if "props" in data:
+        data = data["props"].get("pageProps", {})
+    elif "data" in data:
+        data = data["data"]
+    return data.get("results") or [], data.get("pagination") or {}
+
+
+def get_page_count(pagination):
+    """Calcula la cantidad de páginas de una categoría a partir de su paginación
+
+    Args:
+        pagination (dict): Diccionario de paginación
+
+    Returns:
+        int or None: Cantidad de páginas o None si la paginación no tiene la información
+    """
+    try:
+        return ceil(int(pagination["count"]) / int(pagination["perPage"]))
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return None
+
+
+def fingerprint_page(results):
+    """Calcula la huella del contenido de una página de productos a partir de los ids y precios de sus productos, sin importar su orden
+
+    Args:
+        results (list): Lista de productos del JSON
+
+    Returns:
+        str: Huella de la página en hexadecimal
+    """
+    entries = sorted(
+        str(result.get("productId"))
+        + "\x1f"
+        + "|".join(
+            str(price.get("type")) + ":" + ",".join(price.get("price") or [])
+            for price in result.get("prices") or []
+        )
+        for result in results
+    )
+    return blake2b("\x1e".join(entries).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def price_to_cents(prices):
+    """Convierte una columna de precios con el formato de la página web (por ejemplo "S/ 1,299.90") en céntimos, sin recorrer fila por fila
+
+    Args:
+        prices (pandas.core.series.Series or list): Precios como texto, pueden ser nulos
+
+    Returns:
+        pandas.core.series.Series: Precios en céntimos (Int64), nulos si el texto no tiene un número
+    """
+    prices = Series(prices, dtype="string")
+    # Los precios se repiten mucho, solo se convierte cada texto distinto una vez
+    codes, uniques = factorize(prices)
+    # La coma separa los miles y el punto los decimales
+    amounts = to_numeric(
+        Series(uniques).str.replace(r"[^\d.]", "", regex=True), errors="coerce"
+    )
+    cents = (amounts * 100).round().astype("Int64").array
+    return Series(cents.take(codes, allow_fill=True), index=prices.index)
+
+
+def normalize_products(df_product):
+    """Normaliza por columnas completas los productos extraídos: precios en céntimos, moneda, porcentaje de descuento y tipos de despacho como booleanos
+
+    Args:
+        df_product (pandas.core.frame.DataFrame): Productos con las columnas de PRODUCT_COLUMNS
+
+    Returns:
+        pandas.core.frame.DataFrame: Copia de los productos con las columnas normalizadas agregadas
+    """
+    df_product = df_product.copy()
+    for column, cents_column in PRODUCT_PRICE_COLUMNS.items():
+        df_product[cents_column] = price_to_cents(df_product[column].values).values
+
+    # La moneda es el símbolo del primer precio con valor, los precios sin símbolo vienen del JSON
+    prices = Series(df_product["Precio Regular"].values, dtype="string")
+    for column in ["Precio Descuento", "Precio Descuento Tarjeta"]:
+        prices = prices.fillna(Series(df_product[column].values, dtype="string"))
+    codes, uniques = factorize(prices)
+    symbols = Series(uniques).str.extract(r"^\s*([^\d\s.,]+)", expand=False)
+    currencies = (
+        symbols.map(PRODUCT_CURRENCIES).fillna(symbols).fillna(PRODUCT_DEFAULT_CURRENCY)
+    )
+    # Las filas sin ningún precio (código -1) usan la moneda por defecto, aunque ninguna fila tenga precio
+    df_product["Moneda"] = currencies.array.take(
+        codes, allow_fill=True, fill_value=PRODUCT_DEFAULT_CURRENCY
+    )
+
+    # Porcentaje respecto al precio regular, nulo si falta alguno de los dos precios
+    regular = df_product["Precio Regular Centimos"].to_numpy(
+        dtype="float64", na_value=nan
+    )
+    regular = where(regular > 0, regular, nan)
+    for cents_column, discount_column in PRODUCT_DISCOUNT_COLUMNS.items():
+        price = df_product[cents_column].to_numpy(dtype="float64", na_value=nan)
+        df_product[discount_column] = ((1 - price / regular) * 100).round(1)
+
+    # Los tipos de despacho se guardan como lista (o su texto al leer un CSV)
+    shipping = df_product["Shipping Details"].astype(str)
+    for column, pattern in PRODUCT_SHIPPING_PATTERNS.items():
+        df_product[column] = shipping.str.contains(pattern, regex=True).values
+    return df_product
+
+
+def format_price(price):
+    """Da el formato mostrado en la página web (por ejemplo "S/ 1,299") a un precio del JSON
+
+    Args:
+        price (dict): Precio del JSON con las llaves symbol y price
+
+    Returns:
+        str or None: Precio con su símbolo o None si no tiene valor
+    """
+    values = price.get("price") or []
+    if not values:
+        return None
+    return (price.get("symbol") or "").strip() + " " + values[0]
+
+
+def parse_product(result, link):
+    """Convierte un producto del JSON en una fila con las columnas de PRODUCT_COLUMNS
+
+    Args:
+        result (dict): Producto del JSON
+        link (str): Link de la categoría donde se encontró el producto
+
+    Returns:
+        list: Fila del producto
+    """
+    prices = {}
+    for price in result.get("prices") or []:
+        price_type = price.get("type")
+        if price_type in ("internetPrice", "normalPrice"):
+            prices[price_type] = format_price(price)
+        else:
+            prices["cmrPrice"] = format_price(price)
+
+    # Si el producto no tiene precio tachado, el precio de internet es el precio regular
+    internet_price = prices.get("internetPrice")
+    normal_price = prices.get("normalPrice")
+    if not normal_price:
+        normal_price, internet_price = internet_price, None
+
+    availability = result.get("availability") or {}
+    return [
+        link,
+        result.get("displayName"),
+        result.get("sellerName"),
+        normal_price,
+        internet_price,
+        prices.get("cmrPrice"),
+        result.get("brand"),
+        [availability[key] for key in PRODUCT_SHIPPING_KEYS if availability.get(key)],
+        result.get("productId"),
+    ]
+
+
+def parse_products(results, link):
+    """Convierte los productos de una página en filas con las columnas de PRODUCT_COLUMNS
+
+    Args:
+        results (list): Lista de productos del JSON
+        link (str): Link de la categoría donde se encontraron los productos
+
+    Returns:
+        list: Lista de filas
+    """
+    return [parse_product(result, link) for result in results]
+
+
+def extract_products(
+    links, engine=PRODUCT_ENGINE, max_pages=PRODUCT_MAX_PAGES, normalize=False
+):
+    """Extrae los productos de una lista de categorías y retorna el DataFrame con las columnas de PRODUCT_COLUMNS
+
+    Args:
+        links (list): Lista de links de las categorías
+        engine (str, optional): Motor usado para obtener las páginas ("http" o "browser"). Defaults to PRODUCT_ENGINE.
+        max_pages (int, optional): Cantidad máxima de páginas a recorrer por categoría. Defaults to PRODUCT_MAX_PAGES.
+        normalize (bool, optional): Agregar las columnas normalizadas de normalize_products. Defaults to False.
+
+    Returns:
+        pandas.core.frame.DataFrame: Instancia de la clase DataFrame
+    """
+    scraper = ScraperFalabellaProduct(engine)
+    scraper.extract_products(links, max_pages=max_pages)
+    if normalize:
+        return normalize_products(scraper.df_product)
+    return scraper.df_product
+
+
+def shard_products(
+    tree,
+    queue,
+    num_shards=1,
+    max_pages=PRODUCT_MAX_PAGES,
+    fingerprints_filename=FINGERPRINT_FILENAME,
+    incremental=False,
+    rate=API_RATE,
+    max_rate=API_MAX_RATE,
+):
+    """Divide las categorías hoja en grupos y los agrega a la cola de trabajo para que cada proceso extraiga sus productos
+
+    Args:
+        tree (CategoryTree): Árbol de categorías
+        queue (WorkQueue): Cola de trabajo compartida
+        num_shards (int, optional): Cantidad de grupos. Defaults to 1.
+        max_pages (int, optional): Cantidad máxima de páginas a recorrer por categoría. Defaults to PRODUCT_MAX_PAGES.
+        fingerprints_filename (str, optional): Archivo de las huellas de las páginas. Defaults to FINGERPRINT_FILENAME.
+        incremental (bool, optional): Omitir las páginas que no cambiaron. Defaults to False.
+        rate (float, optional): Peticiones por segundo a la api al iniciar. Defaults to API_RATE.
+        max_rate (float, optional): Peticiones por segundo máximas a la api. Defaults to API_MAX_RATE.
+
+    Returns:
+        int: Cantidad de grupos agregados a la cola
+    """
+    leaves = get_leaf_categories(tree)
+    size = max(1, -(-len(leaves) // num_shards))
+    shards = [
+        {
+            "leaves": leaves[start : start + size],
+            "max_pages": max_pages,
+            "fingerprints": fingerprints_filename,
+            "incremental": incremental,
+            "rate": rate,
+            "max_rate": max_rate,
+            **executor_settings(),
+        }
+        for start in range(0, len(leaves), size)
+    ]
+    queue.clear("product")
+    queue.put_many("product", shards)
+    LOGGER.info(
+        f"Se han agregado {len(shards)} grupos con {len(leaves)} categorías hoja a la cola {queue.filename}"
+    )
+    return len(shards)
+
+
+def run_product_worker(queue_filename=QUEUE_FILENAME, worker="worker"):
+    """Reclama grupos de categorías hoja de la cola de trabajo hasta que no queden, guardando los productos de cada grupo en un archivo JSONL parcial
+
+    Args:
+        queue_filename (str, optional): Nombre del archivo de la cola. Defaults to QUEUE_FILENAME.
+        worker (str, optional): Nombre del proceso. Defaults to "worker".
+    """
+    config_log("Log", "fb_product_log_" + worker)
+    queue = WorkQueue(queue_filename)
+    scraper = None
+    fingerprints = None
+    try:
+        while True:
+            task_id, shard = queue.claim("product", worker)
+            if task_id is None:
+                break
+            # Los pools y el planificador se dimensionan con los valores indicados en el grupo
+            if scraper is None:
+                configure_executors(shard)
+                scraper = ScraperFalabellaProduct(
+                    scheduler=build_scheduler(
+                        PRODUCT_ENGINE,
+                        shard.get("rate", API_RATE),
+                        shard.get("max_rate", API_MAX_RATE),
+                    )
+                )
+            if fingerprints is None and shard.get("fingerprints"):
+                fingerprints = PageFingerprints(shard["fingerprints"])
+            try:
+                with JsonlSink(
+                    path.join(DATA_FOLDER, SHARD_FOLDER),
+                    PRODUCT_FILENAME + "_shard_" + str(task_id),
+                    PRODUCT_COLUMNS,
+                    with_quantity=False,
+                ) as sink:
+                    scraper.crawl_leaves(
+                        shard["leaves"],
+                        sink,
+                        shard["max_pages"],
+                        fingerprints,
+                        shard.get("incremental", False),
+                    )
+                queue.complete(task_id, sink.final_filename or "")
+                # Las huellas se guardan solo cuando los productos del grupo ya están en el disco
+                if fingerprints is not None:
+                    fingerprints.save()
+            except Exception as error:
+                Error(error).imprimir_error()
+                queue.fail(task_id)
+    finally:
+        if scraper is not None:
+            scraper.close()
+        queue.close()
+        if fingerprints is not None:
+            fingerprints.close()
+        EXECUTORS.log_stats()
+        EXECUTORS.shutdown()
+        shutdown()
+
+
+def merge_product_shards(queue, sink, wait_workers=True):
+    """Une los archivos parciales generados por los procesos en el destino de datos, descartando los productos repetidos entre grupos
+
+    Args:
+        queue (WorkQueue): Cola de trabajo compartida
+        sink (DataSink): Destino de datos donde se escriben los productos
+        wait_workers (bool, optional): Esperar a que los procesos externos terminen todos los grupos. Defaults to True.
+
+    Returns:
+        bool: Booleano que indica si todos los grupos terminaron correctamente
+    """
+    counts = queue.wait_done("product") if wait_workers else queue.counts("product")
+    num_failed = sum(count for status, count in counts.items() if status != "done")
+    if num_failed > 0:
+        LOGGER.error(
+            f"No se puede unir los productos. Razón: {num_failed} grupos no terminaron"
+        )
+        return False
+
+    product_ids = IdRegistry()
+    for shard_filename in queue.results("product"):
+        if not shard_filename:
+            continue
+        rows = []
+        with open(shard_filename, encoding="utf-8") as file:
+            for line in file:
+                product = loads(line)
+                id_product = product["Id Producto"]
+                if id_product is None or product_ids.add(id_product):
+                    rows.append([product[column] for column in PRODUCT_COLUMNS])
+                if len(rows) >= SINK_BUFFER_SIZE:
+                    sink.write(rows)
+                    rows = []
+        sink.write(rows)
+    LOGGER.info(f"Se han unido {sink.quantity} productos de los archivos parciales")
+    return True
+
+
+def parse_arguments():
+    """Función que lee los argumentos de la línea de comandos
+
+    Returns:
+        argparse.Namespace: Argumentos del programa
+    """
+    parser = ArgumentParser(description="Extrae los productos de saga falabella")
+    parser.add_argument(
+        "links",
+        nargs="*",
+        help="Links de las categorías, si no se indican se recorre el árbol de categorías más reciente",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["http", "browser"],
+        default=PRODUCT_ENGINE,
+        help="Motor usado para obtener las páginas de productos",
+    )
+    parser.add_argument(
+        "--format",
+        choices=list(SINK_FORMATS),
+        default=PRODUCT_FORMAT,
+        help="Formato del archivo de productos",
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=PRODUCT_MAX_PAGES,
+        help="Cantidad máxima de páginas a recorrer por categoría",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=API_RATE,
+        help="Peticiones por segundo a la api al iniciar, la tasa crece mientras el servidor responda bien",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=API_MAX_RATE,
+        help="Peticiones por segundo máximas a la api",
+    )
+    parser.add_argument(
+        "--network-workers",
+        type=int,
+        default=NETWORK_WORKERS,
+        help="Cantidad de hilos del pool usado para las peticiones HTTP",
+    )
+    parser.add_argument(
+        "--cpu-processes",
+        action="store_true",
+        default=CPU_PROCESSES,
+        help="Convertir los productos en filas en un pool de procesos",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Omitir las páginas cuyos productos y precios no cambiaron desde la ejecución anterior y guardar solo los cambios",
+    )
+    parser.add_argument(
+        "--fingerprints",
+        default=FINGERPRINT_FILENAME,
+        help="Archivo de las huellas de las páginas de productos",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        help="Dividir las categorías hoja en grupos recorridos por varios procesos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=cpu_count() or 1,
+        help="Cantidad de procesos locales usados con --shards (0 para usar solo procesos externos con --worker)",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Procesar los grupos de la cola de trabajo compartida y terminar",
+    )
+    parser.add_argument(
+        "--queue",
+        default=QUEUE_FILENAME,
+        help="Archivo de la cola de trabajo compartida",
+    )
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    EXECUTORS.configure("network", max_workers=arguments.network_workers)
+    EXECUTORS.configure("cpu", processes=arguments.cpu_processes)
+    if arguments.worker:
+        run_product_worker(arguments.queue, "worker_" + uuid4().hex[:8])
+        return
+    scraper = None
+    fingerprints = None
+    try:
+        # Formato para el debugger
+        config_log("Log", "fb_product_log")
+        LOGGER.info("Inicializando scraper")
+        scraper = ScraperFalabellaProduct(
+            arguments.engine,
+            scheduler=build_scheduler(
+                arguments.engine, arguments.rate, arguments.max_rate
+            ),
+        )
+        tree = None
+        if not arguments.links:
+            tree = load_category_tree()
+            if tree is None:
+                LOGGER.error(
+                    "No existe un árbol de categorías. Ejecute primero Falabella_Category_Extraction.py"
+                )
+                return
+            if arguments.shards <= 0:
+                fingerprints = PageFingerprints(arguments.fingerprints)
+
+        # En modo incremental el archivo solo tiene los productos de las páginas que cambiaron
+        filename = PRODUCT_CHANGES_FILENAME if arguments.incremental else PRODUCT_FILENAME
+        # Los productos se escriben en el disco a medida que se extraen
+        with open_sink(arguments.format, DATA_FOLDER, filename, PRODUCT_COLUMNS) as sink:
+            if tree is None:
+                LOGGER.info("Extrayendo los productos de falabella")
+                scraper.extract_products(arguments.links, sink, arguments.max_pages)
+            elif arguments.shards > 0:
+                LOGGER.info(
+                    "Extrayendo los productos de todas las categorías de falabella con varios procesos"
+                )
+                queue = WorkQueue(arguments.queue)
+                shard_products(
+                    tree,
+                    queue,
+                    arguments.shards,
+                    arguments.max_pages,
+                    arguments.fingerprints,
+                    arguments.incremental,
+                    arguments.rate,
+                    arguments.max_rate,
+                )
+                if arguments.workers > 0:
+                    run_workers(run_product_worker, arguments.workers, arguments.queue)
+                merged = merge_product_shards(
+                    queue, sink, wait_workers=arguments.workers == 0
+                )
+                queue.close()
+                if not merged:
+                    raise RuntimeError("Los productos de algunos grupos no se extrajeron")
+            else:
+                LOGGER.info(
+                    "Extrayendo los productos de todas las categorías de falabella"
+                )
+                scraper.crawl_tree(
+                    tree,
+                    sink,
+                    arguments.max_pages,
+                    fingerprints,
+                    arguments.incremental,
+                )
+        # Las huellas se guardan solo cuando los productos ya están en el disco
+        if fingerprints is not None:
+            fingerprints.save()
+        if sink.final_filename is None:
+            LOGGER.info("El archivo de datos no se va a guardar por no tener información")
+        else:
+            LOGGER.info(
+                f"El archivo de datos ha sido guardado correctamente en la ruta {path.join(ROOT_PATH, sink.final_filename)}"
+            )
+        scraper.save_metrics(METRICS_FOLDER, PRODUCT_METRICS_FILENAME)
+        LOGGER.info("Programa finalizado")
+
+    except Exception as error:
+        Error(error).imprimir_error()
+        LOGGER.error("Programa ejecutado con fallos")
+    finally:
+        # Cerrando el navegador web y la sesión
+        if scraper is not None:
+            scraper.close()
+        if fingerprints is not None:
+            fingerprints.close()
+        EXECUTORS.log_stats()
+        EXECUTORS.shutdown()
+        # Liberar el archivo log
+        shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# Los scripts del scraper están en la raíz del repositorio
+from os import path
+from sys import path as sys_path
+
+sys_path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
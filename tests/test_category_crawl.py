@@ -0,0 +1,72 @@
+from time import sleep
+
+from Falabella_Category_Extraction import (
+    CategoryTree,
+    IdRegistry,
+    ScraperFalabellaCategory,
+)
+
+# Árbol de la api: "x" cuelga de A (nivel 1) y de b1 (nivel 2), "d" cuelga de a1 y de b1 (nivel 2)
+API_TREE = {
+    "A": [("a1", "A1"), ("x", "X")],
+    "B": [("b1", "B1")],
+    "a1": [("d", "D")],
+    "b1": [("x", "X"), ("d", "D"), ("e", "E")],
+    "x": [("x1", "X1")],
+    "d": [],
+    "e": [],
+    "x1": [],
+}
+
+
+def build_scraper(tmp_path, delays):
+    scraper = ScraperFalabellaCategory(
+        str(tmp_path / "dict_category.csv"),
+        str(tmp_path / "api_cache.sqlite"),
+        browserless=True,
+    )
+
+    def send_request_api(id_cat, name_subcat, path_subcat, depth=1):
+        sleep(delays.get(id_cat, 0))
+        return [
+            (id_cat, id_subcat, name, "/" + id_subcat)
+            for id_subcat, name in API_TREE[id_cat]
+        ]
+
+    scraper.send_request_api = send_request_api
+    return scraper
+
+
+def crawl(tmp_path, delays):
+    scraper = build_scraper(tmp_path, delays)
+    tree = CategoryTree()
+    whole_id = IdRegistry()
+    for id_cat in ["A", "B"]:
+        tree.add(None, id_cat, id_cat, "/" + id_cat, 0)
+        whole_id.add(id_cat)
+    try:
+        scraper.crawl_subcategories(
+            [((id_cat, id_cat, "/" + id_cat), 1) for id_cat in ["A", "B"]],
+            4,
+            whole_id,
+            tree,
+        )
+    finally:
+        scraper.close()
+    return tree.to_records()
+
+
+def test_duplicates_resolve_in_level_order(tmp_path):
+    records = crawl(tmp_path, {})
+    parents = {id_cat: (id_parent, depth) for id_parent, id_cat, _, _, depth in records}
+    assert parents["x"] == ("A", 1)
+    assert parents["d"] == ("a1", 2)
+    assert parents["e"] == ("b1", 2)
+    assert parents["x1"] == ("x", 2)
+
+
+def test_duplicates_do_not_depend_on_response_order(tmp_path):
+    # Las ramas canónicas responden al final
+    slow_canonical = crawl(tmp_path, {"A": 0.2, "a1": 0.1})
+    slow_duplicates = crawl(tmp_path, {"B": 0.2, "b1": 0.1})
+    assert slow_canonical == slow_duplicates == crawl(tmp_path, {})
@@ -0,0 +1,116 @@
+from os import path
+from re import search
+
+from Falabella_Category_Extraction import (
+    extract_breadcrumb_root,
+    extract_next_data,
+    ScraperFalabellaCategory,
+    URL_FALABELLA,
+)
+
+FIXTURES_FOLDER = path.join(path.dirname(path.abspath(__file__)), "fixtures")
+
+
+def read_fixture(filename):
+    with open(path.join(FIXTURES_FOLDER, filename), encoding="utf-8") as file:
+        return file.read()
+
+
+class FixtureResponse:
+    """Respuesta de una página guardada, con los atributos que usa el scraper"""
+
+    def __init__(self, url, text):
+        self.url = url
+        self.text = text
+
+
+class FixtureSession:
+    """Sesión que responde la página principal y las páginas de categorías guardadas en la carpeta de fixtures"""
+
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if url.split("?")[0] == URL_FALABELLA:
+            return FixtureResponse(url, read_fixture("home.html"))
+        id_cat = search(r"/category/(cat\d+)/", url).group(1)
+        return FixtureResponse(url, read_fixture("category_" + id_cat + ".html"))
+
+    def connection_stats(self):
+        return {"requests": len(self.requested), "opened": 0, "reused": 0}
+
+    def close(self):
+        pass
+
+
+def build_scraper(tmp_path):
+    scraper = ScraperFalabellaCategory(
+        str(tmp_path / "dict_category.csv"),
+        str(tmp_path / "api_cache.sqlite"),
+        browserless=True,
+    )
+    scraper._session = FixtureSession()
+    return scraper
+
+
+def test_extract_next_data_returns_none_without_script():
+    assert extract_next_data(read_fixture("category_cat50001.html")) is None
+    assert extract_next_data(None) is None
+
+
+def test_extract_breadcrumb_root_skips_home_crumb():
+    data = extract_next_data(read_fixture("category_cat40056.html"))
+    assert extract_breadcrumb_root(data) == (
+        "Moda Mujer",
+        "/falabella-pe/category/cat1000/Moda-Mujer",
+    )
+
+
+def test_extract_breadcrumb_root_without_breadcrumb():
+    data = extract_next_data(read_fixture("home.html"))
+    assert extract_breadcrumb_root(data) is None
+
+
+def test_menu_links_only_keep_category_links(tmp_path):
+    scraper = build_scraper(tmp_path)
+    try:
+        menu_links = scraper.get_menu_links_http()
+    finally:
+        scraper.close()
+    assert sorted(menu_links) == [
+        "https://www.falabella.com.pe/falabella-pe/category/cat1000/Moda-Mujer",
+        "https://www.falabella.com.pe/falabella-pe/category/cat2000/Tecnologia",
+        "https://www.falabella.com.pe/falabella-pe/category/cat40055/Ropa-Mujer",
+        "https://www.falabella.com.pe/falabella-pe/category/cat40056/Blusas",
+        "https://www.falabella.com.pe/falabella-pe/category/cat50001/Celulares",
+    ]
+
+
+def test_root_category_from_l1category_link_without_next_data(tmp_path):
+    scraper = build_scraper(tmp_path)
+    try:
+        root = scraper.get_root_category_http(
+            "https://www.falabella.com.pe/falabella-pe/category/cat50001/Celulares"
+        )
+    finally:
+        scraper.close()
+    assert root == (
+        "Tecnología",
+        "https://www.falabella.com.pe/falabella-pe/category/cat2000/Tecnologia",
+    )
+
+
+def test_root_categories_frame(tmp_path):
+    scraper = build_scraper(tmp_path)
+    try:
+        roots = scraper.get_root_categories()
+    finally:
+        scraper.close()
+    # Filas Id_0, Name_0 y Category_path_0 sin duplicados y ordenadas por id
+    assert roots == [
+        ["cat1000", "Moda Mujer", ""],
+        ["cat2000", "Tecnología", ""],
+    ]
+    # Las nuevas incidencias quedan guardadas en el diccionario de datos
+    assert (tmp_path / "dict_category.csv").is_file()
@@ -0,0 +1,131 @@
+from os import makedirs, path
+
+from Falabella_Category_Extraction import (
+    CategoryTree,
+    diff_category_trees,
+    find_previous_data,
+    IdRegistry,
+    ScraperFalabellaCategory,
+)
+
+PREVIOUS_RECORDS = [
+    [None, "A", "A", "/A", 0],
+    [None, "B", "B", "/B", 0],
+    ["A", "a1", "A1", "/a1", 1],
+    ["A", "s", "S", "/s", 1],
+    ["a1", "a2", "A2", "/a2", 2],
+    ["B", "b1", "B1", "/b1", 1],
+    ["b1", "b2", "B2", "/b2", 2],
+]
+
+
+def build_scraper(tmp_path, api_tree):
+    scraper = ScraperFalabellaCategory(
+        str(tmp_path / "dict_category.csv"),
+        str(tmp_path / "api_cache.sqlite"),
+        browserless=True,
+    )
+    requested = []
+
+    def send_request_api(id_cat, name_subcat, path_subcat, depth=1):
+        requested.append(id_cat)
+        if api_tree.get(id_cat) is None:
+            return None
+        return [
+            (id_cat, id_subcat, name, "/" + id_subcat)
+            for id_subcat, name in api_tree[id_cat]
+        ]
+
+    scraper.send_request_api = send_request_api
+    return scraper, requested
+
+
+def refresh(tmp_path, api_tree):
+    scraper, requested = build_scraper(tmp_path, api_tree)
+    previous_tree = CategoryTree.from_records(PREVIOUS_RECORDS)
+    tree = CategoryTree()
+    whole_id = IdRegistry()
+    for id_cat in ["A", "B"]:
+        tree.add(None, id_cat, id_cat, "/" + id_cat, 0)
+        whole_id.add(id_cat)
+    try:
+        scraper.refresh_subcategories(
+            "thread",
+            [("A", "A", "/A"), ("B", "B", "/B")],
+            4,
+            whole_id,
+            tree,
+            previous_tree,
+        )
+    finally:
+        scraper.close()
+    return previous_tree, tree, requested
+
+
+def test_unchanged_branches_are_reused_without_requests(tmp_path):
+    # "s" también es hija de B, pero en la ejecución anterior quedó registrada en A
+    api_tree = {
+        "A": [("a1", "A1"), ("s", "S")],
+        "B": [("b1", "B1"), ("s", "S")],
+    }
+    previous_tree, tree, requested = refresh(tmp_path, api_tree)
+    assert sorted(requested) == ["A", "B"]
+    assert tree.to_records() == previous_tree.to_records()
+
+
+def test_failed_root_request_reuses_previous_branch(tmp_path):
+    api_tree = {"A": None, "B": [("b1", "B1")]}
+    previous_tree, tree, requested = refresh(tmp_path, api_tree)
+    assert sorted(requested) == ["A", "B"]
+    assert sorted(tree.ids()) == sorted(previous_tree.ids())
+    assert len(diff_category_trees(previous_tree, tree)) == 0
+
+
+def test_changed_branch_is_crawled_again(tmp_path):
+    api_tree = {
+        "A": [("a1", "A1"), ("s", "S")],
+        "B": [("b1", "B1"), ("b3", "B3")],
+        "b1": [("b2", "B2")],
+        "b2": [],
+        "b3": [],
+    }
+    previous_tree, tree, requested = refresh(tmp_path, api_tree)
+    assert sorted(requested) == ["A", "B", "b1", "b2", "b3"]
+    changes = diff_category_trees(previous_tree, tree)
+    assert changes.fillna("").values.tolist() == [["Agregada", 1, "b3", "B3", ""]]
+
+
+def test_diff_category_trees_reports_each_change():
+    previous_tree = CategoryTree.from_records(PREVIOUS_RECORDS)
+    tree = CategoryTree.from_records(
+        [
+            [None, "A", "A", "/A", 0],
+            [None, "B", "B", "/B", 0],
+            ["A", "a1", "A1 nuevo", "/a1", 1],
+            ["A", "s", "S", "/s", 1],
+            ["a1", "a2", "A2", "/a2", 2],
+            ["B", "b1", "B1", "/b1", 1],
+            ["B", "b3", "B3", "/b3", 1],
+        ]
+    )
+    changes = diff_category_trees(previous_tree, tree)
+    assert changes.fillna("").values.tolist() == [
+        ["Renombrada", 1, "a1", "A1 nuevo", "A1"],
+        ["Agregada", 1, "b3", "B3", ""],
+        ["Eliminada", 2, "b2", "", "B2"],
+    ]
+
+
+def test_find_previous_data_picks_latest_date(tmp_path):
+    for folder, filename in [
+        ("Data_1", "categorias_05012024_1.csv"),
+        ("Data_2", "categorias_20122023_7.csv"),
+        ("Data_3", "categorias_06012024_2.xlsx"),
+        ("Data_4", "categorias_sin_fecha.csv"),
+    ]:
+        makedirs(tmp_path / folder)
+        open(path.join(tmp_path, folder, filename), "w").close()
+    assert find_previous_data(str(tmp_path), "categorias") == path.join(
+        str(tmp_path), "Data_1", "categorias_05012024_1.csv"
+    )
+    assert find_previous_data(str(tmp_path), "otro") is None
@@ -0,0 +1,63 @@
+from Falabella_Category_Extraction import CategoryTree
+
+RECORDS = [
+    [None, "cat1000", "Moda Mujer", "", 0],
+    [None, "cat2000", "Tecnología", "", 0],
+    ["cat1000", "cat1100", "Ropa", "/ropa", 1],
+    ["cat1000", "cat1200", "Calzado", "/calzado", 1],
+    ["cat1100", "cat1110", "Polos", "/polos", 2],
+    ["cat2000", "cat2100", "Ropa", "/ropa-tec", 1],
+]
+
+
+def build_tree():
+    return CategoryTree.from_records(RECORDS)
+
+
+def test_children_and_leaves():
+    tree = build_tree()
+    assert len(tree) == 6
+    assert tree.max_depth == 2
+    assert "cat1110" in tree
+    assert [node[2] for node in tree.children("cat1000")] == ["cat1100", "cat1200"]
+    assert tree.children("cat9999") == []
+    assert [node[2] for node in tree.leaves()] == ["cat1200", "cat1110", "cat2100"]
+
+
+def test_names_are_interned():
+    tree = build_tree()
+    assert len(tree._name_table) == 5
+    assert tree.node_info(tree._index["cat2100"])[3] == "Ropa"
+
+
+def test_records_round_trip():
+    assert build_tree().to_records() == RECORDS
+
+
+def test_iter_rows_widens_each_leaf_in_depth_first_order():
+    tree = build_tree()
+    assert tree.columns(root_path=False) == [
+        "Id_0", "Name_0",
+        "Id_1", "Name_1", "Category_path_1",
+        "Id_2", "Name_2", "Category_path_2",
+    ]
+    assert list(tree.iter_rows(root_path=False)) == [
+        ("cat1000", "Moda Mujer", "cat1100", "Ropa", "/ropa", "cat1110", "Polos", "/polos"),
+        ("cat1000", "Moda Mujer", "cat1200", "Calzado", "/calzado", None, None, None),
+        ("cat2000", "Tecnología", "cat2100", "Ropa", "/ropa-tec", None, None, None),
+    ]
+    assert [len(chunk) for chunk in tree.iter_chunks(2)] == [2, 1]
+
+
+def test_frame_round_trip():
+    tree = build_tree()
+    df_category = tree.to_frame()
+    assert df_category.shape == (3, 9)
+    assert CategoryTree.from_frame(df_category).to_records() == [
+        RECORDS[0],
+        RECORDS[1],
+        RECORDS[2],
+        RECORDS[3],
+        RECORDS[5],
+        RECORDS[4],
+    ]
@@ -0,0 +1,98 @@
+from pytest import raises
+
+from Falabella_Category_Extraction import (
+    CategoryTree,
+    CrawlCheckpoint,
+    IdRegistry,
+    ScraperFalabellaCategory,
+)
+
+API_TREE = {
+    "A": [("a1", "A1"), ("a2", "A2")],
+    "B": [("b1", "B1")],
+    "a1": [("a3", "A3")],
+    "a2": [],
+    "b1": [("b2", "B2"), ("a3", "A3")],
+    "a3": [],
+    "b2": [],
+}
+ROOTS = [("A", "A", "/A"), ("B", "B", "/B")]
+
+
+def build_scraper(tmp_path, fail_on=None):
+    scraper = ScraperFalabellaCategory(
+        str(tmp_path / "dict_category.csv"),
+        str(tmp_path / "api_cache.sqlite"),
+        browserless=True,
+    )
+
+    def send_request_api(id_cat, name_subcat, path_subcat, depth=1):
+        if id_cat == fail_on:
+            raise RuntimeError("proceso interrumpido")
+        return [
+            (id_cat, id_subcat, name, "/" + id_subcat)
+            for id_subcat, name in API_TREE[id_cat]
+        ]
+
+    scraper.send_request_api = send_request_api
+    return scraper
+
+
+def crawl(scraper, frontier, tree, checkpoint=None):
+    try:
+        return scraper.crawl_frontier(
+            "thread", frontier, 4, IdRegistry(tree.ids()), tree, checkpoint
+        )
+    finally:
+        scraper.close()
+
+
+def build_roots():
+    return CategoryTree.from_records(
+        [[None, id_cat, name, path_cat, 0] for id_cat, name, path_cat in ROOTS]
+    )
+
+
+def test_save_and_load_round_trip(tmp_path):
+    filename = str(tmp_path / "checkpoint.json.gz")
+    tree = build_roots()
+    tree.add("A", "a1", "A1", "/a1", 1)
+    CrawlCheckpoint(filename, level=4, engine="thread").save(
+        tree, [(("a1", "A1", "/a1"), 2)]
+    )
+    checkpoint, state = CrawlCheckpoint.load(filename)
+    assert checkpoint is not None
+    assert (state["level"], state["engine"]) == (4, "thread")
+    assert CategoryTree.from_records(state["tree"]).to_records() == tree.to_records()
+    assert state["frontier"] == [["a1", "A1", "/a1", 2]]
+    checkpoint.remove()
+    assert CrawlCheckpoint.load(filename) == (None, None)
+
+
+def test_maybe_save_waits_for_the_interval(tmp_path):
+    filename = str(tmp_path / "checkpoint.json.gz")
+    CrawlCheckpoint(filename, interval=3600, level=4, engine="thread").maybe_save(
+        build_roots(), []
+    )
+    assert CrawlCheckpoint.load(filename) == (None, None)
+
+
+def test_resume_from_checkpoint_builds_the_same_tree(tmp_path):
+    frontier = [(category_level, 1) for category_level in ROOTS]
+    expected = crawl(build_scraper(tmp_path), frontier, build_roots()).to_records()
+
+    filename = str(tmp_path / "checkpoint.json.gz")
+    checkpoint = CrawlCheckpoint(filename, interval=0, level=4, engine="thread")
+    with raises(RuntimeError):
+        crawl(build_scraper(tmp_path, fail_on="b1"), frontier, build_roots(), checkpoint)
+
+    checkpoint, state = CrawlCheckpoint.load(filename)
+    tree = CategoryTree.from_records(state["tree"])
+    assert len(tree) < len(expected)
+    resumed = crawl(
+        build_scraper(tmp_path),
+        [(tuple(item[:3]), item[3]) for item in state["frontier"]],
+        tree,
+        checkpoint,
+    )
+    assert resumed.to_records() == expected
@@ -0,0 +1,80 @@
+from datetime import date
+from json import loads
+from os import listdir, path
+
+from pandas import read_csv, read_parquet
+from pytest import mark, raises
+
+from Falabella_Category_Extraction import (
+    CategoryTree,
+    CsvSink,
+    DataSink,
+    JsonlSink,
+    open_sink,
+    ParquetSink,
+)
+
+COLUMNS = ["Id", "Name", "Price"]
+ROWS = [["p1", "Polo", 10.5], ["p2", "Casaca", None], ["p3", "Zapatilla", 99.9]]
+
+
+def read_rows(filename):
+    if filename.endswith(".csv"):
+        return read_csv(filename, sep=";", encoding="utf-8-sig").values.tolist()
+    if filename.endswith(".jsonl"):
+        with open(filename, encoding="utf-8") as file:
+            return [list(loads(line).values()) for line in file]
+    return read_parquet(filename).values.tolist()
+
+
+def test_data_sink_is_abstract(tmp_path):
+    with raises(TypeError):
+        DataSink(str(tmp_path), "productos", COLUMNS)
+
+
+@mark.parametrize("sink_class", [CsvSink, JsonlSink, ParquetSink])
+def test_rows_are_written_in_blocks_and_renamed_on_close(tmp_path, sink_class):
+    with sink_class(str(tmp_path), "productos", COLUMNS, buffer_size=2) as sink:
+        for row in ROWS:
+            sink.write([row])
+        # Solo el bloque completo está en el disco, con la extensión .part
+        assert [name.endswith(".part") for name in listdir(tmp_path)] == [True]
+        assert sink.quantity == 3
+    assert listdir(tmp_path) == ["productos_3" + sink_class.extension]
+    rows = read_rows(sink.final_filename)
+    assert [row[:2] for row in rows] == [row[:2] for row in ROWS]
+
+
+@mark.parametrize("sink_class", [CsvSink, JsonlSink, ParquetSink])
+def test_failed_block_discards_the_partial_file(tmp_path, sink_class):
+    with raises(RuntimeError):
+        with sink_class(str(tmp_path), "productos", COLUMNS, buffer_size=1) as sink:
+            sink.write(ROWS[:1])
+            raise RuntimeError("extracción interrumpida")
+    assert listdir(tmp_path) == []
+    assert sink.final_filename is None
+
+
+def test_empty_sink_writes_no_file(tmp_path):
+    sink = CsvSink(str(tmp_path), "productos", COLUMNS)
+    assert sink.close() is None
+    assert listdir(tmp_path) == []
+
+
+def test_category_tree_streams_to_a_sink(tmp_path):
+    tree = CategoryTree.from_records(
+        [
+            [None, "cat1000", "Moda Mujer", "", 0],
+            ["cat1000", "cat1100", "Ropa", "/ropa", 1],
+            ["cat1000", "cat1200", "Calzado", "/calzado", 1],
+        ]
+    )
+    with open_sink(
+        "jsonl", str(tmp_path), "categorias", tree.columns(), date(2024, 1, 5), 1
+    ) as sink:
+        for chunk in tree.iter_chunks(1):
+            sink.write(chunk)
+    assert sink.final_filename == path.join(
+        str(tmp_path), "05-01-2024", "categorias_05012024_2.jsonl"
+    )
+    assert [row[3] for row in read_rows(sink.final_filename)] == ["cat1100", "cat1200"]
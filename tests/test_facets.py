@@ -0,0 +1,30 @@
+from Falabella_Category_Extraction import decode_facets, slice_json_value
+
+
+def test_slice_json_value_ignores_nested_key():
+    body = (
+        b'{"data": {"results": [{"name": "a \\" [facets", "facets": [{"x": 1}]}],'
+        b' "facets": [{"name": "Categor\\u00eda", "values": []}]}}'
+    )
+    assert slice_json_value(body, (b"data", b"facets")) == (
+        b'[{"name": "Categor\\u00eda", "values": []}]'
+    )
+
+
+def test_slice_json_value_missing_path():
+    assert slice_json_value(b'{"other": {"facets": []}}', (b"data", b"facets")) is None
+
+
+def test_slice_json_value_ambiguous_sibling():
+    body = b'{"data": {"facets": [1]}, "meta": {"facets": [2]}}'
+    assert slice_json_value(body, (b"data", b"facets")) is None
+    assert decode_facets(body) == [1]
+
+
+def test_decode_facets():
+    body = b'{"data": {"facets": [{"name": "Categor\xc3\xada"}]}}'
+    assert decode_facets(body) == [{"name": "Categoría"}]
+
+
+def test_decode_facets_falls_back_to_full_decode():
+    assert decode_facets(b'{"data": {"results": [], "facets": null}}') is None
@@ -0,0 +1,41 @@
+from threading import Thread
+
+from Falabella_Category_Extraction import IdRegistry
+
+
+def test_add_many_keeps_first_appearance():
+    whole_id = IdRegistry(["cat1"])
+    assert whole_id.add_many(["cat2", "cat1", "cat3", "cat2"]) == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert len(whole_id) == 3
+    assert "cat3" in whole_id
+    assert "cat4" not in whole_id
+
+
+def test_add_from_threads_registers_each_id_once():
+    whole_id = IdRegistry()
+    results = []
+
+    def add_all():
+        results.append(sum(whole_id.add("cat" + str(i)) for i in range(1000)))
+
+    threads = [Thread(target=add_all) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(results) == 1000
+    assert len(whole_id) == 1000
+
+
+def test_save_and_load_round_trip(tmp_path):
+    filename = str(tmp_path / "ids.txt")
+    IdRegistry(["cat3", "cat1", "cat2"]).save(filename)
+    with open(filename, encoding="utf-8") as file:
+        assert file.read() == "cat1\ncat2\ncat3\n"
+    assert sorted(IdRegistry.load(filename)) == ["cat1", "cat2", "cat3"]
+    assert len(IdRegistry.load(str(tmp_path / "missing.txt"))) == 0
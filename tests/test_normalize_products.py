@@ -0,0 +1,50 @@
+from pandas import DataFrame
+
+from Falabella_Products_Extraction import (
+    normalize_products,
+    price_to_cents,
+    PRODUCT_COLUMNS,
+    PRODUCT_DEFAULT_CURRENCY,
+)
+
+
+def products(*prices):
+    return DataFrame(
+        [
+            ["/ropa", "Producto", "Falabella", regular, discount, card, "Marca", shipping, "p" + str(index)]
+            for index, (regular, discount, card, shipping) in enumerate(prices)
+        ],
+        columns=PRODUCT_COLUMNS,
+    )
+
+
+def test_price_to_cents():
+    cents = price_to_cents(["S/ 1,299.90", "S/ 1,299.90", "20", "", "S/", None])
+    assert cents.fillna(-1).tolist() == [129990, 129990, 2000, -1, -1, -1]
+    assert price_to_cents([]).empty
+
+
+def test_products_without_prices_use_the_default_currency():
+    df_product = normalize_products(
+        products((None, None, None, []), (None, None, None, []))
+    )
+    assert df_product["Moneda"].tolist() == [PRODUCT_DEFAULT_CURRENCY] * 2
+    assert df_product["Precio Regular Centimos"].isna().all()
+    assert df_product["Porcentaje Descuento"].isna().all()
+
+
+def test_products_with_some_null_prices():
+    df_product = normalize_products(
+        products(
+            ("S/ 100", "S/ 80", None, ["Despacho a domicilio"]),
+            (None, None, None, []),
+            (None, "US$ 50", "US$ 40", ["Retiro en tienda"]),
+            ("S/ 0", "S/ 10", None, []),
+        )
+    )
+    assert df_product["Moneda"].tolist() == ["PEN", PRODUCT_DEFAULT_CURRENCY, "USD", "PEN"]
+    assert df_product["Precio Descuento Centimos"].fillna(-1).tolist() == [8000, -1, 5000, 1000]
+    # El porcentaje necesita un precio regular mayor a cero
+    assert df_product["Porcentaje Descuento"].fillna(-1).tolist() == [20.0, -1, -1, -1]
+    assert df_product["Despacho a Domicilio"].tolist() == [True, False, False, False]
+    assert df_product["Retiro en Tienda"].tolist() == [False, False, True, False]
@@ -0,0 +1,86 @@
+import Falabella_Products_Extraction
+from Falabella_Products_Extraction import (
+    fingerprint_page,
+    PageFingerprints,
+    ScraperFalabellaProduct,
+)
+from test_product_crawl import listing, MemorySink
+
+LEAVES = [("cat1", "Cat 1", "/cat1"), ("cat2", "Cat 2", "/cat2")]
+
+
+def test_fingerprints_are_saved_between_runs(tmp_path):
+    filename = str(tmp_path / "page_fingerprints.sqlite")
+    fingerprints = PageFingerprints(filename)
+    assert not fingerprints.match("cat1", 1, "a")
+    assert fingerprints.match("cat1", 1, "a")
+    assert not fingerprints.is_verified("cat1", 3)
+    fingerprints.mark_verified("cat1", 3)
+    fingerprints.save()
+    fingerprints.close()
+
+    fingerprints = PageFingerprints(filename)
+    assert fingerprints.match("cat1", 1, "a")
+    assert not fingerprints.match("cat1", 1, "b")
+    assert (fingerprints.matched, fingerprints.changed) == (1, 1)
+    assert fingerprints.is_verified("cat1", 3)
+    # Otra cantidad de productos o una verificación antigua obligan a recorrer la categoría completa
+    assert not fingerprints.is_verified("cat1", 4)
+    fingerprints.close()
+    fingerprints = PageFingerprints(filename, max_age=0)
+    assert not fingerprints.is_verified("cat1", 3)
+    fingerprints.close()
+
+
+def test_fingerprint_ignores_the_order_of_the_products():
+    first = {"productId": "p1", "prices": [{"type": "normalPrice", "price": ["100"]}]}
+    second = {"productId": "p2", "prices": []}
+    assert fingerprint_page([first, second]) == fingerprint_page([second, first])
+    changed = {"productId": "p1", "prices": [{"type": "normalPrice", "price": ["90"]}]}
+    assert fingerprint_page([first, second]) != fingerprint_page([changed, second])
+
+
+def crawl(listings, filename, incremental):
+    requested = []
+
+    def request_listing(url):
+        requested.append(url)
+        return listings.get(url)
+
+    scraper = ScraperFalabellaProduct()
+    scraper.request_listing = request_listing
+    fingerprints = PageFingerprints(filename)
+    sink = MemorySink()
+    try:
+        scraper.crawl_leaves(LEAVES, sink, fingerprints=fingerprints, incremental=incremental)
+        fingerprints.save()
+    finally:
+        fingerprints.close()
+        scraper.close()
+    return sorted(requested), sorted(row[-1] for row in sink.rows)
+
+
+def test_incremental_crawl_skips_unchanged_categories(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        Falabella_Products_Extraction,
+        "build_listing_url",
+        lambda id_cat, name_cat, path_cat, page=1: (id_cat, page),
+    )
+    filename = str(tmp_path / "page_fingerprints.sqlite")
+    listings = {
+        ("cat1", 1): listing(["p1", "p2"], 3),
+        ("cat1", 2): listing(["p3"], 3),
+        ("cat2", 1): listing(["p4", "p5"], 3),
+        ("cat2", 2): listing(["p6"], 3),
+    }
+    assert crawl(listings, filename, False) == (
+        [("cat1", 1), ("cat1", 2), ("cat2", 1), ("cat2", 2)],
+        ["p1", "p2", "p3", "p4", "p5", "p6"],
+    )
+
+    # Cambió la primera página de cat2: cat1 se omite tras su primera página y de cat2 solo se escribe la página que cambió
+    listings[("cat2", 1)] = listing(["p4", "p7"], 3)
+    assert crawl(listings, filename, True) == (
+        [("cat1", 1), ("cat2", 1), ("cat2", 2)],
+        ["p4", "p7"],
+    )
@@ -0,0 +1,112 @@
+from datetime import date
+
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+import Falabella_Price_History
+from Falabella_Price_History import PriceHistory
+from Falabella_Products_Extraction import PRODUCT_COLUMNS
+
+
+def snapshot(*products):
+    return DataFrame(
+        [
+            [category, "Producto " + product_id, "Falabella", regular, discount, None, "Marca", [], product_id]
+            for product_id, category, regular, discount in products
+        ],
+        columns=PRODUCT_COLUMNS,
+    )
+
+
+DAY_1 = snapshot(
+    ("p1", "/ropa", "S/ 100", "S/ 80"),
+    ("p2", "/ropa", "S/ 1,299.90", None),
+    ("p3", "/calzado", "S/ 50", None),
+)
+# p1 baja de precio, p2 aparece en otra categoría sin cambiar, p3 deja de aparecer y p4 es nuevo
+DAY_2 = snapshot(
+    ("p1", "/ropa", "S/ 100", "S/ 60"),
+    ("p2", "/zapatos", "S/ 1,299.90", None),
+    ("p4", "/calzado", "S/ 20", None),
+)
+
+
+def build_history(tmp_path):
+    history = PriceHistory(str(tmp_path / "history"))
+    assert history.ingest(DAY_1, date(2024, 1, 1)) == 3
+    assert history.ingest(DAY_2, date(2024, 1, 2)) == 3
+    return history
+
+
+def test_ingest_writes_only_the_changes(tmp_path):
+    history = build_history(tmp_path)
+    assert history.last_date == date(2024, 1, 2)
+    assert len(history.get_files()) == 2
+    df_history = history.load()
+    assert list(df_history["product_id"]) == ["p1", "p1", "p2", "p3", "p3", "p4"]
+    assert list(df_history["discount"].fillna(0)) == [8000, 6000, 0, 0, 0, 0]
+    assert df_history.loc[0, "regular"] == 10000
+    assert df_history.loc[2, "regular"] == 129990
+
+    df_latest = history.load_latest().set_index("product_id")
+    assert df_latest.loc["p2", "category"] == "/ropa"
+    assert not df_latest.loc["p3", "available"]
+    assert df_latest.loc["p4", "date"] == date(2024, 1, 2)
+
+
+def test_snapshot_already_ingested_is_skipped(tmp_path):
+    history = build_history(tmp_path)
+    assert history.ingest(DAY_2, date(2024, 1, 2)) == 0
+    assert history.ingest(DAY_1, date(2023, 12, 31)) == 0
+    assert history.last_date == date(2024, 1, 2)
+
+
+def test_partial_snapshot_keeps_missing_products_available(tmp_path):
+    history = PriceHistory(str(tmp_path / "history"))
+    history.ingest(DAY_1, date(2024, 1, 1))
+    assert history.ingest(DAY_1.iloc[:1], date(2024, 1, 2), partial=True) == 0
+    assert history.load_latest()["available"].all()
+    assert history.ingest(DAY_1.iloc[:1], date(2024, 1, 3)) == 2
+    assert history.load_latest()["available"].sum() == 1
+
+
+def test_compaction_keeps_the_same_history(tmp_path):
+    history = build_history(tmp_path)
+    df_history = history.load()
+    df_latest = history.load_latest()
+    history.compact()
+    assert [path.split("/")[-1] for path in history.get_files()] == ["base.parquet"]
+    assert_frame_equal(history.load(), df_history)
+    assert_frame_equal(history.load_latest(), df_latest)
+    assert history.last_date == date(2024, 1, 2)
+
+
+def test_ingest_compacts_after_enough_deltas(tmp_path, monkeypatch):
+    monkeypatch.setattr(Falabella_Price_History, "HISTORY_COMPACT_EVERY", 2)
+    history = build_history(tmp_path)
+    df_history = history.load()
+    history.ingest(DAY_1, date(2024, 1, 3))
+    assert [path.split("/")[-1] for path in history.get_files()] == ["base.parquet"]
+    assert history.load().shape[0] == df_history.shape[0] + 3
+
+
+def test_series_starts_with_the_state_at_the_start_date(tmp_path):
+    history = build_history(tmp_path)
+    df_series = history.series("p1", start_date=date(2024, 1, 2))
+    assert list(df_series["discount"]) == [8000, 6000]
+    df_series = history.series("p1", start_date=date(2024, 1, 5))
+    assert list(df_series["discount"]) == [6000]
+    df_series = history.series("p3", start_date=date(2024, 1, 1), end_date=date(2024, 1, 1))
+    assert list(df_series["available"]) == [True]
+
+
+def test_price_drops(tmp_path):
+    history = build_history(tmp_path)
+    df_drops = history.price_drops(date(2024, 1, 2), date(2024, 1, 2))
+    assert df_drops[["product_id", "previous_price", "price", "change"]].values.tolist() == [
+        ["p1", 8000, 6000, -0.25]
+    ]
+    assert history.price_drops(date(2024, 1, 2), date(2024, 1, 2), min_drop=0.3).empty
+    assert history.price_drops(
+        date(2024, 1, 2), date(2024, 1, 2), category="/calzado"
+    ).empty
@@ -0,0 +1,58 @@
+import Falabella_Products_Extraction
+from Falabella_Products_Extraction import ScraperFalabellaProduct
+
+
+class MemorySink:
+    """Destino de datos que guarda las filas en memoria"""
+
+    def __init__(self):
+        self.rows = []
+
+    @property
+    def quantity(self):
+        return len(self.rows)
+
+    def write(self, rows):
+        self.rows.extend(rows)
+
+
+def listing(product_ids, count, page_size=2):
+    return {
+        "data": {
+            "results": [
+                {"productId": product_id, "displayName": "Producto " + product_id}
+                for product_id in product_ids
+            ],
+            "pagination": {"count": count, "perPage": page_size},
+        }
+    }
+
+
+# La categoría cat2 responde sin "data" y la página 2 de cat3 sin paginación ni productos
+LISTINGS = {
+    ("cat1", 1): listing(["p1", "p2"], 3),
+    ("cat1", 2): listing(["p3"], 3),
+    ("cat2", 1): {"data": None},
+    ("cat3", 1): listing(["p4", "p5"], 3),
+    ("cat3", 2): {"data": {"results": None}},
+}
+
+
+def test_unexpected_payloads_do_not_stop_the_crawl(monkeypatch):
+    monkeypatch.setattr(
+        Falabella_Products_Extraction,
+        "build_listing_url",
+        lambda id_cat, name_cat, path_cat, page=1: (id_cat, page),
+    )
+    scraper = ScraperFalabellaProduct()
+    scraper.request_listing = LISTINGS.get
+    sink = MemorySink()
+    try:
+        scraper.crawl_leaves(
+            [("cat1", "Cat 1", "/cat1"), ("cat2", "Cat 2", "/cat2"), ("cat3", "Cat 3", "/cat3")],
+            sink,
+        )
+    finally:
+        scraper.close()
+    assert sorted(row[-1] for row in sink.rows) == ["p1", "p2", "p3", "p4", "p5"]
+    assert scraper.metadata.num_errors >= 1
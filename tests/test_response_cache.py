@@ -0,0 +1,77 @@
+import Falabella_Category_Extraction
+from Falabella_Category_Extraction import ResponseCache
+
+
+def build_cache(tmp_path, **kwargs):
+    return ResponseCache(str(tmp_path / "api_cache.sqlite"), **kwargs)
+
+
+def test_fresh_response_is_a_hit(tmp_path):
+    cache = build_cache(tmp_path)
+    key = cache.make_key("cat1", "Moda", "/moda")
+    assert cache.lookup(key) == (None, {})
+    assert cache.store(key, 200, {"ETag": '"v1"'}, b"body") == b"body"
+    assert cache.lookup(key) == (b"body", {})
+    assert cache.stats() == {"hits": 1, "misses": 1, "revalidated": 0}
+    cache.close()
+
+
+def test_expired_response_sends_revalidation_headers(tmp_path, monkeypatch):
+    cache = build_cache(tmp_path, ttl=60)
+    key = cache.make_key("cat1", "Moda", "/moda")
+    cache.store(
+        key, 200, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"body"
+    )
+    now = Falabella_Category_Extraction.time()
+    monkeypatch.setattr(Falabella_Category_Extraction, "time", lambda: now + 61)
+    assert cache.lookup(key) == (
+        None,
+        {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        },
+    )
+    cache.close()
+
+
+def test_not_modified_returns_stored_body_and_refreshes_it(tmp_path, monkeypatch):
+    cache = build_cache(tmp_path, ttl=60)
+    key = cache.make_key("cat1", "Moda", "/moda")
+    cache.store(key, 200, {"ETag": '"v1"'}, b"body")
+    now = Falabella_Category_Extraction.time()
+    monkeypatch.setattr(Falabella_Category_Extraction, "time", lambda: now + 61)
+    assert cache.store(key, 304, {}, b"") == b"body"
+    assert cache.lookup(key) == (b"body", {})
+    assert cache.stats()["revalidated"] == 1
+    cache.close()
+
+
+def test_errors_are_not_stored(tmp_path):
+    cache = build_cache(tmp_path)
+    key = cache.make_key("cat1", "Moda", "/moda")
+    assert cache.store(key, 503, {}, b"error") == b"error"
+    assert cache.lookup(key) == (None, {})
+    cache.close()
+
+
+def test_offline_serves_expired_responses(tmp_path, monkeypatch):
+    cache = build_cache(tmp_path, ttl=60)
+    key = cache.make_key("cat1", "Moda", "/moda")
+    cache.store(key, 200, {}, b"body")
+    cache.close()
+    now = Falabella_Category_Extraction.time()
+    monkeypatch.setattr(Falabella_Category_Extraction, "time", lambda: now + 3600)
+    cache = build_cache(tmp_path, ttl=60, offline=True)
+    assert cache.lookup(key) == (b"body", {})
+    cache.close()
+
+
+def test_close_keeps_the_most_recently_used(tmp_path):
+    cache = build_cache(tmp_path, max_entries=2)
+    keys = [cache.make_key("cat" + str(i), "", "") for i in range(3)]
+    for key in keys:
+        cache.store(key, 200, {}, key.encode())
+    cache.close()
+    cache = build_cache(tmp_path)
+    assert [cache.lookup(key)[0] is not None for key in keys] == [False, True, True]
+    cache.close()
@@ -0,0 +1,48 @@
+from queue import Queue
+
+import Falabella_Category_Extraction
+from Falabella_Category_Extraction import ScraperFalabellaCategory
+from selenium.common.exceptions import StaleElementReferenceException
+
+
+class FakeDriver:
+    """Navegador web que falla al recorrer los links marcados como rotos"""
+
+    started = 0
+
+    def __init__(self, **kwargs):
+        FakeDriver.started += 1
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+def test_worker_skips_links_with_browser_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(Falabella_Category_Extraction, "WebDriver", FakeDriver)
+    scraper = ScraperFalabellaCategory(
+        str(tmp_path / "dict_category.csv"),
+        str(tmp_path / "api_cache.sqlite"),
+        browserless=True,
+    )
+
+    def get_root_category_selenium(driver, link):
+        if link.endswith("roto"):
+            raise StaleElementReferenceException("elemento obsoleto")
+        return "Moda", "/category/cat1000"
+
+    scraper.get_root_category_selenium = get_root_category_selenium
+    scraper.close_modal = lambda driver, link: None
+    links_queue = Queue()
+    for link in ["/category/cat1", "/category/roto", "/category/cat2"]:
+        links_queue.put(link)
+    try:
+        new_incidences = scraper.traverse_links_worker(links_queue, "chromedriver")
+    finally:
+        scraper.close()
+    assert new_incidences == [
+        ("/category/cat1", "Moda", "/category/cat1000"),
+        ("/category/cat2", "Moda", "/category/cat1000"),
+    ]
+    # El navegador se reinicia después del error
+    assert FakeDriver.started == 2
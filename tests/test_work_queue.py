@@ -0,0 +1,67 @@
+from time import sleep
+
+from Falabella_Category_Extraction import (
+    configure_executors,
+    executor_settings,
+    EXECUTORS,
+    WorkQueue,
+)
+
+
+def build_queue(tmp_path, **kwargs):
+    return WorkQueue(str(tmp_path / "queue.sqlite"), **kwargs)
+
+
+def test_claim_retries_abandoned_tasks(tmp_path):
+    queue = build_queue(tmp_path, timeout=0.05, max_attempts=2)
+    queue.put_many("category", [{"roots": ["cat1000"]}])
+    task_id, shard = queue.claim("category", "worker0")
+    assert shard == {"roots": ["cat1000"]}
+    assert queue.claim("category", "worker1") == (None, None)
+    sleep(0.1)
+    assert queue.claim("category", "worker1")[0] == task_id
+    queue.complete(task_id, "shard.json.gz")
+    assert queue.wait_done("category", interval=0.01) == {"done": 1}
+    assert queue.results("category") == ["shard.json.gz"]
+    queue.close()
+
+
+def test_wait_done_returns_when_the_last_attempt_is_abandoned(tmp_path):
+    queue = build_queue(tmp_path, timeout=0.05, max_attempts=1)
+    queue.put_many("product", [{"leaves": []}, {"leaves": []}])
+    # El proceso muere en su último intento sin marcar la tarea como fallida
+    task_id, _ = queue.claim("product", "worker0")
+    other_id, _ = queue.claim("product", "worker1")
+    queue.complete(other_id, "shard.jsonl")
+    sleep(0.1)
+    assert queue.claim("product", "worker2") == (None, None)
+    assert queue.wait_done("product", interval=0.01) == {"done": 1, "failed": 1}
+    queue.close()
+
+
+def test_failed_task_goes_back_to_the_queue_until_its_last_attempt(tmp_path):
+    queue = build_queue(tmp_path, max_attempts=2)
+    queue.put_many("category", [{"roots": []}])
+    task_id, _ = queue.claim("category", "worker0")
+    queue.fail(task_id)
+    assert queue.counts("category") == {"pending": 1}
+    assert queue.claim("category", "worker0")[0] == task_id
+    queue.fail(task_id)
+    assert queue.wait_done("category", interval=0.01) == {"failed": 1}
+    queue.close()
+
+
+def test_workers_use_the_pool_sizes_of_the_shard():
+    network_workers = EXECUTORS["network"].max_workers
+    cpu_processes = EXECUTORS["cpu"].processes
+    try:
+        EXECUTORS.configure("network", max_workers=3)
+        shard = {"roots": [], **executor_settings()}
+        assert shard["network_workers"] == 3
+        EXECUTORS.configure("network", max_workers=network_workers)
+        configure_executors(shard)
+        assert EXECUTORS["network"].max_workers == 3
+        assert EXECUTORS["cpu"].processes == cpu_processes
+    finally:
+        EXECUTORS.configure("network", max_workers=network_workers)
+        EXECUTORS.configure("cpu", processes=cpu_processes)